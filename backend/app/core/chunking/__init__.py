@@ -2,6 +2,27 @@
 
 from .dynamic_chunker import DynamicChunker
 from .chunking import TokenChunker
+from .semantic_chunker import SemanticChunker
+from .tokenizers import (
+    HuggingFaceTokenizer,
+    TiktokenTokenizer,
+    TokenCountCache,
+    Tokenizer,
+    WhitespaceTokenizer,
+    get_tokenizer,
+)
 from src.schemas.chunking import Chunk, TokenChunk
 
-__all__ = ["Chunk", "TokenChunk", "DynamicChunker", "TokenChunker"]
+__all__ = [
+    "Chunk",
+    "TokenChunk",
+    "DynamicChunker",
+    "TokenChunker",
+    "SemanticChunker",
+    "Tokenizer",
+    "WhitespaceTokenizer",
+    "TiktokenTokenizer",
+    "HuggingFaceTokenizer",
+    "TokenCountCache",
+    "get_tokenizer",
+]
@@ -4,13 +4,18 @@ from __future__ import annotations
 
 import os
 import re
-from typing import Callable, Dict, List, Sequence
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
+from src.core.chunking.tokenizers import Tokenizer, WhitespaceTokenizer, get_tokenizer
 from src.schemas.chunking import Chunk, TokenChunk
 
 DEFAULT_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "800"))
 DEFAULT_MIN_TOKENS = int(os.getenv("CHUNK_MIN_TOKENS", "400"))
 DEFAULT_OVERLAP = int(os.getenv("CHUNK_OVERLAP_TOKENS", "120"))
+ENCODE_BATCH_SIZE = 64
+
+_Window = Tuple[int, int, int, int]
 
 
 def default_tokenizer(text: str) -> List[str]:
@@ -19,7 +24,19 @@ def default_tokenizer(text: str) -> List[str]:
 
 
 class TokenChunker:
-    """Chunk text by tokens with overlap and metadata extraction."""
+    """Chunk text by tokens with overlap and metadata extraction.
+
+    ``tokenizer`` is either a ``Tokenizer`` or a legacy callable returning a
+    token list. With a ``Tokenizer`` the character offsets of the tokens are
+    computed once per section (in batches; for ``WhitespaceTokenizer`` only
+    the window boundaries, by regex) and each span is a single slice of the
+    section text, so overlapping windows copy no token strings and keep the
+    original whitespace and newlines. Legacy callables re-join each span with
+    single spaces. When omitted (or ``default_tokenizer``),
+    ``CHUNK_TOKENIZER`` selects the ``Tokenizer``, ``WhitespaceTokenizer`` if
+    unset. Each token chunk records its size in ``metadata["token_count"]``
+    and the vocabulary in ``metadata["tokenizer"]``.
+    """
 
     def __init__(
         self,
@@ -27,7 +44,7 @@ class TokenChunker:
         max_tokens: int = DEFAULT_MAX_TOKENS,
         min_tokens: int = DEFAULT_MIN_TOKENS,
         overlap_tokens: int = DEFAULT_OVERLAP,
-        tokenizer: Callable[[str], List[str]] = default_tokenizer,
+        tokenizer: Optional[Union[Tokenizer, Callable[[str], List[str]]]] = None,
     ) -> None:
         if min_tokens <= 0 or max_tokens <= 0 or overlap_tokens < 0:
             raise ValueError("Token sizes must be positive, overlap non-negative")
@@ -35,47 +52,151 @@ class TokenChunker:
             raise ValueError("min_tokens cannot exceed max_tokens")
         if overlap_tokens >= max_tokens:
             raise ValueError("overlap_tokens must be smaller than max_tokens")
+        if tokenizer is None or tokenizer is default_tokenizer:
+            tokenizer = get_tokenizer()
         self.max_tokens = max_tokens
         self.min_tokens = min_tokens
         self.overlap_tokens = overlap_tokens
         self.tokenizer = tokenizer
+        if isinstance(tokenizer, Tokenizer):
+            self.tokenizer_name = tokenizer.name
+        else:
+            self.tokenizer_name = getattr(tokenizer, "__name__", "custom")
 
-    def chunk(self, structured_chunks: Sequence[Chunk]) -> List[TokenChunk]:
+    def chunk(self, structured_chunks: Iterable[Chunk]) -> List[TokenChunk]:
         """Chunk higher-level sections into token-based chunks.
 
         Args:
-            structured_chunks: Chunks produced by ``DynamicChunker``.
+            structured_chunks: Chunks produced by ``DynamicChunker`` (any
+                iterable; consumed in a single pass).
 
         Returns:
             List of token chunks with metadata and section path.
         """
-        token_chunks: List[TokenChunk] = []
+        return list(self.iter_chunks(structured_chunks))
+
+    def iter_chunks(self, structured_chunks: Iterable[Chunk]) -> Iterator[TokenChunk]:
+        """Yield the token chunks of ``chunk`` as sections arrive.
+
+        Meant to be fed by ``DynamicChunker.iter_chunks``: sections are pulled
+        one at a time (``ENCODE_BATCH_SIZE`` at a time for batch-encoding
+        tokenizers) and their token chunks are yielded immediately, e.g. into
+        ``TenderMilvusIndexer.upsert_token_chunk_stream``.
+        """
+        if isinstance(self.tokenizer, WhitespaceTokenizer):
+            for chunk in structured_chunks:
+                windows = _whitespace_windows(chunk.text, self.max_tokens, self.overlap_tokens, self.min_tokens)
+                yield from self._chunk_windows(chunk, windows)
+            return
+
+        if isinstance(self.tokenizer, Tokenizer):
+            for batch in _batched(structured_chunks, ENCODE_BATCH_SIZE):
+                offsets_batch = self.tokenizer.offsets_batch([chunk.text for chunk in batch])
+                for chunk, offsets in zip(batch, offsets_batch):
+                    spans = _build_spans(len(offsets), self.max_tokens, self.overlap_tokens, self.min_tokens)
+                    windows = [(start, end, offsets[start][0], offsets[end - 1][1]) for start, end in spans]
+                    yield from self._chunk_windows(chunk, windows)
+            return
+
         for chunk in structured_chunks:
             tokens = self.tokenizer(chunk.text)
-            spans = _build_spans(tokens, self.max_tokens, self.overlap_tokens, self.min_tokens)
+            spans = _build_spans(len(tokens), self.max_tokens, self.overlap_tokens, self.min_tokens)
             section_path = _derive_section_path(chunk)
             metadata = _extract_metadata(chunk.text, chunk.title)
             for start, end in spans:
                 piece = " ".join(tokens[start:end]).strip()
                 if not piece:
                     continue
-                token_chunks.append(
-                    TokenChunk(
-                        id=f"{chunk.id}:{start}-{end}",
-                        text=piece,
-                        section_path=section_path,
-                        metadata=metadata,
-                        page_numbers=chunk.page_numbers,
-                        source_chunk_id=chunk.id,
-                    )
-                )
-        return token_chunks
-
-
-def _build_spans(tokens: List[str], max_tokens: int, overlap: int, min_tokens: int) -> List[tuple[int, int]]:
+                yield self._token_chunk(chunk, piece, start, end, section_path, metadata)
+
+    def _chunk_windows(self, chunk: Chunk, windows: Sequence[_Window]) -> Iterator[TokenChunk]:
+        """Token chunks of ``(first token, end token, first char, end char)`` windows of a section."""
+        if not windows:
+            return
+        section_path = _derive_section_path(chunk)
+        metadata = _extract_metadata(chunk.text, chunk.title)
+        for start, end, char_start, char_end in windows:
+            piece = chunk.text[char_start:char_end].strip()
+            if not piece:
+                continue
+            yield self._token_chunk(chunk, piece, start, end, section_path, metadata)
+
+    def _token_chunk(
+        self,
+        chunk: Chunk,
+        piece: str,
+        start: int,
+        end: int,
+        section_path: str,
+        metadata: Dict[str, str],
+    ) -> TokenChunk:
+        return TokenChunk(
+            id=f"{chunk.id}:{start}-{end}",
+            text=piece,
+            section_path=section_path,
+            metadata={**metadata, "token_count": str(end - start), "tokenizer": self.tokenizer_name},
+            page_numbers=chunk.page_numbers,
+            source_chunk_id=chunk.id,
+        )
+
+
+def _batched(items: Iterable[Chunk], size: int) -> Iterator[List[Chunk]]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+_NON_SPACE = re.compile(r"\S")
+_SKIP_PATTERNS: Dict[int, re.Pattern[str]] = {}
+
+
+def _skip_words(count: int) -> re.Pattern[str]:
+    """Pattern consuming exactly ``count`` whitespace-separated words."""
+    pattern = _SKIP_PATTERNS.get(count)
+    if pattern is None:
+        pattern = _SKIP_PATTERNS[count] = re.compile(r"(?:\s*\S+(?!\S)){%d}" % count)
+    return pattern
+
+
+def _whitespace_windows(text: str, max_tokens: int, overlap: int, min_tokens: int) -> List[_Window]:
+    """``_build_spans`` over whitespace words, with character bounds, without splitting the text.
+
+    Each window is located by two regex matches skipping ``max_tokens -
+    overlap`` words (where the next window starts) and then ``overlap`` words
+    (where this one ends), so every word is scanned once in C and no
+    per-word object is created; only the last, partial window counts its words.
+    """
+    first = _NON_SPACE.search(text)
+    if first is None:
+        return []
+    windows: List[_Window] = []
+    step = max_tokens - overlap
+    start, char_start = 0, first.start()
+    while True:
+        step_match = _skip_words(step).match(text, char_start)
+        full = step_match if overlap == 0 or step_match is None else _skip_words(overlap).match(text, step_match.end())
+        if full is not None:
+            end, char_end = start + max_tokens, full.end()
+            last = _NON_SPACE.search(text, char_end) is None
+        else:
+            tail = text[char_start:].rstrip()
+            end, char_end = start + len(tail.split()), char_start + len(tail)
+            last = True
+        if end - start < min_tokens and start != 0:
+            break
+        windows.append((start, end, char_start, char_end))
+        if last:
+            break
+        start, char_start = start + step, _NON_SPACE.search(text, step_match.end()).start()
+    return windows
+
+
+def _build_spans(n: int, max_tokens: int, overlap: int, min_tokens: int) -> List[tuple[int, int]]:
     spans: List[tuple[int, int]] = []
     start = 0
-    n = len(tokens)
     if n == 0:
         return spans
     while start < n:
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import hashlib
 import uuid
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 from src.schemas.chunking import Chunk
 
@@ -30,7 +31,7 @@ class DynamicChunker:
         self.max_heading_level = max_heading_level
         self.allow_preamble = allow_preamble
 
-    def build_chunks(self, pages: Sequence[Dict[str, Any]]) -> List[Chunk]:
+    def build_chunks(self, pages: Iterable[Dict[str, Any]], *, document_hash: Optional[str] = None) -> List[Chunk]:
         """Build chunks from parsed pages.
 
         A chunk starts at a heading with level 1 and includes:
@@ -38,41 +39,35 @@ class DynamicChunker:
         - paragraphs/list/table blocks until the next level-1 heading (excluded).
 
         Args:
-            pages: Parsed pages with blocks (as produced by the ingestion parser).
+            pages: Parsed pages with blocks (as produced by the ingestion parser),
+                either ``Page``/``Block`` objects or plain dicts.
+                Any iterable works, including the streaming
+                ``IngestionService.iter_pages``; pages are consumed in a single pass.
+            document_hash: Content hash of the source file (``content_hash``
+                of the ``IngestionService`` result, or ``hash_file``). When
+                given, chunk ids are derived from it, the section title and
+                the section content (see ``section_chunk_id``), so parsing
+                the same file again yields the same ids; otherwise ids are
+                random UUIDs.
 
         Returns:
             List of chunks preserving document order.
         """
-        chunks: List[Chunk] = []
+        return list(self.iter_chunks(pages, document_hash=document_hash))
+
+    def iter_chunks(self, pages: Iterable[Dict[str, Any]], *, document_hash: Optional[str] = None) -> Iterator[Chunk]:
+        """Yield the chunks of ``build_chunks`` one at a time.
+
+        Pages are pulled lazily and each chunk is yielded as soon as the next
+        level-1 heading (or the end of the input) closes it, so only the
+        blocks of the current section are held in memory. Combined with
+        ``IngestionService.iter_pages`` and ``TokenChunker.iter_chunks``,
+        memory is bounded by the largest section rather than the document.
+        """
         current_blocks: List[Dict[str, Any]] = []
         current_title: Optional[str] = None
         current_level: Optional[int] = None
-
-        def finalize() -> None:
-            nonlocal current_blocks, current_title, current_level
-            if not current_blocks or current_title is None or current_level is None:
-                current_blocks = []
-                current_title = None
-                current_level = None
-                return
-            page_numbers = _collect_page_numbers(current_blocks)
-            text_blocks = _visible_blocks(current_blocks)
-            text = "\n".join(
-                b["text"] for b in text_blocks if isinstance(b.get("text"), str)
-            ).strip()
-            chunks.append(
-                Chunk(
-                    id=str(uuid.uuid4()),
-                    title=current_title,
-                    heading_level=current_level,
-                    text=text,
-                    blocks=current_blocks,
-                    page_numbers=page_numbers,
-                )
-            )
-            current_blocks = []
-            current_title = None
-            current_level = None
+        occurrences: Dict[str, int] = {}
 
         for page_idx, page in enumerate(pages, start=1):
             blocks = page.get("blocks", [])
@@ -88,7 +83,8 @@ class DynamicChunker:
                     continue
 
                 if is_heading and level == 1:
-                    finalize()
+                    if current_blocks and current_title is not None and current_level is not None:
+                        yield _build_chunk(current_title, current_level, current_blocks, document_hash, occurrences)
                     current_title = str(block.get("text", "")).strip()
                     current_level = level
                     current_blocks = [block]
@@ -107,8 +103,62 @@ class DynamicChunker:
 
                 current_blocks.append(block)
 
-        finalize()
-        return chunks
+        if current_blocks and current_title is not None and current_level is not None:
+            yield _build_chunk(current_title, current_level, current_blocks, document_hash, occurrences)
+
+
+def section_chunk_id(document_hash: str, title: str, text: str, occurrence: int = 0) -> str:
+    """Deterministic chunk id: blake2b of document hash, section title, content hash and occurrence.
+
+    ``occurrence`` tells apart identical sections repeated within a document.
+    The 32-char hex id leaves room for ``TokenChunker``'s ``:<start>-<end>``
+    suffix within the 64-char Milvus primary key.
+    """
+    content_hash = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (document_hash, title, content_hash, str(occurrence)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def _stable_chunk_id(document_hash: str, title: str, text: str, occurrences: Dict[str, int]) -> str:
+    first = section_chunk_id(document_hash, title, text)
+    occurrence = occurrences.get(first, 0)
+    occurrences[first] = occurrence + 1
+    return first if occurrence == 0 else section_chunk_id(document_hash, title, text, occurrence)
+
+
+def _build_chunk(
+    title: str,
+    level: int,
+    blocks: List[Dict[str, Any]],
+    document_hash: Optional[str],
+    occurrences: Dict[str, int],
+) -> Chunk:
+    page_numbers = _collect_page_numbers(blocks)
+    text_blocks = _visible_blocks(blocks)
+    text = "\n".join(
+        b["text"] for b in text_blocks if isinstance(b.get("text"), str)
+    ).strip()
+    if document_hash is None:
+        chunk_id = str(uuid.uuid4())
+    else:
+        chunk_id = _stable_chunk_id(document_hash, title, text, occurrences)
+    return Chunk(
+        id=chunk_id,
+        title=title,
+        heading_level=level,
+        text=text,
+        blocks=[_block_dict(block) for block in blocks],
+        page_numbers=page_numbers,
+    )
+
+
+def _block_dict(block: Any) -> Dict[str, Any]:
+    """Plain dict for a dict block or any block object with ``to_dict`` (e.g. ingestion's slotted ``Block``)."""
+    to_dict = getattr(block, "to_dict", None)
+    return to_dict() if callable(to_dict) else dict(block)
 
 
 def _collect_page_numbers(blocks: List[Dict[str, Any]]) -> List[int]:
@@ -130,4 +180,4 @@ def _visible_blocks(blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return filtered
 
 
-__all__ = ["DynamicChunker"]
+__all__ = ["DynamicChunker", "section_chunk_id"]
@@ -0,0 +1,275 @@
+"""Semantic chunking: split sections at topic shifts found with sentence embeddings."""
+
+from __future__ import annotations
+
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.core.chunking.chunking import _batched, _derive_section_path, _extract_metadata
+from src.core.chunking.tokenizers import Tokenizer, WhitespaceTokenizer, get_tokenizer
+from src.core.embedding.base import EmbeddingClient
+from src.schemas.chunking import Chunk, TokenChunk
+
+DEFAULT_SEMANTIC_MAX_TOKENS = int(os.getenv("SEMANTIC_CHUNK_MAX_TOKENS", "512"))
+DEFAULT_SEMANTIC_MIN_TOKENS = int(os.getenv("SEMANTIC_CHUNK_MIN_TOKENS", "96"))
+DEFAULT_SEMANTIC_WINDOW = int(os.getenv("SEMANTIC_CHUNK_WINDOW", "3"))
+DEFAULT_BREAKPOINT_PERCENTILE = float(os.getenv("SEMANTIC_CHUNK_BREAKPOINT_PERCENTILE", "90"))
+EMBED_BATCH_SIZE = int(os.getenv("SEMANTIC_CHUNK_EMBED_BATCH_SIZE", "64"))
+SECTION_BATCH_SIZE = 16
+
+_Span = Tuple[int, int]
+
+# Sentence end: terminal punctuation followed by whitespace and an uppercase
+# letter, digit or opening quote/bracket, or a blank line / list break.
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?;:])\s+(?=[\"'«(\[A-ZÀ-Ý0-9])|\n\s*\n|\n(?=\s*(?:[-•*]|\d+[.)])\s)")
+# Italian legal abbreviations that end with a period but not a sentence.
+_ABBREVIATIONS = re.compile(
+    r"(?:\b(?:art|artt|c|co|n|nn|lett|par|pag|pagg|cfr|ecc|es|d|lgs|dlgs|l|dpr|d\.p\.r|s\.m\.i|sig|dott|ing|avv|rif|all|tab|cap|sez|p\.iva)\.)$",
+    re.IGNORECASE,
+)
+
+
+class SemanticChunker:
+    """Split sections into token chunks at semantic breakpoints.
+
+    Alternative to ``TokenChunker`` for poorly structured documents, where
+    ``DynamicChunker`` finds no level-1 headings and yields one huge section
+    (use ``allow_preamble=True``). Each section is split into sentences, the
+    sentences are embedded in batches of ``EMBED_BATCH_SIZE`` and, for every
+    sentence boundary, the cosine distance between the mean embedding of the
+    ``window`` sentences before and after it is computed in one vectorized
+    pass (cumulative sums, no Python loop over windows). Boundaries whose
+    distance is above the ``breakpoint_percentile`` of the section become cut
+    points; segments longer than ``max_tokens`` are split again at their
+    strongest internal boundary and segments shorter than ``min_tokens`` are
+    merged into a neighbour, so chunks fit the embedding model's input.
+
+    Output is ``TokenChunk`` with the same metadata as ``TokenChunker``
+    (``token_count``, ``tokenizer``) plus ``metadata["chunking"] =
+    "semantic"``; ids are ``<section id>:s<first sentence>-<end sentence>``,
+    deterministic when the section ids are.
+
+    Args:
+        embedder: Client used for sentence embeddings; ideally the same model
+            that embeds the chunks.
+        tokenizer: Tokenizer measuring ``max_tokens``/``min_tokens``; defaults
+            to ``get_tokenizer()``.
+        max_tokens: Upper bound of a chunk (sentences longer than this are cut
+            into ``max_tokens`` windows).
+        min_tokens: Segments below this size are merged with a neighbour.
+        window: Sentences on each side of a boundary averaged before comparing.
+        breakpoint_percentile: Percentile of the section's boundary distances
+            above which a boundary is a topic shift.
+    """
+
+    def __init__(
+        self,
+        embedder: EmbeddingClient,
+        *,
+        tokenizer: Optional[Tokenizer] = None,
+        max_tokens: int = DEFAULT_SEMANTIC_MAX_TOKENS,
+        min_tokens: int = DEFAULT_SEMANTIC_MIN_TOKENS,
+        window: int = DEFAULT_SEMANTIC_WINDOW,
+        breakpoint_percentile: float = DEFAULT_BREAKPOINT_PERCENTILE,
+    ) -> None:
+        if min_tokens <= 0 or max_tokens <= 0 or window <= 0:
+            raise ValueError("Token sizes and window must be positive")
+        if min_tokens > max_tokens:
+            raise ValueError("min_tokens cannot exceed max_tokens")
+        if not 0 <= breakpoint_percentile <= 100:
+            raise ValueError("breakpoint_percentile must be within [0, 100]")
+        self.embedder = embedder
+        self.tokenizer = tokenizer or get_tokenizer()
+        self.max_tokens = max_tokens
+        self.min_tokens = min_tokens
+        self.window = window
+        self.breakpoint_percentile = breakpoint_percentile
+
+    def chunk(self, structured_chunks: Iterable[Chunk]) -> List[TokenChunk]:
+        """Chunk sections at semantic breakpoints.
+
+        Args:
+            structured_chunks: Chunks produced by ``DynamicChunker`` (any
+                iterable; consumed in a single pass).
+
+        Returns:
+            List of token chunks with metadata and section path.
+        """
+        return list(self.iter_chunks(structured_chunks))
+
+    def iter_chunks(self, structured_chunks: Iterable[Chunk]) -> Iterator[TokenChunk]:
+        """Yield the chunks of ``chunk``, embedding the sentences of up to ``SECTION_BATCH_SIZE`` sections together."""
+        for batch in _batched(structured_chunks, SECTION_BATCH_SIZE):
+            sentences = [self._sentences(chunk.text) for chunk in batch]
+            texts = [chunk.text[s:e] for chunk, spans in zip(batch, sentences) for s, e in spans]
+            counts = self.tokenizer.count_batch(texts) if texts else []
+            vectors = self._embed(texts)
+            offset = 0
+            for chunk, spans in zip(batch, sentences):
+                n = len(spans)
+                yield from self._chunk_section(chunk, spans, counts[offset : offset + n], vectors[offset : offset + n])
+                offset += n
+
+    def _sentences(self, text: str) -> List[_Span]:
+        """Sentence spans of ``text``, with sentences over ``max_tokens`` cut into token windows."""
+        spans = split_sentences(text)
+        # A sentence can only exceed max_tokens if its length does; measure just those. Words span
+        # at least one character, but byte-level BPE (tiktoken, most HF models) can emit a token per
+        # UTF-8 byte, so accented or non-Latin text needs the byte length.
+        if isinstance(self.tokenizer, WhitespaceTokenizer):
+            oversized = [i for i, (s, e) in enumerate(spans) if e - s > self.max_tokens]
+        else:
+            oversized = [
+                i for i, (s, e) in enumerate(spans) if len(text[s:e].encode("utf-8")) > self.max_tokens
+            ]
+        if not oversized:
+            return spans
+        counts = self.tokenizer.count_batch([text[spans[i][0] : spans[i][1]] for i in oversized])
+        long_ones = [i for i, count in zip(oversized, counts) if count > self.max_tokens]
+        if not long_ones:
+            return spans
+        offsets_batch = self.tokenizer.offsets_batch([text[spans[i][0] : spans[i][1]] for i in long_ones])
+        pieces: Dict[int, List[_Span]] = {}
+        for i, offsets in zip(long_ones, offsets_batch):
+            base = spans[i][0]
+            pieces[i] = [
+                (base + offsets[j][0], base + offsets[min(j + self.max_tokens, len(offsets)) - 1][1])
+                for j in range(0, len(offsets), self.max_tokens)
+            ]
+        result: List[_Span] = []
+        for i, span in enumerate(spans):
+            result.extend(pieces.get(i, [span]))
+        return result
+
+    def _embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Unit-normalized float32 embeddings of ``texts``, batched."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        rows: List[List[float]] = []
+        for start in range(0, len(texts), EMBED_BATCH_SIZE):
+            rows.extend(self.embedder.embed_batch(list(texts[start : start + EMBED_BATCH_SIZE])))
+        matrix = np.asarray(rows, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+    def _chunk_section(
+        self,
+        chunk: Chunk,
+        spans: List[_Span],
+        counts: Sequence[int],
+        vectors: np.ndarray,
+    ) -> Iterator[TokenChunk]:
+        if not spans:
+            return
+        distances = boundary_distances(vectors, self.window)
+        segments = self._segments(np.asarray(counts, dtype=np.int64), distances)
+        section_path = _derive_section_path(chunk)
+        metadata = _extract_metadata(chunk.text, chunk.title)
+        for first, end in segments:
+            piece = chunk.text[spans[first][0] : spans[end - 1][1]].strip()
+            if not piece:
+                continue
+            yield TokenChunk(
+                id=f"{chunk.id}:s{first}-{end}",
+                text=piece,
+                section_path=section_path,
+                metadata={
+                    **metadata,
+                    "token_count": str(int(sum(counts[first:end]))),
+                    "tokenizer": self.tokenizer.name,
+                    "chunking": "semantic",
+                },
+                page_numbers=chunk.page_numbers,
+                source_chunk_id=chunk.id,
+            )
+
+    def _segments(self, counts: np.ndarray, distances: np.ndarray) -> List[_Span]:
+        """Sentence ranges ``[first, end)`` cut at breakpoints, then fitted to the token bounds."""
+        n = len(counts)
+        if n == 1:
+            return [(0, 1)]
+        threshold = np.percentile(distances, self.breakpoint_percentile)
+        # Boundary i sits between sentence i and i + 1.
+        cuts = (np.flatnonzero(distances > threshold) + 1).tolist() if threshold > 0 else []
+        bounds = [0, *cuts, n]
+        cumulative = np.concatenate(([0], np.cumsum(counts)))
+
+        segments: List[_Span] = []
+        pending = [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)][::-1]
+        while pending:
+            first, end = pending.pop()
+            if cumulative[end] - cumulative[first] <= self.max_tokens or end - first == 1:
+                segments.append((first, end))
+                continue
+            # Strongest boundary inside the segment that leaves both halves non-empty.
+            split = first + 1 + int(np.argmax(distances[first : end - 1]))
+            pending.append((split, end))
+            pending.append((first, split))
+
+        merged: List[_Span] = []
+        for first, end in segments:
+            if merged:
+                prev_first, prev_end = merged[-1]
+                prev_size = cumulative[prev_end] - cumulative[prev_first]
+                size = cumulative[end] - cumulative[first]
+                fits = cumulative[end] - cumulative[prev_first] <= self.max_tokens
+                if fits and (prev_size < self.min_tokens or size < self.min_tokens):
+                    merged[-1] = (prev_first, end)
+                    continue
+            merged.append((first, end))
+        return merged
+
+
+def split_sentences(text: str) -> List[_Span]:
+    """Character spans of the sentences of ``text`` (whitespace trimmed).
+
+    Breaks after ``.``, ``!``, ``?``, ``;`` or ``:`` followed by an uppercase
+    letter, digit or quote, at blank lines and before list items; periods of
+    common Italian legal abbreviations (``art.``, ``D.Lgs.``, ``n.``) do not
+    end a sentence.
+    """
+    spans: List[_Span] = []
+    start = 0
+    for match in _SENTENCE_BREAK.finditer(text):
+        if _ABBREVIATIONS.search(text, max(start, match.start() - 12), match.start()):
+            continue
+        _append_span(text, start, match.start(), spans)
+        start = match.end()
+    _append_span(text, start, len(text), spans)
+    return spans
+
+
+def boundary_distances(vectors: np.ndarray, window: int) -> np.ndarray:
+    """Cosine distance across each of the ``n - 1`` sentence boundaries.
+
+    For boundary ``i`` (between sentences ``i`` and ``i + 1``) compares the
+    mean of the up to ``window`` unit vectors ending at ``i`` with the mean of
+    the up to ``window`` starting at ``i + 1``; all window sums come from one
+    cumulative sum.
+    """
+    n = len(vectors)
+    if n < 2:
+        return np.zeros(0, dtype=np.float32)
+    cumulative = np.vstack([np.zeros((1, vectors.shape[1]), dtype=np.float32), np.cumsum(vectors, axis=0)])
+    boundary = np.arange(1, n)
+    left = cumulative[boundary] - cumulative[np.maximum(boundary - window, 0)]
+    right = cumulative[np.minimum(boundary + window, n)] - cumulative[boundary]
+    # Means share the cosine of the sums, so no division by window length is needed.
+    numerator = np.einsum("ij,ij->i", left, right)
+    denominator = np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1)
+    return 1.0 - numerator / np.maximum(denominator, 1e-12)
+
+
+def _append_span(text: str, start: int, end: int, spans: List[_Span]) -> None:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start < end:
+        spans.append((start, end))
+
+
+__all__ = ["SemanticChunker", "boundary_distances", "split_sentences"]
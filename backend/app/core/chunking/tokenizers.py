@@ -0,0 +1,250 @@
+"""Pluggable tokenizers with character offsets, used to size chunks and prompts."""
+
+from __future__ import annotations
+
+import os
+import re
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import tiktoken
+except ImportError as exc:  # pragma: no cover - optional dependency
+    tiktoken = None  # type: ignore
+    _tiktoken_import_error = exc
+else:
+    _tiktoken_import_error = None
+
+try:
+    from tokenizers import Tokenizer as HFTokenizer
+except ImportError as exc:  # pragma: no cover - optional dependency
+    HFTokenizer = None  # type: ignore
+    _hf_import_error = exc
+else:
+    _hf_import_error = None
+
+DEFAULT_TOKENIZER = os.getenv("CHUNK_TOKENIZER", "")
+DEFAULT_TIKTOKEN_ENCODING = os.getenv("TIKTOKEN_ENCODING", "cl100k_base")
+DEFAULT_HF_TOKENIZER = os.getenv("HF_TOKENIZER", "nomic-ai/nomic-embed-text-v1.5")
+DEFAULT_TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_COUNT_CACHE_SIZE", "50000"))
+
+_WORD_PATTERN = re.compile(r"\S+")
+
+
+@dataclass(frozen=True)
+class Encoding:
+    """Token ids of a text and the ``(start, end)`` character span of each token."""
+
+    ids: List[int]
+    offsets: List[Tuple[int, int]]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class Tokenizer(ABC):
+    """Abstract interface for tokenizers used by chunking and context assembly."""
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Identifier of the vocabulary (token counts are only comparable within one name)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def encode(self, text: str) -> Encoding:
+        """Encode a single text, without special tokens."""
+        raise NotImplementedError
+
+    def encode_batch(self, texts: Sequence[str]) -> List[Encoding]:
+        """Encode a batch of texts; default iterates encode."""
+        return [self.encode(t) for t in texts]
+
+    def count(self, text: str) -> int:
+        return len(self.encode(text))
+
+    def count_batch(self, texts: Sequence[str]) -> List[int]:
+        return [len(encoding) for encoding in self.encode_batch(texts)]
+
+    def offsets_batch(self, texts: Sequence[str]) -> List[List[Tuple[int, int]]]:
+        """Character span of every token of each text (what span slicing needs)."""
+        return [encoding.offsets for encoding in self.encode_batch(texts)]
+
+
+class WhitespaceTokenizer(Tokenizer):
+    """Whitespace-separated words (the historical approximation); ids are CRC32 of each word."""
+
+    @property
+    def name(self) -> str:
+        return "whitespace"
+
+    def encode(self, text: str) -> Encoding:
+        ids: List[int] = []
+        offsets: List[Tuple[int, int]] = []
+        for match in _WORD_PATTERN.finditer(text):
+            ids.append(zlib.crc32(match.group(0).encode("utf-8")))
+            offsets.append(match.span())
+        return Encoding(ids=ids, offsets=offsets)
+
+    def count(self, text: str) -> int:
+        return len(text.split())
+
+    def offsets_batch(self, texts: Sequence[str]) -> List[List[Tuple[int, int]]]:
+        # No ids needed: one span tuple per word, no token strings.
+        return [[match.span() for match in _WORD_PATTERN.finditer(text)] for text in texts]
+
+
+class TiktokenTokenizer(Tokenizer):
+    """BPE tokenizer backed by ``tiktoken`` (OpenAI vocabularies)."""
+
+    def __init__(self, encoding_name: str = DEFAULT_TIKTOKEN_ENCODING) -> None:
+        if tiktoken is None:
+            raise ImportError("tiktoken is required for TiktokenTokenizer") from _tiktoken_import_error
+        self._encoding = tiktoken.get_encoding(encoding_name)
+
+    @property
+    def name(self) -> str:
+        return f"tiktoken:{self._encoding.name}"
+
+    def encode(self, text: str) -> Encoding:
+        return self._with_offsets(text, self._encoding.encode_ordinary(text))
+
+    def encode_batch(self, texts: Sequence[str]) -> List[Encoding]:
+        batches = self._encoding.encode_ordinary_batch(list(texts))
+        return [self._with_offsets(text, ids) for text, ids in zip(texts, batches)]
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode_ordinary(text))
+
+    def count_batch(self, texts: Sequence[str]) -> List[int]:
+        return [len(ids) for ids in self._encoding.encode_ordinary_batch(list(texts))]
+
+    def _with_offsets(self, text: str, ids: List[int]) -> Encoding:
+        # Map cumulative UTF-8 byte lengths back to character positions; a
+        # token ending inside a multi-byte character extends to its end.
+        byte_ends: List[int] = []
+        position = 0
+        for token_bytes in self._encoding.decode_tokens_bytes(ids):
+            position += len(token_bytes)
+            byte_ends.append(position)
+        char_at_byte = _char_index_by_byte(text)
+        offsets: List[Tuple[int, int]] = []
+        start = 0
+        for byte_end in byte_ends:
+            end = char_at_byte[byte_end]
+            offsets.append((start, end))
+            start = end
+        return Encoding(ids=list(ids), offsets=offsets)
+
+
+class HuggingFaceTokenizer(Tokenizer):
+    """Fast tokenizer from the Hugging Face ``tokenizers`` library (BPE/WordPiece/Unigram).
+
+    Args:
+        model: Hub model id or local ``tokenizer.json`` path; ideally the
+            tokenizer of the embedding or generation model whose limits the
+            chunks must respect.
+    """
+
+    def __init__(self, model: str = DEFAULT_HF_TOKENIZER) -> None:
+        if HFTokenizer is None:
+            raise ImportError("tokenizers is required for HuggingFaceTokenizer") from _hf_import_error
+        self._model = model
+        if os.path.exists(model):
+            self._tokenizer = HFTokenizer.from_file(model)
+        else:
+            self._tokenizer = HFTokenizer.from_pretrained(model)
+        self._tokenizer.no_truncation()
+        self._tokenizer.no_padding()
+
+    @property
+    def name(self) -> str:
+        return f"hf:{self._model}"
+
+    def encode(self, text: str) -> Encoding:
+        encoded = self._tokenizer.encode(text, add_special_tokens=False)
+        return Encoding(ids=list(encoded.ids), offsets=list(encoded.offsets))
+
+    def encode_batch(self, texts: Sequence[str]) -> List[Encoding]:
+        encoded = self._tokenizer.encode_batch(list(texts), add_special_tokens=False)
+        return [Encoding(ids=list(e.ids), offsets=list(e.offsets)) for e in encoded]
+
+
+def get_tokenizer(spec: Optional[str] = None) -> Tokenizer:
+    """Build a tokenizer from a spec string.
+
+    ``"whitespace"`` (default), ``"tiktoken"`` / ``"tiktoken:<encoding>"`` or
+    ``"hf:<model or tokenizer.json path>"``. Defaults to ``CHUNK_TOKENIZER``.
+    """
+    spec = (spec if spec is not None else DEFAULT_TOKENIZER) or "whitespace"
+    kind, _, arg = spec.partition(":")
+    if kind == "whitespace":
+        return WhitespaceTokenizer()
+    if kind == "tiktoken":
+        return TiktokenTokenizer(arg or DEFAULT_TIKTOKEN_ENCODING)
+    if kind == "hf":
+        return HuggingFaceTokenizer(arg or DEFAULT_HF_TOKENIZER)
+    raise ValueError(f"Unknown tokenizer spec: {spec!r}")
+
+
+class TokenCountCache:
+    """Thread-safe LRU of token counts keyed by ``(tokenizer name, chunk id)``."""
+
+    def __init__(self, max_entries: int = DEFAULT_TOKEN_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._counts: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, tokenizer: str, chunk_ids: Iterable[str]) -> Dict[str, int]:
+        found: Dict[str, int] = {}
+        with self._lock:
+            for chunk_id in chunk_ids:
+                key = (tokenizer, chunk_id)
+                count = self._counts.get(key)
+                if count is None:
+                    self.misses += 1
+                    continue
+                self._counts.move_to_end(key)
+                found[chunk_id] = count
+                self.hits += 1
+        return found
+
+    def put_many(self, tokenizer: str, counts: Dict[str, int]) -> None:
+        with self._lock:
+            for chunk_id, count in counts.items():
+                self._counts[(tokenizer, chunk_id)] = count
+                self._counts.move_to_end((tokenizer, chunk_id))
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._counts), "hits": self.hits, "misses": self.misses}
+
+
+def _char_index_by_byte(text: str) -> List[int]:
+    """For each UTF-8 byte offset ``0..len(bytes)``, the index of the first character at or after it."""
+    index: List[int] = []
+    for char_position, char in enumerate(text):
+        width = len(char.encode("utf-8"))
+        index.append(char_position)
+        index.extend([char_position + 1] * (width - 1))
+    index.append(len(text))
+    return index
+
+
+__all__ = [
+    "Encoding",
+    "Tokenizer",
+    "WhitespaceTokenizer",
+    "TiktokenTokenizer",
+    "HuggingFaceTokenizer",
+    "TokenCountCache",
+    "get_tokenizer",
+]
@@ -1,7 +1,20 @@
 """Embedding clients."""
 
 from .base import EmbeddingClient
+from .cache import CachedEmbeddingClient, EmbeddingStore
+from .microbatch import MicroBatchingEmbeddingClient
+from .http_pool import AsyncHTTPPool, aclose_shared_async_pool, shared_async_pool
 from .ollama import OllamaEmbeddingClient
 from .openai_embedding import OpenAIEmbeddingClient
 
-__all__ = ["EmbeddingClient", "OllamaEmbeddingClient", "OpenAIEmbeddingClient"]
+__all__ = [
+    "EmbeddingClient",
+    "CachedEmbeddingClient",
+    "EmbeddingStore",
+    "MicroBatchingEmbeddingClient",
+    "AsyncHTTPPool",
+    "shared_async_pool",
+    "aclose_shared_async_pool",
+    "OllamaEmbeddingClient",
+    "OpenAIEmbeddingClient",
+]
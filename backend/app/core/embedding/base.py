@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Iterable, List, Sequence
 
 
 class EmbeddingClient(ABC):
-    """Abstract interface for embedding providers."""
+    """Abstract interface for embedding providers.
+
+    ``aembed``/``aembed_batch`` are the async counterparts of ``embed``/
+    ``embed_batch``; by default they run the sync methods in a worker thread
+    so every client can be awaited, and HTTP clients override them with
+    native async requests.
+    """
 
     @abstractmethod
     def embed(self, text: str) -> List[float]:
@@ -18,6 +25,14 @@ class EmbeddingClient(ABC):
         """Embed a batch of texts; default iterates embed."""
         return [self.embed(t) for t in texts]
 
+    async def aembed(self, text: str) -> List[float]:
+        """Embed a single text without blocking the event loop."""
+        return await asyncio.to_thread(self.embed, text)
+
+    async def aembed_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed a batch of texts without blocking the event loop."""
+        return await asyncio.to_thread(self.embed_batch, list(texts))
+
     @property
     @abstractmethod
     def model_name(self) -> str:
@@ -0,0 +1,252 @@
+"""Persistent embedding cache: SQLite float32 store with an in-memory LRU front."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.core.embedding.base import EmbeddingClient
+
+FilePath = Union[str, Path]
+
+DEFAULT_EMBEDDING_CACHE_DB = os.getenv("EMBEDDING_CACHE_DB", "data/embedding_cache.sqlite3")
+DEFAULT_EMBEDDING_CACHE_LRU_SIZE = int(os.getenv("EMBEDDING_CACHE_LRU_SIZE", "10000"))
+QUERY_BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    text_hash BLOB NOT NULL,
+    dim INTEGER NOT NULL,
+    vector BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (model, text_hash, dim)
+) WITHOUT ROWID;
+"""
+
+_CacheKey = Tuple[str, bytes]
+
+
+def normalize_text(text: str) -> str:
+    """NFKC with whitespace runs collapsed: re-flowed copies of a text share a cache entry."""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def text_hash(text: str) -> bytes:
+    """16-byte blake2b digest of the normalized text."""
+    return hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16).digest()
+
+
+class EmbeddingStore:
+    """Thread-safe SQLite store of float32 vectors keyed by model, text hash and dimension.
+
+    A 768-dimension vector takes 3 KB, plus a 16-byte key.
+
+    Args:
+        path: SQLite database file, created with its parent directory if
+            missing. ``":memory:"`` keeps vectors in memory (tests only).
+    """
+
+    def __init__(self, path: FilePath = DEFAULT_EMBEDDING_CACHE_DB) -> None:
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._lock = Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def get_many(self, model: str, hashes: Sequence[bytes], dim: Optional[int] = None) -> Dict[bytes, np.ndarray]:
+        """Stored vectors of ``model`` for the given text hashes (restricted to ``dim`` when known)."""
+        found: Dict[bytes, np.ndarray] = {}
+        with self._lock:
+            for start in range(0, len(hashes), QUERY_BATCH_SIZE):
+                batch = list(hashes[start : start + QUERY_BATCH_SIZE])
+                query = f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({', '.join('?' for _ in batch)})"
+                params: List[object] = [model, *batch]
+                if dim is not None:
+                    query += " AND dim = ?"
+                    params.append(dim)
+                for key, blob in self._conn.execute(query, params):
+                    found[bytes(key)] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, model: str, vectors: Dict[bytes, Sequence[float]]) -> None:
+        now = time.time()
+        rows = []
+        for key, vector in vectors.items():
+            array = np.asarray(vector, dtype=np.float32)
+            rows.append((model, key, int(array.shape[0]), array.tobytes(), now))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, dim, vector, created_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def count(self, model: Optional[str] = None) -> int:
+        with self._lock:
+            if model is None:
+                return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings WHERE model = ?", (model,)).fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddingClient(EmbeddingClient):
+    """Wrap an ``EmbeddingClient`` with an LRU in front of a persistent ``EmbeddingStore``.
+
+    Texts are looked up by ``(model name, hash of the normalized text)`` and,
+    once the wrapped client reports it, its ``dimension``. ``embed_batch``
+    deduplicates the batch, serves what it can from memory, then from disk
+    in batched queries, embeds only the remaining texts with one
+    ``embed_batch`` call of the wrapped client and writes them back. Use
+    ``cached.embed_batch`` as ``TenderMilvusIndexer``'s ``embed_fn`` and the
+    client itself for query embedding (``VectorSearcher``).
+
+    Args:
+        client: Embedding client to wrap.
+        store: Persistent store; defaults to ``EmbeddingStore()``
+            (``EMBEDDING_CACHE_DB``). Can be shared between clients: entries
+            are separated by model name.
+        lru_size: Vectors kept in memory (``EMBEDDING_CACHE_LRU_SIZE``).
+    """
+
+    def __init__(
+        self,
+        client: EmbeddingClient,
+        store: Optional[EmbeddingStore] = None,
+        *,
+        lru_size: int = DEFAULT_EMBEDDING_CACHE_LRU_SIZE,
+    ) -> None:
+        self.client = client
+        self.store = store if store is not None else EmbeddingStore()
+        self.lru_size = lru_size
+        self._lru: "OrderedDict[_CacheKey, np.ndarray]" = OrderedDict()
+        self._lock = Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def model_name(self) -> str:
+        return self.client.model_name
+
+    @property
+    def dimension(self) -> int | None:
+        return self.client.dimension
+
+    def embed(self, text: str) -> List[float]:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        lookup = self._lookup(texts)
+        if lookup.missing:
+            self._fill(lookup, self.client.embed_batch([lookup.unique[key] for key in lookup.missing]))
+        return lookup.result()
+
+    async def aembed(self, text: str) -> List[float]:
+        return (await self.aembed_batch([text]))[0]
+
+    async def aembed_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        """Async ``embed_batch``: misses go to the wrapped client's ``aembed_batch``.
+
+        The lookups and writes run in a worker thread: they take the store
+        lock, which an indexing thread may hold through a long ``put_many``,
+        and must not stall the event loop.
+        """
+        lookup = await asyncio.to_thread(self._lookup, texts)
+        if lookup.missing:
+            embedded = await self.client.aembed_batch([lookup.unique[key] for key in lookup.missing])
+            await asyncio.to_thread(self._fill, lookup, embedded)
+        return lookup.result()
+
+    def stats(self) -> Dict[str, float]:
+        """Lookup counters since creation: memory/disk hits, misses and overall hit rate."""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "lru_entries": len(self._lru),
+            }
+
+    def _lookup(self, texts: Sequence[str]) -> "_Lookup":
+        """Resolve ``texts`` from memory, then disk; what is left is in ``missing``."""
+        model = self.model_name
+        lookup = _Lookup(model=model, hashes=[text_hash(text) for text in texts])
+        for key, text in zip(lookup.hashes, texts):
+            lookup.unique.setdefault(key, text)
+
+        with self._lock:
+            for key in lookup.unique:
+                cached = self._lru.get((model, key))
+                if cached is not None:
+                    self._lru.move_to_end((model, key))
+                    lookup.vectors[key] = cached
+            self.memory_hits += len(lookup.vectors)
+
+        missing = [key for key in lookup.unique if key not in lookup.vectors]
+        if missing:
+            stored = self.store.get_many(model, missing, self.dimension)
+            with self._lock:
+                self.disk_hits += len(stored)
+                for key, array in stored.items():
+                    lookup.vectors[key] = array
+                    self._remember((model, key), array)
+            lookup.missing = [key for key in missing if key not in stored]
+        return lookup
+
+    def _fill(self, lookup: "_Lookup", embedded: Sequence[Sequence[float]]) -> None:
+        """Store freshly embedded vectors of ``lookup.missing``."""
+        if len(embedded) != len(lookup.missing):
+            raise ValueError("Embedding count does not match texts length")
+        computed = {key: np.asarray(vector, dtype=np.float32) for key, vector in zip(lookup.missing, embedded)}
+        self.store.put_many(lookup.model, computed)
+        lookup.vectors.update(computed)
+        with self._lock:
+            self.misses += len(computed)
+            for key, vector in computed.items():
+                self._remember((lookup.model, key), vector)
+
+    def _remember(self, key: _CacheKey, vector: np.ndarray) -> None:
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+
+@dataclass
+class _Lookup:
+    """Cache resolution of one batch: per-position hashes, unique texts, found vectors, misses.
+
+    Vectors are the cached float32 arrays; ``result`` hands out fresh lists,
+    so callers can mutate them without touching the cache.
+    """
+
+    model: str
+    hashes: List[bytes]
+    unique: Dict[bytes, str] = field(default_factory=dict)
+    vectors: Dict[bytes, np.ndarray] = field(default_factory=dict)
+    missing: List[bytes] = field(default_factory=list)
+
+    def result(self) -> List[List[float]]:
+        return [self.vectors[key].tolist() for key in self.hashes]
+
+
+__all__ = ["CachedEmbeddingClient", "EmbeddingStore", "normalize_text", "text_hash"]
@@ -0,0 +1,100 @@
+"""Shared async HTTP connection pool and concurrency limit for embedding clients."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from threading import Lock
+from typing import Optional
+
+try:
+    import httpx
+except ImportError as exc:  # pragma: no cover - optional dependency
+    httpx = None  # type: ignore
+    _import_error = exc
+else:
+    _import_error = None
+
+try:
+    import h2  # noqa: F401  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    _HTTP2_AVAILABLE = False
+else:
+    _HTTP2_AVAILABLE = True
+
+DEFAULT_EMBEDDING_MAX_CONNECTIONS = int(os.getenv("EMBEDDING_HTTP_MAX_CONNECTIONS", "32"))
+DEFAULT_EMBEDDING_MAX_CONCURRENCY = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "8"))
+DEFAULT_EMBEDDING_HTTP_TIMEOUT = float(os.getenv("EMBEDDING_HTTP_TIMEOUT", "120"))
+DEFAULT_EMBEDDING_HTTP2 = os.getenv("EMBEDDING_HTTP2", "1") == "1"
+
+
+class AsyncHTTPPool:
+    """One ``httpx.AsyncClient`` plus a semaphore bounding in-flight embedding requests.
+
+    HTTP/2 is negotiated (ALPN, so HTTPS endpoints such as OpenAI) when the
+    ``h2`` package is installed; plain-HTTP servers such as a local Ollama
+    keep using pooled HTTP/1.1 keep-alive connections.
+
+    Args:
+        max_connections: Connection pool size.
+        max_concurrency: Requests in flight at once across all clients using
+            the pool (``limit()``).
+        timeout: Default per-request timeout in seconds (clients may pass
+            their own per request).
+        http2: Enable HTTP/2 when available.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = DEFAULT_EMBEDDING_MAX_CONNECTIONS,
+        max_concurrency: int = DEFAULT_EMBEDDING_MAX_CONCURRENCY,
+        timeout: float = DEFAULT_EMBEDDING_HTTP_TIMEOUT,
+        http2: bool = DEFAULT_EMBEDDING_HTTP2,
+    ) -> None:
+        if _import_error:
+            raise ImportError("httpx is required for async embedding clients") from _import_error
+        if max_connections <= 0 or max_concurrency <= 0:
+            raise ValueError("max_connections and max_concurrency must be positive")
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.client = httpx.AsyncClient(
+            http2=http2 and _HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(timeout),
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def limit(self) -> asyncio.Semaphore:
+        """Semaphore to hold around each request (created on the running loop)."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+_shared_pool: Optional[AsyncHTTPPool] = None
+_shared_pool_lock = Lock()
+
+
+def shared_async_pool() -> AsyncHTTPPool:
+    """Process-wide pool used by async embedding clients unless they are given one."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = AsyncHTTPPool()
+        return _shared_pool
+
+
+async def aclose_shared_async_pool() -> None:
+    """Close the shared pool (application shutdown); the next use creates a new one."""
+    global _shared_pool
+    with _shared_pool_lock:
+        pool, _shared_pool = _shared_pool, None
+    if pool is not None:
+        await pool.aclose()
+
+
+__all__ = ["AsyncHTTPPool", "shared_async_pool", "aclose_shared_async_pool"]
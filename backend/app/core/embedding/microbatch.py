@@ -0,0 +1,202 @@
+"""Micro-batching front for query embeddings under concurrent search traffic."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import queue
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import Lock, Thread
+from typing import Deque, Dict, List, Optional, Sequence
+
+from src.core.embedding.base import EmbeddingClient
+
+DEFAULT_MICROBATCH_WINDOW_MS = float(os.getenv("EMBEDDING_MICROBATCH_WINDOW_MS", "5"))
+DEFAULT_MICROBATCH_MAX_SIZE = int(os.getenv("EMBEDDING_MICROBATCH_MAX_SIZE", "32"))
+DEFAULT_MICROBATCH_WORKERS = int(os.getenv("EMBEDDING_MICROBATCH_WORKERS", "4"))
+LATENCY_SAMPLES = 10_000
+
+_STOP = object()
+
+
+@dataclass
+class _Pending:
+    text: str
+    future: "Future[List[float]]"
+    enqueued_at: float
+
+
+class MicroBatchingEmbeddingClient(EmbeddingClient):
+    """Coalesce concurrent single-text ``embed`` calls into ``embed_batch`` calls of the wrapped client.
+
+    A dispatcher thread takes the first waiting text, keeps collecting for
+    ``window_ms`` milliseconds or until ``max_batch_size`` texts, then hands
+    the batch (identical texts embedded once) to one of ``max_inflight``
+    workers, which calls ``client.embed_batch`` and fans the vectors back to
+    the callers. Sync callers (``embed``, e.g. ``VectorSearcher.search`` in
+    FastAPI's threadpool) block on their future; async callers
+    (``aembed``, e.g. ``VectorSearcher.asearch``) await it, and both share the
+    same batches. ``embed_batch`` is passed straight through.
+
+    ``stats()`` reports the batch size distribution and the queueing latency
+    added to each call (enqueue to dispatch).
+
+    Args:
+        client: Embedding client to wrap, ideally one with a real batch
+            endpoint (``OllamaEmbeddingClient``, ``OpenAIEmbeddingClient``).
+        window_ms: How long the first text of a batch waits for company
+            (``EMBEDDING_MICROBATCH_WINDOW_MS``).
+        max_batch_size: Texts per batch; a full batch is dispatched at once
+            (``EMBEDDING_MICROBATCH_MAX_SIZE``).
+        max_inflight: Batches embedded concurrently
+            (``EMBEDDING_MICROBATCH_WORKERS``).
+    """
+
+    def __init__(
+        self,
+        client: EmbeddingClient,
+        *,
+        window_ms: float = DEFAULT_MICROBATCH_WINDOW_MS,
+        max_batch_size: int = DEFAULT_MICROBATCH_MAX_SIZE,
+        max_inflight: int = DEFAULT_MICROBATCH_WORKERS,
+    ) -> None:
+        if window_ms < 0 or max_batch_size <= 0 or max_inflight <= 0:
+            raise ValueError("window_ms must be non-negative, max_batch_size and max_inflight positive")
+        self.client = client
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.max_inflight = max_inflight
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        self._dispatcher: Optional[Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = Lock()
+        self._closed = False
+        self._batch_sizes: Counter = Counter()
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._requests = 0
+
+    @property
+    def model_name(self) -> str:
+        return self.client.model_name
+
+    @property
+    def dimension(self) -> int | None:
+        return self.client.dimension
+
+    def embed(self, text: str) -> List[float]:
+        return self.submit(text).result()
+
+    def embed_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        return self.client.embed_batch(texts)
+
+    async def aembed(self, text: str) -> List[float]:
+        return await asyncio.wrap_future(self.submit(text))
+
+    async def aembed_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        return await self.client.aembed_batch(texts)
+
+    def submit(self, text: str) -> "Future[List[float]]":
+        """Queue ``text`` for the next batch and return the future of its vector."""
+        future: "Future[List[float]]" = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatchingEmbeddingClient is closed")
+            self._ensure_started()
+            self._queue.put(_Pending(text, future, time.perf_counter()))
+        return future
+
+    def stats(self) -> Dict[str, object]:
+        """Batch size distribution and added queueing latency (ms, over the last ``LATENCY_SAMPLES`` calls)."""
+        with self._lock:
+            sizes = dict(sorted(self._batch_sizes.items()))
+            latencies = sorted(self._latencies)
+            requests = self._requests
+        batches = sum(sizes.values())
+        return {
+            "requests": requests,
+            "batches": batches,
+            "mean_batch_size": round(requests / batches, 2) if batches else 0.0,
+            "batch_sizes": sizes,
+            "queue_ms_mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            "queue_ms_p50": _percentile_ms(latencies, 0.50),
+            "queue_ms_p95": _percentile_ms(latencies, 0.95),
+            "queue_ms_max": _percentile_ms(latencies, 1.0),
+        }
+
+    def close(self) -> None:
+        """Stop the dispatcher after the queued texts are dispatched."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            dispatcher, executor = self._dispatcher, self._executor
+        if dispatcher is not None:
+            self._queue.put(_STOP)
+            dispatcher.join()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _ensure_started(self) -> None:
+        if self._dispatcher is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_inflight, thread_name_prefix="embed-microbatch")
+            self._dispatcher = Thread(target=self._dispatch_loop, name="embed-microbatch-dispatcher", daemon=True)
+            self._dispatcher.start()
+
+    def _dispatch_loop(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch: List[_Pending] = [first]  # type: ignore[list-item]
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)  # type: ignore[arg-type]
+            dispatched_at = time.perf_counter()
+            with self._lock:
+                self._batch_sizes[len(batch)] += 1
+                self._requests += len(batch)
+                self._latencies.extend(dispatched_at - pending.enqueued_at for pending in batch)
+            assert self._executor is not None
+            self._executor.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch: List[_Pending]) -> None:
+        # Callers cancelled while queued (timeout, disconnect) are dropped; the
+        # others' futures become running and can no longer be cancelled, so
+        # setting their result below cannot raise.
+        batch = [pending for pending in batch if pending.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        texts = list(dict.fromkeys(pending.text for pending in batch))
+        try:
+            vectors = self.client.embed_batch(texts)
+            if len(vectors) != len(texts):
+                raise ValueError("Embedding count does not match texts length")
+        except BaseException as exc:
+            for pending in batch:
+                pending.future.set_exception(exc)
+            return
+        by_text = dict(zip(texts, vectors))
+        for pending in batch:
+            pending.future.set_result(by_text[pending.text])
+
+
+def _percentile_ms(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return round(sorted_values[index] * 1000, 3)
+
+
+__all__ = ["MicroBatchingEmbeddingClient"]
@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Dict, List, Optional, Sequence
 
 from src.core.embedding.base import EmbeddingClient
+from src.core.embedding.http_pool import AsyncHTTPPool, shared_async_pool
 
 try:
     import requests
@@ -17,10 +22,31 @@ else:
 
 DEFAULT_OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
 DEFAULT_OLLAMA_EMBED_MODEL = os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+DEFAULT_OLLAMA_EMBED_BATCH_SIZE = int(os.getenv("OLLAMA_EMBED_BATCH_SIZE", "32"))
+DEFAULT_OLLAMA_EMBED_CONCURRENCY = int(os.getenv("OLLAMA_EMBED_CONCURRENCY", "4"))
+
+logger = logging.getLogger(__name__)
 
 
 class OllamaEmbeddingClient(EmbeddingClient):
-    """Client for Ollama's /api/embeddings endpoint."""
+    """Client for Ollama's embedding endpoints.
+
+    ``embed_batch`` posts up to ``batch_size`` texts per request to the
+    multi-input ``/api/embed`` endpoint and returns vectors in input order.
+    If the server does not support it (older Ollama releases answer 404), the client
+    switches for good to the legacy single-text ``/api/embeddings``
+    endpoint, run for ``concurrency`` texts at a time. All requests share a
+    keep-alive ``requests.Session`` whose connection pool is sized to
+    ``concurrency``.
+
+    Note that ``/api/embed`` returns L2-normalized vectors while the legacy
+    endpoint does not; ``embed`` goes through the same endpoint as
+    ``embed_batch`` so queries and chunks stay comparable.
+
+    ``aembed``/``aembed_batch`` do the same over ``pool`` (the shared
+    ``AsyncHTTPPool`` by default): batches are sent concurrently, each
+    request holding the pool's semaphore and bounded by ``timeout``.
+    """
 
     def __init__(
         self,
@@ -28,39 +54,195 @@ class OllamaEmbeddingClient(EmbeddingClient):
         model: str = DEFAULT_OLLAMA_EMBED_MODEL,
         base_url: str = DEFAULT_OLLAMA_URL,
         timeout: int = 120,
+        batch_size: int = DEFAULT_OLLAMA_EMBED_BATCH_SIZE,
+        concurrency: int = DEFAULT_OLLAMA_EMBED_CONCURRENCY,
+        session: Optional["requests.Session"] = None,
+        pool: Optional[AsyncHTTPPool] = None,
     ) -> None:
         if _import_error:
             raise ImportError("requests is required for OllamaEmbeddingClient") from _import_error
+        if batch_size <= 0 or concurrency <= 0:
+            raise ValueError("batch_size and concurrency must be positive")
         self._model = model
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.session = session or _pooled_session(concurrency)
+        self._pool = pool
+        self._batch_supported: Optional[bool] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = Lock()
 
     @property
     def model_name(self) -> str:
         return self._model
 
+    @property
+    def batch_supported(self) -> Optional[bool]:
+        """Whether ``/api/embed`` is available (``None`` until the first request)."""
+        return self._batch_supported
+
     def embed(self, text: str) -> List[float]:
+        if self._batch_supported is False:
+            return self._embed_legacy(text)
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed texts in ``/api/embed`` requests of ``batch_size`` texts, preserving order."""
+        texts = list(texts)
+        if not texts:
+            return []
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start : start + self.batch_size]
+            if self._batch_supported is not False:
+                embedded = self._embed_multi(batch)
+                if embedded is not None:
+                    vectors.extend(embedded)
+                    continue
+            vectors.extend(self._embed_concurrently(texts[start:]))
+            break
+        return vectors
+
+    async def aembed(self, text: str) -> List[float]:
+        return (await self.aembed_batch([text]))[0]
+
+    async def aembed_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        """Async ``embed_batch``: ``/api/embed`` batches sent concurrently, results in input order."""
+        texts = list(texts)
+        if not texts:
+            return []
+        if self._batch_supported is False:
+            return await self._aembed_legacy_all(texts)
+        batches = [texts[start : start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+        if self._batch_supported is None:
+            # Probe with the first batch before fanning out.
+            first = await self._aembed_multi(batches[0])
+            if first is None:
+                return await self._aembed_legacy_all(texts)
+            results = [first, *await asyncio.gather(*(self._aembed_multi(batch) for batch in batches[1:]))]
+        else:
+            results = list(await asyncio.gather(*(self._aembed_multi(batch) for batch in batches)))
+        vectors: List[List[float]] = []
+        for batch, result in zip(batches, results):
+            vectors.extend(result if result is not None else await self._aembed_legacy_all(batch))
+        return vectors
+
+    def close(self) -> None:
+        """Close the pooled session and the fallback worker pool."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        self.session.close()
+
+    def _embed_multi(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """One ``/api/embed`` call; ``None`` when the endpoint is missing."""
+        resp = self.session.post(
+            f"{self.base_url}/api/embed",
+            json={"model": self._model, "input": texts},
+            timeout=self.timeout,
+        )
+        return self._parse_multi(resp, len(texts))
+
+    async def _aembed_multi(self, texts: List[str]) -> Optional[List[List[float]]]:
+        pool = self._async_pool()
+        async with pool.limit():
+            resp = await pool.client.post(
+                f"{self.base_url}/api/embed",
+                json={"model": self._model, "input": texts},
+                timeout=self.timeout,
+            )
+        return self._parse_multi(resp, len(texts))
+
+    def _parse_multi(self, resp: Any, expected: int) -> Optional[List[List[float]]]:
+        """Vectors of an ``/api/embed`` response (``requests`` or ``httpx``); ``None`` when the endpoint is missing."""
+        if self._batch_supported is not True and _endpoint_missing(resp):
+            if self._batch_supported is None:
+                logger.info("Ollama at %s has no /api/embed; falling back to concurrent /api/embeddings", self.base_url)
+                self._batch_supported = False
+            return None
+        resp.raise_for_status()
+        data = resp.json()
+        raw = data.get("embeddings")
+        vectors = [_normalize_embedding(item) for item in raw] if isinstance(raw, list) else []
+        if len(vectors) != expected or any(v is None for v in vectors):
+            raise ValueError(f"Invalid batch embedding response from Ollama: keys={list(data.keys())}")
+        self._batch_supported = True
+        return vectors  # type: ignore[return-value]
+
+    def _embed_concurrently(self, texts: List[str]) -> List[List[float]]:
+        if len(texts) == 1 or self.concurrency == 1:
+            return [self._embed_legacy(text) for text in texts]
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="ollama-embed")
+            executor = self._executor
+        return list(executor.map(self._embed_legacy, texts))
+
+    async def _aembed_legacy_all(self, texts: List[str]) -> List[List[float]]:
+        return list(await asyncio.gather(*(self._aembed_legacy(text) for text in texts)))
+
+    def _embed_legacy(self, text: str) -> List[float]:
         # Ollama embeddings API expects "prompt"; support "input" for backward compatibility.
         payload: Dict[str, Any] = {"model": self._model, "prompt": text}
-        resp = requests.post(
+        resp = self.session.post(
             f"{self.base_url}/api/embeddings",
             json=payload,
             timeout=self.timeout,
         )
-        resp.raise_for_status()
-        data = resp.json()
+        return _parse_legacy(resp)
+
+    async def _aembed_legacy(self, text: str) -> List[float]:
+        pool = self._async_pool()
+        async with pool.limit():
+            resp = await pool.client.post(
+                f"{self.base_url}/api/embeddings",
+                json={"model": self._model, "prompt": text},
+                timeout=self.timeout,
+            )
+        return _parse_legacy(resp)
+
+    def _async_pool(self) -> AsyncHTTPPool:
+        # Not cached: after aclose_shared_async_pool() the next request gets a fresh shared pool.
+        return self._pool if self._pool is not None else shared_async_pool()
+
+
+def _parse_legacy(resp: Any) -> List[float]:
+    """Vector of an ``/api/embeddings`` response (``requests`` or ``httpx``)."""
+    resp.raise_for_status()
+    data = resp.json()
+    # Handle different shapes: {"embedding": [...]}, {"data": [{"embedding": [...]}]}, {"embeddings": [...]}
+    vector = data.get("embedding") or data.get("vector")
+    if vector is None and isinstance(data.get("data"), list) and data["data"]:
+        vector = data["data"][0].get("embedding")
+    if vector is None and isinstance(data.get("embeddings"), list) and data["embeddings"]:
+        vector = data["embeddings"][0]
+
+    normalized = _normalize_embedding(vector)
+    if normalized is None:
+        raise ValueError(f"Invalid embedding response from Ollama: keys={list(data.keys())}")
+    return normalized
+
+
+def _endpoint_missing(resp: Any) -> bool:
+    """404/405 from the router, as opposed to Ollama's JSON 404 for an unknown model."""
+    if resp.status_code not in (404, 405):
+        return False
+    try:
+        return "error" not in resp.json()
+    except ValueError:
+        return True
+
 
-        # Handle different shapes: {"embedding": [...]}, {"data": [{"embedding": [...]}]}, {"embeddings": [...]}
-        vector = data.get("embedding") or data.get("vector")
-        if vector is None and isinstance(data.get("data"), list) and data["data"]:
-            vector = data["data"][0].get("embedding")
-        if vector is None and isinstance(data.get("embeddings"), list) and data["embeddings"]:
-            vector = data["embeddings"][0]
-
-        normalized = _normalize_embedding(vector)
-        if normalized is None:
-            raise ValueError(f"Invalid embedding response from Ollama: keys={list(data.keys())}")
-        return normalized
+def _pooled_session(pool_size: int) -> "requests.Session":
+    """Keep-alive session with ``pool_size`` pooled connections to the Ollama host."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
 
 def _normalize_embedding(raw: Any) -> List[float] | None:
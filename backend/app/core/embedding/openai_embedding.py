@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Dict, List, Optional, Sequence
 
+from src.core.chunking.tokenizers import TiktokenTokenizer, Tokenizer
 from src.core.embedding.base import EmbeddingClient
+from src.core.embedding.http_pool import DEFAULT_EMBEDDING_HTTP_TIMEOUT, AsyncHTTPPool, shared_async_pool
 
 try:
     import openai
@@ -18,10 +24,37 @@ else:
 DEFAULT_OPENAI_EMBED_MODEL = os.getenv("OPENAI_EMBED_MODEL", "text-embedding-3-small")
 DEFAULT_OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")
 DEFAULT_OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# The API caps a request at 2048 inputs and 300k tokens; stay below both.
+DEFAULT_OPENAI_EMBED_MAX_ITEMS = int(os.getenv("OPENAI_EMBED_MAX_ITEMS", "1024"))
+DEFAULT_OPENAI_EMBED_MAX_TOKENS = int(os.getenv("OPENAI_EMBED_MAX_TOKENS", "250000"))
+DEFAULT_OPENAI_EMBED_CONCURRENCY = int(os.getenv("OPENAI_EMBED_CONCURRENCY", "4"))
+# Context length of the text-embedding-3 models: a longer input is rejected.
+DEFAULT_OPENAI_EMBED_MAX_INPUT_TOKENS = int(os.getenv("OPENAI_EMBED_MAX_INPUT_TOKENS", "8191"))
+
+logger = logging.getLogger(__name__)
+
+_SIZE_ERROR_HINTS = ("maximum", "too many", "too large", "too long", "max_tokens", "limit")
 
 
 class OpenAIEmbeddingClient(EmbeddingClient):
-    """Client for OpenAI embeddings."""
+    """Client for OpenAI embeddings.
+
+    ``embed_batch`` packs texts, in order, into requests of at most
+    ``max_items`` inputs and ``max_tokens`` total tokens (counted with
+    ``tokenizer``, ``cl100k_base`` via tiktoken by default; a conservative
+    two-characters-per-token estimate without tiktoken) and sends up to
+    ``concurrency`` requests at a time. A text longer than
+    ``max_input_tokens`` (the model context) is truncated to it, with a
+    warning, before packing; a request still rejected as too large is
+    split in half and retried. Vectors are returned in input order. The
+    embedding ``dimension`` is learned from the first response.
+
+    ``aembed``/``aembed_batch`` use an ``openai.AsyncOpenAI`` client on the
+    ``httpx`` client of ``pool`` (the shared ``AsyncHTTPPool`` by default,
+    HTTP/2 when ``h2`` is installed): packed batches are awaited
+    concurrently, each request holding the pool's semaphore and bounded by
+    ``timeout`` seconds.
+    """
 
     def __init__(
         self,
@@ -29,27 +62,193 @@ class OpenAIEmbeddingClient(EmbeddingClient):
         model: str = DEFAULT_OPENAI_EMBED_MODEL,
         api_key: str | None = DEFAULT_OPENAI_API_KEY,
         base_url: str | None = DEFAULT_OPENAI_BASE_URL,
+        max_items: int = DEFAULT_OPENAI_EMBED_MAX_ITEMS,
+        max_tokens: int = DEFAULT_OPENAI_EMBED_MAX_TOKENS,
+        concurrency: int = DEFAULT_OPENAI_EMBED_CONCURRENCY,
+        max_input_tokens: int = DEFAULT_OPENAI_EMBED_MAX_INPUT_TOKENS,
+        tokenizer: Optional[Tokenizer] = None,
+        pool: Optional[AsyncHTTPPool] = None,
+        timeout: float = DEFAULT_EMBEDDING_HTTP_TIMEOUT,
     ) -> None:
         if _import_error:
             raise ImportError("openai is required for OpenAIEmbeddingClient") from _import_error
         if not api_key:
             raise ValueError("OPENAI_API_KEY is required")
+        if max_items <= 0 or max_tokens <= 0 or concurrency <= 0 or max_input_tokens <= 0:
+            raise ValueError("max_items, max_tokens, concurrency and max_input_tokens must be positive")
         self._model = model
         self.client = openai.OpenAI(api_key=api_key, base_url=base_url) if base_url else openai.OpenAI(api_key=api_key)
+        self._api_key = api_key
+        self._base_url = base_url
+        self._pool = pool
+        self._aclient: Optional["openai.AsyncOpenAI"] = None
+        self._aclient_pool: Optional[AsyncHTTPPool] = None
+        self.timeout = timeout
+        self.max_items = max_items
+        self.max_tokens = max_tokens
+        self.concurrency = concurrency
+        self.max_input_tokens = max_input_tokens
+        self.tokenizer = tokenizer if tokenizer is not None else _default_tokenizer()
+        self._dimension: Optional[int] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = Lock()
 
     @property
     def model_name(self) -> str:
         return self._model
 
     def embed(self, text: str) -> List[float]:
-        resp = self.client.embeddings.create(model=self._model, input=[text])
-        vector = resp.data[0].embedding
-        return vector
+        return self._create(self._pack([text])[0])[0]
+
+    def embed_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed texts in token- and count-bounded requests, ``concurrency`` at a time, preserving order."""
+        texts = list(texts)
+        if not texts:
+            return []
+        batches = self._pack(texts)
+        if len(batches) == 1 or self.concurrency == 1:
+            results = [self._embed_splitting(batch) for batch in batches]
+        else:
+            results = list(self._get_executor().map(self._embed_splitting, batches))
+        return [vector for result in results for vector in result]
+
+    async def aembed(self, text: str) -> List[float]:
+        return (await self._acreate(self._pack([text])[0]))[0]
+
+    async def aembed_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        """Async ``embed_batch``: packed batches awaited concurrently, results in input order."""
+        texts = list(texts)
+        if not texts:
+            return []
+        results = await asyncio.gather(*(self._aembed_splitting(batch) for batch in self._pack(texts)))
+        return [vector for result in results for vector in result]
 
     @property
     def dimension(self) -> int | None:
-        # OpenAI embeddings include dimensions in response; could be cached.
+        """Embedding size, known after the first successful request."""
+        return self._dimension
+
+    def close(self) -> None:
+        """Shut down the worker pool used for concurrent batches."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def _pack(self, texts: List[str]) -> List[List[str]]:
+        """Split ``texts`` into consecutive batches within ``max_items`` and ``max_tokens``.
+
+        Texts over ``max_input_tokens`` are truncated first: sent as is, one
+        would fail its whole request however small the batch.
+        """
+        counts = self._count_tokens(texts)
+        batches: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+        for text, tokens in zip(texts, counts):
+            if tokens > self.max_input_tokens:
+                logger.warning("Embedding input of %d tokens exceeds %d; truncating it", tokens, self.max_input_tokens)
+                text, tokens = self._truncate(text), self.max_input_tokens
+            if current and (len(current) >= self.max_items or current_tokens + tokens > self.max_tokens):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def _count_tokens(self, texts: List[str]) -> List[int]:
+        if self.tokenizer is None:
+            return [len(text) // 2 + 1 for text in texts]
+        return self.tokenizer.count_batch(texts)
+
+    def _truncate(self, text: str) -> str:
+        """Longest prefix of ``text`` within ``max_input_tokens``."""
+        if self.tokenizer is None:
+            # Inverse of the two-characters-per-token estimate.
+            return text[: 2 * (self.max_input_tokens - 1)]
+        offsets = self.tokenizer.encode(text).offsets
+        return text[: offsets[self.max_input_tokens - 1][1]]
+
+    def _embed_splitting(self, texts: List[str]) -> List[List[float]]:
+        """Embed one packed batch, halving it while the API rejects it as too large."""
+        try:
+            return self._create(texts)
+        except Exception as exc:
+            if len(texts) == 1 or not _is_size_error(exc):
+                raise
+            middle = len(texts) // 2
+            logger.info("Embedding request of %d inputs rejected as too large; retrying as %d + %d", len(texts), middle, len(texts) - middle)
+            return self._embed_splitting(texts[:middle]) + self._embed_splitting(texts[middle:])
+
+    async def _aembed_splitting(self, texts: List[str]) -> List[List[float]]:
+        try:
+            return await self._acreate(texts)
+        except Exception as exc:
+            if len(texts) == 1 or not _is_size_error(exc):
+                raise
+            middle = len(texts) // 2
+            logger.info("Embedding request of %d inputs rejected as too large; retrying as %d + %d", len(texts), middle, len(texts) - middle)
+            first, second = await asyncio.gather(self._aembed_splitting(texts[:middle]), self._aembed_splitting(texts[middle:]))
+            return first + second
+
+    def _create(self, texts: List[str]) -> List[List[float]]:
+        resp = self.client.embeddings.create(model=self._model, input=texts, timeout=self.timeout)
+        return self._vectors(resp, texts)
+
+    async def _acreate(self, texts: List[str]) -> List[List[float]]:
+        pool = self._async_pool()
+        async with pool.limit():
+            resp = await self._async_client(pool).embeddings.create(model=self._model, input=texts, timeout=self.timeout)
+        return self._vectors(resp, texts)
+
+    def _vectors(self, resp: Any, texts: List[str]) -> List[List[float]]:
+        data = sorted(resp.data, key=lambda item: item.index)
+        if len(data) != len(texts):
+            raise ValueError(f"OpenAI returned {len(data)} embeddings for {len(texts)} inputs")
+        vectors = [list(item.embedding) for item in data]
+        if self._dimension is None and vectors:
+            self._dimension = len(vectors[0])
+        return vectors
+
+    def _async_pool(self) -> AsyncHTTPPool:
+        # Not cached: after aclose_shared_async_pool() the next request gets a fresh shared pool.
+        return self._pool if self._pool is not None else shared_async_pool()
+
+    def _async_client(self, pool: AsyncHTTPPool) -> "openai.AsyncOpenAI":
+        """``AsyncOpenAI`` on ``pool``'s client, rebuilt when the shared pool has been replaced."""
+        if self._aclient is None or self._aclient_pool is not pool:
+            kwargs: Dict[str, Any] = {"api_key": self._api_key, "http_client": pool.client}
+            if self._base_url:
+                kwargs["base_url"] = self._base_url
+            self._aclient = openai.AsyncOpenAI(**kwargs)
+            self._aclient_pool = pool
+        return self._aclient
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="openai-embed")
+            return self._executor
+
+
+def _default_tokenizer() -> Optional[Tokenizer]:
+    try:
+        return TiktokenTokenizer("cl100k_base")
+    except ImportError:
         return None
 
 
+def _is_size_error(exc: Exception) -> bool:
+    """Whether the API rejected a request for its size (413, or a 400 about limits)."""
+    status = getattr(exc, "status_code", None)
+    if status == 413:
+        return True
+    if status != 400:
+        return False
+    message = str(exc).lower()
+    return any(hint in message for hint in _SIZE_ERROR_HINTS)
+
+
 __all__ = ["OpenAIEmbeddingClient"]
@@ -0,0 +1,537 @@
+"""Near-duplicate detection of token chunks with MinHash signatures and LSH banding.
+
+Tender bundles repeat the same boilerplate (privacy notices, standard
+clauses, signature blocks) in every document of a procedure. Chunks whose
+estimated Jaccard similarity with an already indexed chunk reaches the
+threshold are linked to that canonical chunk instead of being embedded and
+stored again. Signatures live in SQLite so detection spans the whole
+collection, across ingestion runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Any, Collection, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.schemas.chunking import TokenChunk
+
+FilePath = Union[str, Path]
+
+DEFAULT_DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.85"))
+DEFAULT_NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", "128"))
+DEFAULT_BANDS = int(os.getenv("DEDUP_BANDS", "16"))
+DEFAULT_SHINGLE_SIZE = int(os.getenv("DEDUP_SHINGLE_SIZE", "5"))
+MIN_DEDUP_WORDS = int(os.getenv("DEDUP_MIN_WORDS", "20"))
+SEED = 1
+# Ids per ``IN (...)`` list: old SQLite builds allow only 999 bound parameters.
+SQL_BATCH_SIZE = 500
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD_PATTERN = re.compile(r"\w+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dedup_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dedup_signatures (
+    chunk_id TEXT PRIMARY KEY,
+    signature BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dedup_buckets (
+    bucket BLOB NOT NULL,
+    chunk_id TEXT NOT NULL,
+    PRIMARY KEY (bucket, chunk_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS dedup_buckets_chunk ON dedup_buckets (chunk_id);
+CREATE TABLE IF NOT EXISTS dedup_links (
+    chunk_id TEXT PRIMARY KEY,
+    canonical_id TEXT NOT NULL,
+    similarity REAL NOT NULL,
+    section_path TEXT,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    page_numbers TEXT NOT NULL DEFAULT '[]',
+    source_chunk_id TEXT,
+    text TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dedup_links_canonical ON dedup_links (canonical_id);
+"""
+
+# Columns added after the first release, created on databases that predate them.
+_MIGRATIONS = {
+    "text": "ALTER TABLE dedup_links ADD COLUMN text TEXT",
+    "document_key": "ALTER TABLE dedup_links ADD COLUMN document_key TEXT",
+}
+
+_LINK_COLUMNS = "chunk_id, canonical_id, similarity, section_path, metadata, page_numbers, source_chunk_id, text"
+
+
+class MinHasher:
+    """MinHash signatures over word shingles, vectorized with NumPy.
+
+    Text is lowercased and reduced to words; each ``shingle_size``-word
+    window is hashed to 32 bits and ``num_perm`` universal hash functions
+    ``(a * x + b) mod (2^61 - 1)`` are applied to all shingles at once.
+    The signature is the column-wise minimum (``uint32``, 4 bytes per
+    permutation).
+    """
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, shingle_size: int = DEFAULT_SHINGLE_SIZE, seed: int = SEED) -> None:
+        if num_perm <= 0 or shingle_size <= 0:
+            raise ValueError("num_perm and shingle_size must be positive")
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        shingles = self._shingle_hashes(text)
+        if shingles.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        # a, x < 2^32 keeps a * x + b within uint64 before the modulo.
+        hashed = (np.outer(shingles, self._a) + self._b) % _MERSENNE_PRIME
+        return (hashed & _MAX_HASH).min(axis=0).astype(np.uint32)
+
+    def _shingle_hashes(self, text: str) -> np.ndarray:
+        words = _WORD_PATTERN.findall(text.lower())
+        size = min(self.shingle_size, len(words))
+        shingles = {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)} if words else set()
+        return np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+
+
+def estimate_similarity(signature: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """Estimated Jaccard similarity of ``signature`` with each row of ``others``."""
+    return (others == signature).mean(axis=1)
+
+
+@dataclass
+class DuplicateLink:
+    """A chunk stored as a reference to its canonical chunk instead of a vector.
+
+    ``text`` is kept so the duplicate can be promoted to canonical (and
+    written to the collection) when its canonical chunk is deleted; links
+    recorded before it was stored have an empty ``text``.
+    """
+
+    chunk_id: str
+    canonical_id: str
+    similarity: float
+    section_path: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    page_numbers: List[int] = field(default_factory=list)
+    source_chunk_id: Optional[str] = None
+    text: str = ""
+
+    def to_chunk(self) -> TokenChunk:
+        """The duplicate as a ``TokenChunk`` (e.g. to write it once promoted)."""
+        return TokenChunk(
+            id=self.chunk_id,
+            text=self.text,
+            section_path=self.section_path,
+            metadata=dict(self.metadata),
+            page_numbers=list(self.page_numbers),
+            source_chunk_id=self.source_chunk_id,
+        )
+
+
+@dataclass
+class DedupPlan:
+    """Split of a batch into chunks to embed and near-duplicates to link."""
+
+    canonical: List[TokenChunk] = field(default_factory=list)
+    duplicates: List[DuplicateLink] = field(default_factory=list)
+    signatures: Dict[str, np.ndarray] = field(default_factory=dict)
+
+
+class SignatureIndex:
+    """Thread-safe persistent MinHash/LSH index of canonical chunks and duplicate links.
+
+    A signature of ``num_perm`` values is cut into ``bands`` bands; each band
+    is a bucket key, and chunks sharing a bucket are candidates whose full
+    signatures are compared. Use one database per Milvus collection.
+
+    Args:
+        path: SQLite database file, created with its parent directory if
+            missing. ``":memory:"`` keeps the index in memory (tests only).
+        num_perm: Signature length; must divide evenly into ``bands``.
+        bands: LSH bands; more bands catch lower similarities.
+        shingle_size: Words per shingle.
+
+    Raises:
+        ValueError: If the parameters differ from those the database was
+            created with (signatures would not be comparable).
+    """
+
+    def __init__(
+        self,
+        path: FilePath,
+        *,
+        num_perm: int = DEFAULT_NUM_PERM,
+        bands: int = DEFAULT_BANDS,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+    ) -> None:
+        if bands <= 0 or num_perm % bands:
+            raise ValueError("num_perm must be a positive multiple of bands")
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.bands = bands
+        self.rows = num_perm // bands
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._lock = Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(dedup_links)")}
+            for column, statement in _MIGRATIONS.items():
+                if column not in columns:
+                    self._conn.execute(statement)
+            if "document_key" not in columns:
+                # Older links kept the document key only inside their metadata.
+                self._conn.executemany(
+                    "UPDATE dedup_links SET document_key = ? WHERE chunk_id = ?",
+                    [
+                        (json.loads(metadata or "{}").get("document_key"), chunk_id)
+                        for chunk_id, metadata in self._conn.execute("SELECT chunk_id, metadata FROM dedup_links").fetchall()
+                    ],
+                )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS dedup_links_document ON dedup_links (document_key)")
+            self._check_params({"num_perm": num_perm, "bands": bands, "shingle_size": shingle_size, "seed": SEED})
+
+    def _check_params(self, params: Dict[str, int]) -> None:
+        stored = dict(self._conn.execute("SELECT key, value FROM dedup_meta").fetchall())
+        if not stored:
+            self._conn.executemany("INSERT INTO dedup_meta (key, value) VALUES (?, ?)", [(k, str(v)) for k, v in params.items()])
+            return
+        expected = {k: str(v) for k, v in params.items()}
+        if stored != expected:
+            raise ValueError(f"Signature index was created with {stored}, not {expected}")
+
+    def signature(self, text: str) -> np.ndarray:
+        return self.hasher.signature(text)
+
+    def band_keys(self, signature: np.ndarray) -> List[bytes]:
+        """Bucket key of each band: band number followed by its signature bytes."""
+        return [band.to_bytes(2, "little") + signature[band * self.rows : (band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def find_canonical(
+        self,
+        signature: np.ndarray,
+        threshold: float,
+        *,
+        exclude: Collection[str] = (),
+    ) -> Optional[Tuple[str, float]]:
+        """Most similar stored canonical chunk at or above ``threshold``, if any, ignoring ``exclude`` ids."""
+        keys = self.band_keys(signature)
+        with self._lock:
+            candidates = [
+                row[0]
+                for row in self._conn.execute(
+                    f"SELECT DISTINCT chunk_id FROM dedup_buckets WHERE bucket IN ({_placeholders(keys)})", keys
+                )
+                if row[0] not in exclude
+            ]
+            if not candidates:
+                return None
+            rows = [
+                row
+                for batch in _batched(candidates)
+                for row in self._conn.execute(
+                    f"SELECT chunk_id, signature FROM dedup_signatures WHERE chunk_id IN ({_placeholders(batch)})", batch
+                )
+            ]
+        if not rows:
+            return None
+        matrix = np.vstack([np.frombuffer(blob, dtype=np.uint32) for _, blob in rows])
+        similarities = estimate_similarity(signature, matrix)
+        best = int(np.argmax(similarities))
+        if similarities[best] < threshold:
+            return None
+        return rows[best][0], float(similarities[best])
+
+    def add(self, signatures: Dict[str, np.ndarray], links: Sequence[DuplicateLink] = ()) -> None:
+        """Store canonical signatures (with their buckets) and duplicate links in one transaction."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for chunk_id, signature in signatures.items():
+                    self._insert_signature(chunk_id, signature, now)
+                self._insert_links(links, now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def linked_ids(self, chunk_ids: Sequence[str]) -> Dict[str, str]:
+        """Map of the given ids that are stored as duplicates to their canonical id."""
+        linked: Dict[str, str] = {}
+        with self._lock:
+            for batch in _batched(chunk_ids):
+                linked.update(
+                    self._conn.execute(
+                        f"SELECT chunk_id, canonical_id FROM dedup_links WHERE chunk_id IN ({_placeholders(batch)})", batch
+                    ).fetchall()
+                )
+        return linked
+
+    def links_of_document(self, document_key: str) -> List[str]:
+        """Ids of the duplicates recorded with ``metadata.document_key == document_key``."""
+        with self._lock:
+            rows = self._conn.execute("SELECT chunk_id FROM dedup_links WHERE document_key = ?", (document_key,)).fetchall()
+        return [row[0] for row in rows]
+
+    def duplicates_of(self, canonical_ids: Sequence[str]) -> Dict[str, List[DuplicateLink]]:
+        """Duplicate links of each canonical chunk (e.g. to show where a search hit also appears)."""
+        with self._lock:
+            return self._duplicates_of(canonical_ids)
+
+    def promotions(self, chunk_ids: Sequence[str]) -> Dict[str, DuplicateLink]:
+        """Duplicate ``forget(chunk_ids)`` would promote for each canonical chunk among ``chunk_ids``.
+
+        The oldest link with a stored ``text`` whose chunk is not forgotten
+        too is chosen; canonical chunks without one are absent.
+        """
+        with self._lock:
+            return self._promotions(chunk_ids)
+
+    def forget(self, chunk_ids: Sequence[str]) -> Dict[str, DuplicateLink]:
+        """Drop chunks deleted from the collection: their signatures, their links and links pointing to them.
+
+        A forgotten canonical chunk with duplicates is replaced by one of them
+        (see ``promotions``): its signature becomes canonical and the other
+        duplicates are linked to it. The caller must write the promoted chunks
+        to the collection; ``TenderMilvusIndexer`` does so before deleting.
+        Duplicates that cannot be promoted (no stored text) lose their link
+        and are embedded again the next time they are upserted.
+
+        Returns:
+            The promoted link of each replaced canonical chunk.
+        """
+        ids = list(chunk_ids)
+        if not ids:
+            return {}
+        forgotten = set(ids)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                promoted = self._promotions(ids)
+                remaining = self._duplicates_of(list(promoted))
+                for batch in _batched(ids):
+                    placeholders = _placeholders(batch)
+                    self._conn.execute(f"DELETE FROM dedup_signatures WHERE chunk_id IN ({placeholders})", batch)
+                    self._conn.execute(f"DELETE FROM dedup_buckets WHERE chunk_id IN ({placeholders})", batch)
+                    self._conn.execute(f"DELETE FROM dedup_links WHERE chunk_id IN ({placeholders})", batch)
+                    self._conn.execute(f"DELETE FROM dedup_links WHERE canonical_id IN ({placeholders})", batch)
+                for old_id, link in promoted.items():
+                    signature = self.signature(link.text)
+                    self._insert_signature(link.chunk_id, signature, now)
+                    relinked: List[DuplicateLink] = []
+                    for other in remaining.get(old_id, []):
+                        if other.chunk_id == link.chunk_id or other.chunk_id in forgotten:
+                            continue
+                        if other.text:
+                            other.similarity = float(estimate_similarity(signature, self.signature(other.text)[None, :])[0])
+                        other.canonical_id = link.chunk_id
+                        relinked.append(other)
+                    self._insert_links(relinked, now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return promoted
+
+    def stats(self) -> Dict[str, int]:
+        """Canonical chunks and duplicate links stored."""
+        with self._lock:
+            canonical = self._conn.execute("SELECT COUNT(*) FROM dedup_signatures").fetchone()[0]
+            duplicates = self._conn.execute("SELECT COUNT(*) FROM dedup_links").fetchone()[0]
+        return {"canonical": canonical, "duplicates": duplicates}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # --- Internal helpers (caller holds the lock) ---
+
+    def _insert_signature(self, chunk_id: str, signature: np.ndarray, now: float) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO dedup_signatures (chunk_id, signature, created_at) VALUES (?, ?, ?)",
+            (chunk_id, signature.astype(np.uint32).tobytes(), now),
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO dedup_buckets (bucket, chunk_id) VALUES (?, ?)",
+            [(key, chunk_id) for key in self.band_keys(signature)],
+        )
+
+    def _insert_links(self, links: Sequence[DuplicateLink], now: float) -> None:
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO dedup_links ({_LINK_COLUMNS}, document_key, created_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    link.chunk_id,
+                    link.canonical_id,
+                    link.similarity,
+                    link.section_path,
+                    json.dumps(link.metadata),
+                    json.dumps(link.page_numbers),
+                    link.source_chunk_id,
+                    link.text or None,
+                    link.metadata.get("document_key"),
+                    now,
+                )
+                for link in links
+            ],
+        )
+
+    def _duplicates_of(self, canonical_ids: Sequence[str]) -> Dict[str, List[DuplicateLink]]:
+        grouped: Dict[str, List[DuplicateLink]] = {}
+        for batch in _batched(canonical_ids):
+            rows = self._conn.execute(
+                f"SELECT {_LINK_COLUMNS} FROM dedup_links WHERE canonical_id IN ({_placeholders(batch)})"
+                " ORDER BY created_at, chunk_id",
+                batch,
+            ).fetchall()
+            for chunk_id, canonical_id, similarity, section_path, metadata, page_numbers, source_chunk_id, text in rows:
+                grouped.setdefault(canonical_id, []).append(
+                    DuplicateLink(
+                        chunk_id=chunk_id,
+                        canonical_id=canonical_id,
+                        similarity=similarity,
+                        section_path=section_path or "",
+                        metadata=json.loads(metadata or "{}"),
+                        page_numbers=json.loads(page_numbers or "[]"),
+                        source_chunk_id=source_chunk_id,
+                        text=text or "",
+                    )
+                )
+        return grouped
+
+    def _promotions(self, chunk_ids: Sequence[str]) -> Dict[str, DuplicateLink]:
+        forgotten = set(chunk_ids)
+        promoted: Dict[str, DuplicateLink] = {}
+        for canonical_id, links in self._duplicates_of(list(forgotten)).items():
+            for link in links:
+                if link.text and link.chunk_id not in forgotten:
+                    promoted[canonical_id] = link
+                    break
+        return promoted
+
+
+def _batched(items: Sequence[Any], size: int = SQL_BATCH_SIZE) -> Iterator[List[Any]]:
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _placeholders(items: Sequence[Any]) -> str:
+    return ", ".join("?" for _ in items)
+
+
+class NearDuplicateDetector:
+    """Plan which chunks of a batch to embed and which to link to a canonical chunk.
+
+    A chunk is a duplicate when its estimated Jaccard similarity with a
+    canonical chunk already in ``index`` or earlier in the same batch is at
+    least ``threshold``. Chunks shorter than ``min_words`` words are always
+    embedded (short headings and one-liners collide too easily).
+
+    ``plan`` does not modify the index; call ``record`` once the canonical
+    chunks are written, so a failed write never leaves links to vectors that
+    do not exist.
+    """
+
+    def __init__(
+        self,
+        index: SignatureIndex,
+        *,
+        threshold: float = DEFAULT_DEDUP_THRESHOLD,
+        min_words: int = MIN_DEDUP_WORDS,
+    ) -> None:
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be within (0, 1]")
+        self.index = index
+        self.threshold = threshold
+        self.min_words = min_words
+
+    def plan(self, chunks: Sequence[TokenChunk], *, exclude: Collection[str] = ()) -> DedupPlan:
+        """Split ``chunks``; ``exclude`` are canonical ids about to be deleted, never used as a match."""
+        plan = DedupPlan()
+        batch_buckets: Dict[bytes, List[str]] = {}
+        for chunk in chunks:
+            if len(chunk.text.split()) < self.min_words:
+                plan.canonical.append(chunk)
+                continue
+            signature = self.index.signature(chunk.text)
+            match = self._match_batch(signature, batch_buckets, plan.signatures) or self.index.find_canonical(
+                signature, self.threshold, exclude=exclude
+            )
+            if match is not None:
+                canonical_id, similarity = match
+                plan.duplicates.append(
+                    DuplicateLink(
+                        chunk_id=chunk.id,
+                        canonical_id=canonical_id,
+                        similarity=similarity,
+                        section_path=chunk.section_path,
+                        metadata=dict(chunk.metadata),
+                        page_numbers=list(chunk.page_numbers),
+                        source_chunk_id=chunk.source_chunk_id,
+                        text=chunk.text,
+                    )
+                )
+                continue
+            plan.canonical.append(chunk)
+            plan.signatures[chunk.id] = signature
+            for key in self.index.band_keys(signature):
+                batch_buckets.setdefault(key, []).append(chunk.id)
+        return plan
+
+    def record(self, plan: DedupPlan) -> None:
+        self.index.add(plan.signatures, plan.duplicates)
+
+    def _match_batch(
+        self,
+        signature: np.ndarray,
+        buckets: Dict[bytes, List[str]],
+        signatures: Dict[str, np.ndarray],
+    ) -> Optional[Tuple[str, float]]:
+        candidates = list(dict.fromkeys(cid for key in self.index.band_keys(signature) for cid in buckets.get(key, ())))
+        if not candidates:
+            return None
+        similarities = estimate_similarity(signature, np.vstack([signatures[cid] for cid in candidates]))
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        return candidates[best], float(similarities[best])
+
+
+__all__ = [
+    "DedupPlan",
+    "DuplicateLink",
+    "MinHasher",
+    "NearDuplicateDetector",
+    "SignatureIndex",
+    "estimate_similarity",
+]
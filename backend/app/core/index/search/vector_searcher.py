@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Dict, List, Optional, Sequence
 
 from src.core.embedding import EmbeddingClient
@@ -20,5 +21,12 @@ class VectorSearcher:
         query_vec = self.embed_client.embed(query)
         return self.indexer.search(query_embedding=query_vec, top_k=top_k, search_params=search_params)
 
+    async def asearch(self, query: str, *, top_k: int = 5, search_params: Optional[Dict[str, object]] = None) -> List[Dict[str, object]]:
+        """Async ``search``: awaits the query embedding and runs the Milvus call in a worker thread."""
+        query_vec = await self.embed_client.aembed(query)
+        return await asyncio.to_thread(
+            self.indexer.search, query_embedding=query_vec, top_k=top_k, search_params=search_params
+        )
+
 
 __all__ = ["VectorSearcher"]
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
-from typing import Callable, Dict, Iterable, List, Optional, Sequence
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
 
+from src.core.index.dedup import NearDuplicateDetector
 from src.core.index.vector.connection import MilvusConnectionManager
 from src.core.index.vector.exceptions import CollectionError, DataOperationError
 from src.core.index.vector.service import MilvusService
@@ -23,10 +26,84 @@ DEFAULT_METRIC = os.getenv("MILVUS_METRIC", "IP")
 DEFAULT_INDEX_TYPE = os.getenv("MILVUS_INDEX_TYPE", "HNSW")
 DEFAULT_HNSW_M = int(os.getenv("MILVUS_HNSW_M", "24"))
 DEFAULT_HNSW_EF = int(os.getenv("MILVUS_HNSW_EF", "200"))
+DEFAULT_UPSERT_BATCH_SIZE = int(os.getenv("MILVUS_UPSERT_BATCH_SIZE", "64"))
+QUERY_BATCH_SIZE = 1000
+DELETE_BATCH_SIZE = 500
+
+
+def chunk_content_hash(chunk: TokenChunk) -> str:
+    """Hash of what a chunk's embedding depends on: its section path and text.
+
+    Whitespace is collapsed so re-flowed but otherwise identical text keeps
+    its hash across document versions.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(" ".join(chunk.section_path.split()).encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(" ".join(chunk.text.split()).encode("utf-8"))
+    return digest.hexdigest()
+
+
+@dataclass
+class ReindexReport:
+    """Outcome of ``TenderMilvusIndexer.reindex_document``."""
+
+    document_key: str
+    chunks: int = 0
+    reused: int = 0
+    embedded: int = 0
+    deduplicated: int = 0
+    deleted: int = 0
+
+    @property
+    def embeddings_avoided(self) -> int:
+        return self.reused + self.deduplicated
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "embeddings_avoided": self.embeddings_avoided}
+
+
+@dataclass
+class UpsertReport:
+    """Outcome of ``upsert_token_chunks`` / ``upsert_token_chunk_stream``.
+
+    ``deduplicated`` chunks were linked to a canonical near-duplicate instead
+    of being embedded; ``vector_bytes_saved`` is the float32 storage they
+    would have taken.
+    """
+
+    chunks: int = 0
+    embedded: int = 0
+    skipped: int = 0
+    deduplicated: int = 0
+    vector_bytes_saved: int = 0
+
+    @property
+    def embeddings_avoided(self) -> int:
+        return self.skipped + self.deduplicated
+
+    def add(self, other: "UpsertReport") -> None:
+        self.chunks += other.chunks
+        self.embedded += other.embedded
+        self.skipped += other.skipped
+        self.deduplicated += other.deduplicated
+        self.vector_bytes_saved += other.vector_bytes_saved
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "embeddings_avoided": self.embeddings_avoided}
 
 
 class TenderMilvusIndexer:
-    """Indexer tailored to ingest token chunks with metadata into Milvus."""
+    """Indexer tailored to ingest token chunks with metadata into Milvus.
+
+    With a ``deduplicator`` (``NearDuplicateDetector`` over a
+    ``SignatureIndex`` kept for this collection), ``upsert_token_chunks`` and
+    ``upsert_token_chunk_stream`` embed and store only chunks that are not
+    near-duplicates of a chunk already indexed; the others are recorded as
+    links to their canonical chunk in the signature index. ``search`` lists
+    those links under each hit (``duplicates``), and deleting a canonical
+    chunk writes one of its duplicates in its place.
+    """
 
     def __init__(
         self,
@@ -37,6 +114,7 @@ class TenderMilvusIndexer:
         collection_name: str = DEFAULT_COLLECTION,
         metric_type: str = DEFAULT_METRIC,
         index_type: str = DEFAULT_INDEX_TYPE,
+        deduplicator: Optional[NearDuplicateDetector] = None,
     ) -> None:
         if DataType is None:
             raise ImportError("pymilvus is required for Milvus operations") from _pymilvus_import_error
@@ -48,6 +126,7 @@ class TenderMilvusIndexer:
         self.collection_name = collection_name
         self.metric_type = metric_type
         self.index_type = index_type
+        self.deduplicator = deduplicator
         self.connection: MilvusConnectionManager = service.connection
         self._ensure_collection()
 
@@ -87,37 +166,328 @@ class TenderMilvusIndexer:
             return {"index_type": "HNSW", "metric_type": self.metric_type, "M": DEFAULT_HNSW_M, "efConstruction": DEFAULT_HNSW_EF}
         return {"index_type": self.index_type, "metric_type": self.metric_type}
 
-    def upsert_token_chunks(self, chunks: Sequence[TokenChunk]) -> None:
-        """Embed and insert token chunks into Milvus."""
+    def upsert_token_chunks(
+        self,
+        chunks: Sequence[TokenChunk],
+        *,
+        skip_existing: bool = False,
+        document_key: Optional[str] = None,
+    ) -> UpsertReport:
+        """Embed and insert token chunks into Milvus.
+
+        Every written row is stamped with ``metadata.content_hash`` and, when
+        given, ``metadata.document_key``, so a later ``reindex_document`` with
+        the same key reuses its embeddings.
+
+        Args:
+            chunks: Token chunks to write.
+            skip_existing: Look the chunk ids up in Milvus first (batched
+                ``id in [...]`` queries) and neither embed nor write those
+                already stored. With the deterministic ids of
+                ``DynamicChunker(document_hash=...)`` re-ingesting an
+                unchanged document then costs no embedding call. Chunks
+                already linked as near-duplicates count as skipped too.
+            document_key: Identifier of the document across versions (see
+                ``reindex_document``).
+
+        Returns:
+            Counts of chunks received, embedded, skipped and deduplicated.
+        """
         if not chunks:
-            return
+            return UpsertReport()
+        report = self._upsert_batch(chunks, skip_existing=skip_existing, document_key=document_key)
+        if report.embedded:
+            self._flush()
+        return report
+
+    def upsert_token_chunk_stream(
+        self,
+        chunks: Iterable[TokenChunk],
+        *,
+        batch_size: int = DEFAULT_UPSERT_BATCH_SIZE,
+        skip_existing: bool = False,
+        document_key: Optional[str] = None,
+    ) -> UpsertReport:
+        """Embed and upsert token chunks from an iterator, ``batch_size`` at a time.
+
+        Only one batch of chunks and embeddings is held in memory, so a
+        generator pipeline (``IngestionService.iter_pages`` →
+        ``DynamicChunker.iter_chunks`` → ``TokenChunker.iter_chunks``) indexes
+        a document with memory bounded by its largest section. The collection
+        is flushed once at the end. ``skip_existing`` and ``document_key``
+        work as in ``upsert_token_chunks``, one id lookup per batch.
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        report = UpsertReport()
+        batch: List[TokenChunk] = []
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                report.add(self._upsert_batch(batch, skip_existing=skip_existing, document_key=document_key))
+                batch = []
+        if batch:
+            report.add(self._upsert_batch(batch, skip_existing=skip_existing, document_key=document_key))
+        if report.embedded:
+            self._flush()
+        return report
+
+    def existing_ids(self, ids: Sequence[str]) -> Set[str]:
+        """Return the subset of ``ids`` already stored in the collection."""
+        found: Set[str] = set()
+        try:
+            for start in range(0, len(ids), QUERY_BATCH_SIZE):
+                batch = list(ids[start : start + QUERY_BATCH_SIZE])
+                rows = self.service.data.query(
+                    self.collection_name,
+                    f"id in {json.dumps(batch)}",
+                    output_fields=["id"],
+                    limit=len(batch),
+                    consistency_level="Strong",
+                )
+                found.update(row["id"] for row in rows)
+        except Exception as exc:  # pragma: no cover - passthrough
+            raise DataOperationError("Lookup of existing chunk ids failed") from exc
+        return found
+
+    def reindex_document(self, document_key: str, chunks: Sequence[TokenChunk]) -> ReindexReport:
+        """Index a new version of a document, embedding only what changed.
+
+        Rows of the previous version are found through ``metadata.document_key``,
+        stamped by this method and by ``upsert_token_chunks(document_key=...)``.
+        A new chunk whose ``chunk_content_hash`` matches a stored row reuses
+        that row's id and embedding; only the remaining chunks are embedded.
+        Stored rows not matched by any new chunk are deleted. Every row is
+        stamped with ``document_key`` and ``content_hash`` so the next revision
+        can be diffed the same way (the first call behaves like a full upsert).
+
+        With a ``deduplicator`` the chunks to embed go through ``plan`` and
+        ``record`` as in ``upsert_token_chunks`` (never matching a row being
+        deleted), and the duplicate links recorded for the previous version
+        that are not in the new one are forgotten.
+
+        Args:
+            document_key: Stable identifier shared by all versions of the
+                document (e.g. tender code plus document type), not the hash
+                of one version.
+            chunks: Token chunks of the new version.
 
-        texts = [chunk.text for chunk in chunks]
-        embeddings = self.embed_fn(texts)
+        Returns:
+            Counts of reused, embedded, deduplicated and deleted chunks.
+        """
+        report = ReindexReport(document_key=document_key, chunks=len(chunks))
+        stored: Dict[str, List[Dict[str, Any]]] = {}
+        for row in self._query_document(document_key):
+            content_hash = (row.get("metadata") or {}).get("content_hash")
+            if content_hash:
+                stored.setdefault(content_hash, []).append(row)
+
+        reused_rows: List[Dict[str, Any]] = []
+        changed: List[TokenChunk] = []
+        changed_hashes: List[str] = []
+        for chunk in chunks:
+            content_hash = chunk_content_hash(chunk)
+            candidates = stored.get(content_hash)
+            if candidates:
+                previous = candidates.pop()
+                reused_rows.append(
+                    self._build_row(
+                        chunk,
+                        previous["embedding"],
+                        chunk_id=previous["id"],
+                        document_key=document_key,
+                        content_hash=content_hash,
+                    )
+                )
+            else:
+                changed.append(chunk)
+                changed_hashes.append(content_hash)
+
+        kept = {row["id"] for row in reused_rows}
+        stale = [row["id"] for leftovers in stored.values() for row in leftovers if row["id"] not in kept]
+
+        plan = self.deduplicator.plan(changed, exclude=set(stale)) if self.deduplicator is not None and changed else None
+        if plan is not None:
+            for link in plan.duplicates:
+                link.metadata["document_key"] = document_key
+            canonical_ids = {chunk.id for chunk in plan.canonical}
+            changed_hashes = [h for chunk, h in zip(changed, changed_hashes) if chunk.id in canonical_ids]
+            changed = plan.canonical
+            report.deduplicated = len(plan.duplicates)
+
+        new_rows: List[Dict[str, Any]] = []
+        if changed:
+            embeddings = self._embed(changed)
+            new_rows = [
+                self._build_row(chunk, emb, document_key=document_key, content_hash=content_hash)
+                for chunk, emb, content_hash in zip(changed, embeddings, changed_hashes)
+            ]
+        rows = reused_rows + new_rows
+        if rows:
+            self._write(rows)
+        if plan is not None:
+            self.deduplicator.record(plan)
+        if self.deduplicator is not None:
+            # Links of the previous version go before its rows, so none of them is promoted.
+            current = {chunk.id for chunk in chunks}
+            dropped = [chunk_id for chunk_id in self.deduplicator.index.links_of_document(document_key) if chunk_id not in current]
+            self.deduplicator.index.forget(dropped)
+        self._delete_ids(stale)
+
+        report.reused = len(reused_rows)
+        report.embedded = len(new_rows)
+        report.deleted = len(stale)
+        return report
+
+    def _embed(self, chunks: Sequence[TokenChunk]) -> List[List[float]]:
+        embeddings = self.embed_fn([chunk.text for chunk in chunks])
         if len(embeddings) != len(chunks):
             raise ValueError("Embedding count does not match chunks length")
+        return embeddings
 
-        rows = []
-        for chunk, emb in zip(chunks, embeddings):
-            if len(emb) != self.embedding_dim:
-                raise ValueError(f"Embedding dim mismatch: expected {self.embedding_dim}, got {len(emb)}")
-            rows.append(
-                {
-                    "id": chunk.id,
-                    "text": chunk.text,
-                    "section_path": chunk.section_path,
-                    "metadata": chunk.metadata,
-                    "page_numbers": chunk.page_numbers,
-                    "source_chunk_id": chunk.source_chunk_id,
-                    "embedding": emb,
-                }
-            )
+    def _build_row(
+        self,
+        chunk: TokenChunk,
+        embedding: Sequence[float],
+        *,
+        chunk_id: Optional[str] = None,
+        document_key: Optional[str] = None,
+        content_hash: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        if len(embedding) != self.embedding_dim:
+            raise ValueError(f"Embedding dim mismatch: expected {self.embedding_dim}, got {len(embedding)}")
+        metadata = dict(chunk.metadata)
+        if document_key is not None:
+            metadata["document_key"] = document_key
+        if content_hash is not None:
+            metadata["content_hash"] = content_hash
+        return {
+            "id": chunk_id or chunk.id,
+            "text": chunk.text,
+            "section_path": chunk.section_path,
+            "metadata": metadata,
+            "page_numbers": chunk.page_numbers,
+            "source_chunk_id": chunk.source_chunk_id,
+            "embedding": list(embedding),
+        }
+
+    def _upsert_batch(
+        self,
+        chunks: Sequence[TokenChunk],
+        *,
+        skip_existing: bool,
+        document_key: Optional[str] = None,
+    ) -> UpsertReport:
+        report = UpsertReport(chunks=len(chunks))
+        if skip_existing:
+            ids = [chunk.id for chunk in chunks]
+            existing = self.existing_ids(ids)
+            if self.deduplicator is not None:
+                existing.update(self.deduplicator.index.linked_ids(ids))
+            chunks = [chunk for chunk in chunks if chunk.id not in existing]
+            report.skipped = report.chunks - len(chunks)
+        plan = self.deduplicator.plan(chunks) if self.deduplicator is not None and chunks else None
+        if plan is not None:
+            chunks = plan.canonical
+            if document_key is not None:
+                for link in plan.duplicates:
+                    link.metadata["document_key"] = document_key
+            report.deduplicated = len(plan.duplicates)
+            report.vector_bytes_saved = report.deduplicated * self.embedding_dim * 4
+        if chunks:
+            embeddings = self._embed(chunks)
+            rows = [
+                self._build_row(chunk, emb, document_key=document_key, content_hash=chunk_content_hash(chunk))
+                for chunk, emb in zip(chunks, embeddings)
+            ]
+            self._write(rows, flush=False)
+            report.embedded = len(chunks)
+        if plan is not None:
+            self.deduplicator.record(plan)
+        return report
+
+    def _write(self, rows: List[Dict[str, Any]], *, flush: bool = True) -> None:
         try:
             self.service.data.upsert(self.collection_name, rows)
-            self.service.data.flush(self.collection_name)
+            if flush:
+                self.service.data.flush(self.collection_name)
         except Exception as exc:  # pragma: no cover - passthrough
             raise DataOperationError("Insert/upsert failed") from exc
 
+    def _flush(self) -> None:
+        try:
+            self.service.data.flush(self.collection_name)
+        except Exception as exc:  # pragma: no cover - passthrough
+            raise DataOperationError("Flush failed") from exc
+
+    def _query_document(self, document_key: str) -> List[Dict[str, Any]]:
+        """Return id, metadata and embedding of every stored row of a document.
+
+        Uses a query iterator: offset pagination stops at Milvus's
+        ``offset + limit`` cap (16384 rows).
+        """
+        expr = f'metadata["document_key"] == {json.dumps(document_key)}'
+        rows: List[Dict[str, Any]] = []
+        try:
+            for batch in self.service.data.query_iterator(
+                self.collection_name,
+                expr,
+                batch_size=QUERY_BATCH_SIZE,
+                output_fields=["id", "metadata", "embedding"],
+                consistency_level="Strong",
+            ):
+                rows.extend(batch)
+            return rows
+        except Exception as exc:  # pragma: no cover - passthrough
+            raise DataOperationError("Query of stored chunks failed") from exc
+
+    def _delete_ids(self, ids: Sequence[str]) -> None:
+        """Delete rows and forget their signatures, promoting a duplicate of each deleted canonical chunk.
+
+        The promoted duplicate is written with the deleted row's embedding
+        (near-duplicates share it at query time anyway; it is embedded only if
+        that row is missing) before the delete, so its content never
+        disappears from the collection.
+        """
+        promotions = self.deduplicator.index.promotions(ids) if self.deduplicator is not None and ids else {}
+        if promotions:
+            embeddings = self._stored_embeddings(list(promotions))
+            chunks = [link.to_chunk() for link in promotions.values()]
+            missing = [chunk for old_id, chunk in zip(promotions, chunks) if old_id not in embeddings]
+            embeddings.update(zip((chunk.id for chunk in missing), self._embed(missing) if missing else []))
+            rows = [
+                self._build_row(chunk, embeddings.get(old_id, embeddings.get(chunk.id)), content_hash=chunk_content_hash(chunk))
+                for old_id, chunk in zip(promotions, chunks)
+            ]
+            self._write(rows, flush=False)
+        try:
+            for start in range(0, len(ids), DELETE_BATCH_SIZE):
+                batch = ids[start : start + DELETE_BATCH_SIZE]
+                self.service.data.delete(self.collection_name, f"id in {json.dumps(list(batch))}")
+            if ids:
+                self.service.data.flush(self.collection_name)
+        except Exception as exc:  # pragma: no cover - passthrough
+            raise DataOperationError("Delete of stale chunks failed") from exc
+        if self.deduplicator is not None:
+            self.deduplicator.index.forget(ids)
+
+    def _stored_embeddings(self, ids: Sequence[str]) -> Dict[str, List[float]]:
+        embeddings: Dict[str, List[float]] = {}
+        try:
+            for start in range(0, len(ids), QUERY_BATCH_SIZE):
+                batch = list(ids[start : start + QUERY_BATCH_SIZE])
+                rows = self.service.data.query(
+                    self.collection_name,
+                    f"id in {json.dumps(batch)}",
+                    output_fields=["id", "embedding"],
+                    limit=len(batch),
+                    consistency_level="Strong",
+                )
+                embeddings.update((row["id"], list(row["embedding"])) for row in rows)
+        except Exception as exc:  # pragma: no cover - passthrough
+            raise DataOperationError("Lookup of stored embeddings failed") from exc
+        return embeddings
+
     def search(
         self,
         query_embedding: List[float],
@@ -125,8 +495,15 @@ class TenderMilvusIndexer:
         top_k: int = 5,
         output_fields: Optional[List[str]] = None,
         search_params: Optional[Dict[str, object]] = None,
+        expand_duplicates: bool = True,
     ) -> List[Dict[str, object]]:
-        """Search similar chunks by embedding."""
+        """Search similar chunks by embedding.
+
+        With a ``deduplicator`` and ``expand_duplicates``, each hit carries
+        ``duplicates``: the near-duplicates linked to it instead of stored
+        (``id``, ``section_path``, ``metadata``, ``page_numbers``,
+        ``source_chunk_id``, ``similarity``), i.e. where else the hit appears.
+        """
         if len(query_embedding) != self.embedding_dim:
             raise ValueError(f"Query embedding dim mismatch: expected {self.embedding_dim}")
 
@@ -157,7 +534,21 @@ class TenderMilvusIndexer:
                     "id": entity.get("id", getattr(hit, "id", None)),
                 }
             )
+        if self.deduplicator is not None and expand_duplicates and hits:
+            links = self.deduplicator.index.duplicates_of([str(hit["id"]) for hit in hits if hit["id"] is not None])
+            for hit in hits:
+                hit["duplicates"] = [
+                    {
+                        "id": link.chunk_id,
+                        "section_path": link.section_path,
+                        "metadata": link.metadata,
+                        "page_numbers": link.page_numbers,
+                        "source_chunk_id": link.source_chunk_id,
+                        "similarity": link.similarity,
+                    }
+                    for link in links.get(str(hit["id"]), [])
+                ]
         return hits
 
 
-__all__ = ["TenderMilvusIndexer"]
+__all__ = ["TenderMilvusIndexer", "ReindexReport", "UpsertReport", "chunk_content_hash"]
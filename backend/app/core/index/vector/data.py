@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
 from .connection import MilvusConnectionManager
 from .exceptions import DataOperationError
@@ -137,6 +137,48 @@ class MilvusDataManager:
         except Exception as exc:  # pragma: no cover
             raise DataOperationError(f"Query failed for collection '{collection_name}'") from exc
 
+    def query_iterator(
+        self,
+        collection_name: str,
+        expr: str,
+        *,
+        batch_size: int = 1000,
+        output_fields: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+        consistency_level: Optional[str] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield every entity matching ``expr``, one batch at a time.
+
+        Unlike ``query`` with ``offset`` this is not bound by Milvus's
+        ``offset + limit`` cap (16384), so it can read whole documents.
+        """
+        self.connection.ensure()
+        kwargs: Dict[str, Any] = {}
+        if consistency_level is not None:
+            kwargs["consistency_level"] = consistency_level
+        try:
+            iterator = self.client.query_iterator(
+                collection_name=collection_name,
+                batch_size=batch_size,
+                filter=expr,
+                output_fields=output_fields,
+                timeout=timeout,
+                **kwargs,
+            )
+        except Exception as exc:  # pragma: no cover
+            raise DataOperationError(f"Query iterator failed for collection '{collection_name}'") from exc
+        try:
+            while True:
+                try:
+                    batch = iterator.next()
+                except Exception as exc:  # pragma: no cover
+                    raise DataOperationError(f"Query iterator failed for collection '{collection_name}'") from exc
+                if not batch:
+                    return
+                yield batch
+        finally:
+            iterator.close()
+
     def flush(self, collection_name: str) -> None:
         """Flush pending data to storage."""
         self.connection.ensure()
@@ -1,10 +1,19 @@
 """Convenience exports for ingestion core utilities."""
 
-from .normalizer import normalize_bytes, normalize_text
+from .normalizer import is_clean_text, normalize_bytes, normalize_many, normalize_text
 from .lang_detect import detect_language
 from .parser_pdf import extract_pdf_layout, parse_pdf
 from .parser_docx import parse_docx
-from .ocr import is_mostly_image_pdf, ocr_if_needed, run_ocrmypdf
+from .ocr import (
+    OcrStore,
+    is_mostly_image_pdf,
+    merge_ocr_pages,
+    ocr_if_needed,
+    ocr_pages,
+    ocrmypdf_to_bytes,
+    run_ocrmypdf,
+    scanned_page_numbers,
+)
 from .heading_detection import tag_headings
 from .table_detection import (
     extract_pdf_tables,
@@ -12,11 +21,23 @@ from .table_detection import (
     integrate_tables,
     table_to_block,
 )
-from .file_utils import copy_to_temporary_file, temporary_directory, write_bytes_to_file
+from .file_utils import (
+    atomic_write_bytes,
+    atomic_write_stream,
+    copy_to_temporary_file,
+    read_file_buffer,
+    temporary_directory,
+    write_bytes_to_file,
+)
+from .parse_cache import ParseCache, cache_key, hash_bytes, hash_file
+from .metrics import LoggingMetricsSink, MetricsSink, NullMetricsSink, StageMetrics, StageRecorder
+from .models import Block, Page, block_from_dict, block_to_dict, pages_from_dicts, pages_to_dicts
 
 __all__ = [
     "normalize_bytes",
     "normalize_text",
+    "normalize_many",
+    "is_clean_text",
     "detect_language",
     "extract_pdf_layout",
     "parse_pdf",
@@ -24,6 +45,11 @@ __all__ = [
     "is_mostly_image_pdf",
     "ocr_if_needed",
     "run_ocrmypdf",
+    "ocrmypdf_to_bytes",
+    "scanned_page_numbers",
+    "OcrStore",
+    "ocr_pages",
+    "merge_ocr_pages",
     "tag_headings",
     "extract_pdf_tables",
     "flag_table_like_blocks",
@@ -32,4 +58,22 @@ __all__ = [
     "copy_to_temporary_file",
     "temporary_directory",
     "write_bytes_to_file",
+    "atomic_write_bytes",
+    "atomic_write_stream",
+    "read_file_buffer",
+    "ParseCache",
+    "cache_key",
+    "hash_file",
+    "hash_bytes",
+    "StageMetrics",
+    "StageRecorder",
+    "MetricsSink",
+    "NullMetricsSink",
+    "LoggingMetricsSink",
+    "Block",
+    "Page",
+    "block_from_dict",
+    "block_to_dict",
+    "pages_from_dicts",
+    "pages_to_dicts",
 ]
@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
+import mmap
 import os
 import shutil
 import tempfile
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Generator, Optional, Union
+from typing import Any, BinaryIO, Callable, Generator, Optional, Union
 
 FilePath = Union[str, Path]
+# File content held in memory: plain bytes, or a read-only map of a large file.
+FileBuffer = Union[bytes, mmap.mmap]
+
+# Files at least this large are memory-mapped instead of read into memory.
+MMAP_THRESHOLD_BYTES = int(os.getenv("INGESTION_MMAP_THRESHOLD_BYTES", str(32 * 1024 * 1024)))
 
 
 def write_bytes_to_file(data: bytes, destination: FilePath) -> Path:
@@ -23,6 +29,46 @@ def write_bytes_to_file(data: bytes, destination: FilePath) -> Path:
     return dest_path
 
 
+def atomic_write_bytes(data: bytes, destination: FilePath) -> Path:
+    """Write bytes so readers never observe a partially written file.
+
+    Data goes to a temporary file in the destination directory and is then
+    renamed over the target, which is atomic on POSIX and Windows filesystems.
+    Safe to call concurrently from several processes targeting the same path.
+    """
+    if data is None:
+        raise ValueError("data cannot be None")
+    return _atomic_write(destination, lambda handle: handle.write(data))
+
+
+def atomic_write_stream(source: BinaryIO, destination: FilePath) -> Path:
+    """Copy a binary file object to ``destination`` in chunks, atomically.
+
+    Same guarantees as ``atomic_write_bytes`` without holding the whole
+    content in memory (e.g. for uploads spooled to disk).
+    """
+    if source is None:
+        raise ValueError("source cannot be None")
+    return _atomic_write(destination, lambda handle: shutil.copyfileobj(source, handle))
+
+
+def _atomic_write(destination: FilePath, write: Callable[[BinaryIO], Any]) -> Path:
+    dest_path = Path(destination)
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=dest_path.parent.as_posix(), prefix=f".{dest_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            write(handle)
+        os.replace(tmp_name, dest_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    return dest_path
+
+
 def copy_to_temporary_file(
     source_path: FilePath,
     suffix: str = "",
@@ -42,6 +88,28 @@ def copy_to_temporary_file(
     return tmp_path
 
 
+@contextmanager
+def read_file_buffer(
+    path: FilePath, *, mmap_threshold: int = MMAP_THRESHOLD_BYTES
+) -> Generator[FileBuffer, None, None]:
+    """Context manager yielding a file's content for in-memory parsing.
+
+    Files smaller than ``mmap_threshold`` are read into ``bytes``; larger ones
+    are memory-mapped read-only, so pages are loaded lazily by the OS and no
+    private copy of the whole file is made. The map is closed on exit.
+    """
+    src = Path(path)
+    if not src.exists():
+        raise FileNotFoundError(f"Source file not found at {src}")
+
+    size = src.stat().st_size
+    if size == 0 or size < mmap_threshold:
+        yield src.read_bytes()
+        return
+    with src.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
+
+
 @contextmanager
 def temporary_directory(
     base_dir: Optional[FilePath] = None, prefix: str = "ingestion_"
@@ -58,4 +126,12 @@ def temporary_directory(
         shutil.rmtree(temp_dir, ignore_errors=True)
 
 
-__all__ = ["write_bytes_to_file", "copy_to_temporary_file", "temporary_directory"]
+__all__ = [
+    "FileBuffer",
+    "write_bytes_to_file",
+    "atomic_write_bytes",
+    "atomic_write_stream",
+    "copy_to_temporary_file",
+    "read_file_buffer",
+    "temporary_directory",
+]
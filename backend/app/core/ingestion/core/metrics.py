@@ -0,0 +1,239 @@
+"""Per-stage timing and resource metrics for the ingestion pipeline."""
+
+from __future__ import annotations
+
+import logging
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from threading import Lock
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from .models import Page
+
+logger = logging.getLogger(__name__)
+
+# tracemalloc peaks are process-wide: traced stages run one at a time across
+# all recorders, and tracing started here stops with the last recorder using it.
+_trace_stage_lock = Lock()
+_tracing_lock = Lock()
+_tracing_users = 0
+_owns_tracing = False
+
+
+def _acquire_tracing() -> None:
+    global _tracing_users, _owns_tracing
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _owns_tracing = True
+        _tracing_users += 1
+
+
+def _release_tracing() -> None:
+    global _tracing_users, _owns_tracing
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _owns_tracing:
+            tracemalloc.stop()
+            _owns_tracing = False
+
+
+@dataclass
+class StageMetrics:
+    """Resources spent by one ingestion stage.
+
+    ``cpu_seconds`` is CPU time of the thread running the stage, so
+    documents parsed concurrently do not count each other's work; helper
+    threads (OCR pool) and worker processes of the parallel layout pass are
+    not included. ``counters`` holds stage-specific counts, e.g. the pages
+    skipped by the table pre-screen.
+    """
+
+    name: str
+    wall_seconds: float
+    cpu_seconds: float
+    pages: Optional[int] = None
+    blocks: Optional[int] = None
+    peak_memory_bytes: Optional[int] = None
+    counters: Optional[Dict[str, int]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+class MetricsSink(ABC):
+    """Destination for the metrics report of each parsed document."""
+
+    @abstractmethod
+    def emit(self, report: Dict[str, Any]) -> None:
+        """Receive the report of one ``parse_document`` call."""
+        raise NotImplementedError
+
+
+class NullMetricsSink(MetricsSink):
+    """Sink discarding every report."""
+
+    def emit(self, report: Dict[str, Any]) -> None:
+        return None
+
+
+class LoggingMetricsSink(MetricsSink):
+    """Sink writing one log record per report (stage timings as ``extra``)."""
+
+    def __init__(self, *, level: int = logging.INFO, log: Optional[logging.Logger] = None) -> None:
+        self.level = level
+        self.log = log or logger
+
+    def emit(self, report: Dict[str, Any]) -> None:
+        summary = ", ".join(f"{stage['name']}={stage['wall_seconds']:.3f}s" for stage in report.get("stages", []))
+        self.log.log(
+            self.level,
+            "Ingestion of %s took %.3fs (%s)",
+            report.get("filename"),
+            report.get("wall_seconds", 0.0),
+            summary,
+            extra={"ingestion_metrics": report},
+        )
+
+
+class _StageTimer:
+    """Context manager timing one stage of a ``StageRecorder``."""
+
+    __slots__ = ("_recorder", "_name", "_wall", "_cpu", "_pages", "_blocks", "_counters")
+
+    def __init__(self, recorder: "StageRecorder", name: str) -> None:
+        self._recorder = recorder
+        self._name = name
+        self._pages: Optional[int] = None
+        self._blocks: Optional[int] = None
+        self._counters: Optional[Dict[str, int]] = None
+
+    def record(self, pages: Sequence[Page]) -> None:
+        """Attach the page and block counts of the stage output."""
+        self._pages = len(pages)
+        self._blocks = sum(len(page.blocks) for page in pages)
+
+    def count(self, counters: Mapping[str, int]) -> None:
+        """Attach stage-specific counters, added to any already attached."""
+        if self._counters is None:
+            self._counters = {}
+        for name, value in counters.items():
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def __enter__(self) -> "_StageTimer":
+        if self._recorder.trace_memory:
+            _trace_stage_lock.acquire()
+            tracemalloc.reset_peak()
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        peak = None
+        if self._recorder.trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            _trace_stage_lock.release()
+        self._recorder.stages.append(
+            StageMetrics(
+                name=self._name,
+                wall_seconds=round(wall, 6),
+                cpu_seconds=round(cpu, 6),
+                pages=self._pages,
+                blocks=self._blocks,
+                peak_memory_bytes=peak,
+                counters=self._counters,
+            )
+        )
+
+
+class StageRecorder:
+    """Collect ``StageMetrics`` for the stages of one document.
+
+    Usage::
+
+        with recorder.stage("layout") as stage:
+            pages = extract_pdf_layout(path)
+            stage.record(pages)
+
+    Args:
+        trace_memory: Also report the ``tracemalloc`` peak of each stage.
+            Starts tracing if it is not already active (stopped when the
+            last tracing recorder is closed); tracing slows allocation-heavy
+            code noticeably. The peak is process-wide, so traced stages are
+            serialized across recorders: a profiling mode, not for
+            concurrent production ingestion.
+    """
+
+    enabled = True
+
+    def __init__(self, *, trace_memory: bool = False) -> None:
+        self.stages: List[StageMetrics] = []
+        self.trace_memory = trace_memory
+        self._tracing = trace_memory
+        if trace_memory:
+            _acquire_tracing()
+
+    def stage(self, name: str) -> _StageTimer:
+        return _StageTimer(self, name)
+
+    def report(self) -> Dict[str, Any]:
+        """Return the stages and their totals as a JSON-serialisable dict."""
+        return {
+            "wall_seconds": round(sum(stage.wall_seconds for stage in self.stages), 6),
+            "cpu_seconds": round(sum(stage.cpu_seconds for stage in self.stages), 6),
+            "stages": [stage.to_dict() for stage in self.stages],
+        }
+
+    def close(self) -> None:
+        if self._tracing:
+            _release_tracing()
+            self._tracing = False
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def record(self, pages: Sequence[Page]) -> None:
+        return None
+
+    def count(self, counters: Mapping[str, int]) -> None:
+        return None
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+class _NullRecorder:
+    """Recorder used when metrics are disabled: no clock reads, no allocation."""
+
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name: str) -> _NullStage:
+        return self._stage
+
+    def report(self) -> Dict[str, Any]:
+        return {}
+
+    def close(self) -> None:
+        return None
+
+
+NULL_RECORDER = _NullRecorder()
+
+
+__all__ = [
+    "StageMetrics",
+    "StageRecorder",
+    "MetricsSink",
+    "NullMetricsSink",
+    "LoggingMetricsSink",
+    "NULL_RECORDER",
+]
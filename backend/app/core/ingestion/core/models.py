@@ -0,0 +1,154 @@
+"""Compact typed representation of parsed blocks and pages.
+
+``Block`` and ``Page`` use ``__slots__`` (no per-instance ``__dict__``) and
+store ``bbox`` as a tuple, which keeps a parsed block at a fraction of the
+memory of the equivalent dict. Both also expose the small mapping API the
+pipeline historically used on dicts (``get``, ``[]``, ``setdefault``, ``in``),
+so heading/table detection and chunking work unchanged on either form;
+``to_dict``/``pages_to_dicts`` convert back for JSON or dict-only callers.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+BBox = Tuple[float, float, float, float]
+
+
+class _MappingCompat:
+    """Dict-style access to slotted fields for callers still expecting dicts."""
+
+    __slots__ = ()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self.__slots__:  # type: ignore[attr-defined]
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:  # type: ignore[attr-defined]
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.__slots__:  # type: ignore[attr-defined]
+            raise KeyError(key)
+        if key == "bbox" and value is not None:
+            value = tuple(value)
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__slots__ and getattr(self, key) is not None  # type: ignore[attr-defined]
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def keys(self) -> Iterator[str]:
+        return (key for key in self.__slots__ if getattr(self, key) is not None)  # type: ignore[attr-defined]
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return ((key, getattr(self, key)) for key in self.keys())
+
+
+@dataclass(slots=True, eq=False)
+class Block(_MappingCompat):
+    """A text, heading, list or table block extracted from a document."""
+
+    text: str
+    bbox: Optional[BBox] = None
+    font_size: Optional[float] = None
+    font_name: Optional[str] = None
+    type: str = "paragraph"
+    level: Optional[int] = None
+    page_number: Optional[int] = None
+    raw_cells: Optional[List[List[Optional[str]]]] = None
+    style: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the block as a plain dict (``bbox`` as a list, unset fields omitted)."""
+        data: Dict[str, Any] = {}
+        for key, value in self.items():
+            data[key] = list(value) if key == "bbox" else value
+        return data
+
+
+@dataclass(slots=True, eq=False)
+class Page(_MappingCompat):
+    """A parsed page: its 1-based number and ordered blocks."""
+
+    page_number: int
+    blocks: List[Block] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the page as a plain dict with dict blocks."""
+        return {"page_number": self.page_number, "blocks": [block.to_dict() for block in self.blocks]}
+
+
+BlockLike = Union[Block, Mapping[str, Any]]
+PageLike = Union[Page, Mapping[str, Any]]
+
+
+def block_from_dict(data: BlockLike) -> Block:
+    """Build a ``Block`` from a dict (unknown keys are ignored)."""
+    if isinstance(data, Block):
+        return data
+    bbox = data.get("bbox")
+    return Block(
+        text=str(data.get("text", "")),
+        bbox=tuple(bbox) if bbox is not None else None,  # type: ignore[arg-type]
+        font_size=data.get("font_size"),
+        font_name=data.get("font_name"),
+        type=data.get("type") or "paragraph",
+        level=data.get("level"),
+        page_number=data.get("page_number"),
+        raw_cells=data.get("raw_cells"),
+        style=data.get("style"),
+    )
+
+
+def block_to_dict(block: BlockLike) -> Dict[str, Any]:
+    """Return a plain dict for either a ``Block`` or an existing dict."""
+    if isinstance(block, Block):
+        return block.to_dict()
+    return dict(block)
+
+
+def page_from_dict(data: PageLike) -> Page:
+    """Build a ``Page`` (and its blocks) from a dict."""
+    if isinstance(data, Page):
+        return data
+    return Page(
+        page_number=int(data.get("page_number") or 0),
+        blocks=[block_from_dict(block) for block in data.get("blocks", [])],
+    )
+
+
+def pages_from_dicts(pages: Iterable[PageLike]) -> List[Page]:
+    """Convert dict pages (e.g. loaded from JSON) into ``Page`` objects."""
+    return [page_from_dict(page) for page in pages]
+
+
+def pages_to_dicts(pages: Iterable[PageLike]) -> List[Dict[str, Any]]:
+    """Convert pages into plain dicts, e.g. for JSON serialisation."""
+    return [
+        page.to_dict()
+        if isinstance(page, Page)
+        else {**page, "blocks": [block_to_dict(block) for block in page.get("blocks", [])]}
+        for page in pages
+    ]
+
+
+__all__ = [
+    "BBox",
+    "Block",
+    "Page",
+    "block_from_dict",
+    "block_to_dict",
+    "page_from_dict",
+    "pages_from_dicts",
+    "pages_to_dicts",
+]
@@ -2,11 +2,22 @@
 
 from __future__ import annotations
 
-from typing import Optional, Union
+from functools import lru_cache
+from typing import List, Optional, Sequence, Union
 
 import ftfy
 from charset_normalizer import from_bytes
 
+# Bounded memo for strings that do need ftfy (headers, labels, form fields repeat).
+NORMALIZE_CACHE_SIZE = 65536
+
+# Non-ASCII characters common in clean Italian text that ftfy leaves untouched
+# on their own. Mojibake lead bytes (Ã, Â, â, ...) are deliberately absent so
+# broken text never takes the fast path; curly quotes are absent because ftfy
+# uncurls them. Pairs of them can still be mojibake (``É§``, ``»à``), see
+# ``is_clean_text``.
+_SAFE_NON_ASCII = frozenset("àèéìíîòóùúÀÈÉÌÍÎÒÓÙÚ«»°€–—…§")
+
 
 def normalize_bytes(raw_bytes: bytes, fallback_encoding: str = "utf-8") -> str:
     """Normalize bytes into a cleaned UTF-8 string.
@@ -57,7 +68,58 @@ def normalize_text(text: Union[str, bytes], fallback_encoding: str = "utf-8") ->
     if isinstance(text, bytes):
         return normalize_bytes(text, fallback_encoding=fallback_encoding)
 
+    if is_clean_text(text):
+        return text
+    return _fix_text_cached(text)
+
+
+def normalize_many(texts: Sequence[str]) -> List[str]:
+    """Normalize several strings (e.g. all spans of a line or page) in one call.
+
+    When the concatenation is already clean, the inputs are returned as-is with
+    a single scan; otherwise each string goes through ``normalize_text``.
+
+    Args:
+        texts: Strings to normalize.
+
+    Returns:
+        Normalized strings in the same order.
+    """
+    if is_clean_text("".join(texts)):
+        return list(texts)
+    return [normalize_text(text) for text in texts]
+
+
+def is_clean_text(text: str) -> bool:
+    """Return ``True`` if ``ftfy.fix_text`` would leave ``text`` unchanged.
+
+    Conservative check: printable ASCII (plus tab/newline) and a whitelist of
+    Italian accented letters and typographic punctuation, never two of the
+    latter in a row: a mis-decoded UTF-8 sequence is always two or more
+    adjacent non-ASCII characters, and whitelisted pairs such as ``É§`` or
+    ``»à`` are ones ftfy repairs. ``&`` (HTML entities), ``\r``, control and
+    escape characters fall back to ftfy as well.
+    """
+    if text.isascii():
+        if "&" in text or "\r" in text:
+            return False
+        return text.isprintable() or all(ch.isprintable() or ch in "\t\n" for ch in text)
+    previous_non_ascii = False
+    for ch in text:
+        if ch.isascii():
+            if ch == "&" or ch == "\r" or not (ch.isprintable() or ch in "\t\n"):
+                return False
+            previous_non_ascii = False
+        elif ch not in _SAFE_NON_ASCII or previous_non_ascii:
+            return False
+        else:
+            previous_non_ascii = True
+    return True
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _fix_text_cached(text: str) -> str:
     return ftfy.fix_text(text)
 
 
-__all__ = ["normalize_bytes", "normalize_text"]
+__all__ = ["normalize_bytes", "normalize_text", "normalize_many", "is_clean_text"]
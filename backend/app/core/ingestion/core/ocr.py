@@ -2,55 +2,197 @@
 
 from __future__ import annotations
 
+import hashlib
 import subprocess
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
 from pathlib import Path
-from typing import Optional, Sequence, Union
+from typing import Deque, Dict, List, Optional, Sequence, Tuple, Union
 
 import fitz  # type: ignore
 
+from . import parser_pdf
+from .models import Block, Page, block_from_dict
+from .parse_cache import DEFAULT_CACHE_MAX_BYTES, ParseCache
+
 PDFPath = Union[str, Path]
 
+DEFAULT_PAGE_TEXT_THRESHOLD = 50
+DEFAULT_IMAGE_COVERAGE = 0.5
+DEFAULT_OCR_WORKERS = 4
+# Rendering resolution used only to fingerprint pages; low DPI keeps it cheap.
+DEFAULT_HASH_DPI = 72
+
+
+class OcrStore:
+    """Persistent OCR results keyed by a hash of each page's rendered content.
+
+    The same scanned annexes (ID cards, signed declarations) recur across
+    tenders; keying on the rendered pixels lets any document containing an
+    identical page reuse its text layer instead of running tesseract again.
+    Entries live in a size-bounded ``ParseCache`` directory.
+
+    Args:
+        directory: Store directory, created if missing.
+        max_bytes: Upper bound for the total size of stored entries.
+    """
+
+    def __init__(self, directory: PDFPath, *, max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> None:
+        self._entries = ParseCache(directory, max_bytes=max_bytes)
+        self._lock = Lock()
+        self._seconds_saved = 0.0
+
+    def get(self, key: str) -> Optional[List[Block]]:
+        """Return stored blocks for a page key or ``None`` if the page is unknown."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        with self._lock:
+            self._seconds_saved += float(entry.get("ocr_seconds", 0.0))
+        return [block_from_dict(block) for block in entry["blocks"]]
+
+    def put(self, key: str, blocks: List[Block], ocr_seconds: float) -> None:
+        """Store the blocks of an OCR'd page with the time it took to produce them."""
+        self._entries.put(key, {"blocks": [block.to_dict() for block in blocks], "ocr_seconds": ocr_seconds})
+
+    def stats(self) -> Dict[str, float]:
+        """Return reuse statistics: pages reused/OCR'd and OCR seconds saved."""
+        counters = self._entries.stats()
+        with self._lock:
+            seconds_saved = self._seconds_saved
+        return {
+            "pages_reused": counters["hits"],
+            "pages_ocred": counters["misses"],
+            "entries_written": counters["writes"],
+            "entries_evicted": counters["evictions"],
+            "ocr_seconds_saved": round(seconds_saved, 3),
+        }
 
-def is_mostly_image_pdf(path: PDFPath, text_threshold: int = 200) -> bool:
-    """Determine if a PDF likely requires OCR based on extracted text length."""
-    pdf_path = Path(path)
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDF file not found at {pdf_path}")
 
-    doc = fitz.open(pdf_path.as_posix())
+def page_image_hash(page: "fitz.Page", *, dpi: int = DEFAULT_HASH_DPI) -> str:
+    """Return a SHA-256 fingerprint of a page rendered in grayscale."""
+    pixmap = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+    digest = hashlib.sha256(f"{pixmap.width}x{pixmap.height}:".encode("ascii"))
+    digest.update(pixmap.samples)
+    return digest.hexdigest()
+
+
+def is_mostly_image_pdf(
+    path: Optional[PDFPath],
+    text_threshold: int = 200,
+    *,
+    doc: Optional["fitz.Document"] = None,
+) -> bool:
+    """Determine if a PDF likely requires OCR based on extracted text length.
+
+    Pages are scanned in order and the check stops as soon as ``text_threshold``
+    characters have been seen, so text-native documents exit after a few pages.
+
+    Args:
+        path: Source PDF path; may be ``None`` when ``doc`` is given.
+        text_threshold: Minimum characters of existing text before skipping OCR.
+        doc: Optional already-open PyMuPDF document to reuse; it is not closed.
+    """
+    owned = doc is None
+    if doc is None:
+        pdf_path = Path(path)
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF file not found at {pdf_path}")
+        doc = fitz.open(pdf_path.as_posix())
     try:
-        total_text_len = sum(len(page.get_text() or "") for page in doc)
+        total_text_len = 0
+        for page in doc:
+            total_text_len += len(page.get_text() or "")
+            if total_text_len >= text_threshold:
+                return False
     finally:
-        doc.close()
+        if owned:
+            doc.close()
+
+    return True
 
-    return total_text_len < text_threshold
+
+def scanned_page_numbers(
+    path: Optional[PDFPath],
+    *,
+    text_threshold: int = DEFAULT_PAGE_TEXT_THRESHOLD,
+    image_coverage: float = DEFAULT_IMAGE_COVERAGE,
+    doc: Optional["fitz.Document"] = None,
+) -> List[int]:
+    """Return 1-based numbers of pages that look scanned.
+
+    A page qualifies when it carries fewer than ``text_threshold`` characters of
+    native text and images cover at least ``image_coverage`` of its area, so
+    blank pages and text pages with a small logo are left alone.
+
+    Args:
+        path: Source PDF path; may be ``None`` when ``doc`` is given.
+        text_threshold: Maximum native text length for a page to be OCR'd.
+        image_coverage: Minimum fraction (0..1) of the page covered by images.
+        doc: Optional already-open PyMuPDF document to reuse; it is not closed.
+    """
+    owned = doc is None
+    if doc is None:
+        pdf_path = Path(path)
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF file not found at {pdf_path}")
+        doc = fitz.open(pdf_path.as_posix())
+    try:
+        scanned: List[int] = []
+        for page_index, page in enumerate(doc, start=1):
+            if len((page.get_text() or "").strip()) >= text_threshold:
+                continue
+            if _image_coverage(page) >= image_coverage:
+                scanned.append(page_index)
+        return scanned
+    finally:
+        if owned:
+            doc.close()
 
 
 def run_ocrmypdf(
     input_path: PDFPath,
     output_path: PDFPath,
     extra_args: Optional[Sequence[str]] = None,
+    *,
+    fast: bool = False,
 ) -> None:
-    """Execute ``ocrmypdf`` with safe defaults."""
-    cmd = [
-        "ocrmypdf",
-        "--deskew",
-        "--optimize",
-        "3",
-        "--output-type",
-        "pdf",
-        str(input_path),
-        str(output_path),
-    ]
-    if extra_args:
-        cmd[1:1] = list(extra_args)
+    """Execute ``ocrmypdf`` with safe defaults.
 
-    try:
-        subprocess.run(cmd, check=True)
-    except FileNotFoundError as exc:
-        raise RuntimeError("ocrmypdf executable not found. Please install ocrmypdf.") from exc
-    except subprocess.CalledProcessError as exc:  # pragma: no cover - passthrough
-        raise RuntimeError(f"ocrmypdf failed with exit code {exc.returncode}") from exc
+    Args:
+        input_path: Source PDF path.
+        output_path: Destination PDF path.
+        extra_args: Additional arguments passed to ``ocrmypdf``.
+        fast: Skip ``--deskew`` and ``--optimize 3`` when only the text layer
+            is needed; output file size and image quality are not optimised.
+    """
+    _run_ocrmypdf_command(_ocrmypdf_command(str(input_path), str(output_path), extra_args, fast))
+
+
+def ocrmypdf_to_bytes(
+    source: Union[PDFPath, bytes],
+    extra_args: Optional[Sequence[str]] = None,
+    *,
+    fast: bool = False,
+) -> bytes:
+    """Run ``ocrmypdf`` and return the OCR'd PDF without writing it to disk.
+
+    The output is read from ``ocrmypdf``'s stdout; in-memory input is piped
+    through stdin, so no temporary file is created on our side.
+
+    Args:
+        source: Source PDF path, or the PDF content as bytes.
+        extra_args: Additional arguments passed to ``ocrmypdf``.
+        fast: Use the text-only ``ocrmypdf`` settings (see ``run_ocrmypdf``).
+
+    Returns:
+        The content of the OCR'd PDF.
+    """
+    in_memory = isinstance(source, (bytes, bytearray, memoryview))
+    cmd = _ocrmypdf_command("-" if in_memory else str(source), "-", extra_args, fast)
+    return _run_ocrmypdf_command(cmd, data=bytes(source) if in_memory else None)
 
 
 def ocr_if_needed(
@@ -59,6 +201,7 @@ def ocr_if_needed(
     text_threshold: int = 200,
     force: bool = False,
     extra_args: Optional[Sequence[str]] = None,
+    fast: bool = False,
 ) -> bool:
     """Run OCR if the PDF is mostly images.
 
@@ -68,6 +211,7 @@ def ocr_if_needed(
         text_threshold: Minimum characters of existing text before skipping OCR.
         force: If ``True``, run OCR regardless of text density.
         extra_args: Additional arguments passed to ``ocrmypdf``.
+        fast: Use the text-only ``ocrmypdf`` settings (see ``run_ocrmypdf``).
 
     Returns:
         ``True`` if OCR was executed, otherwise ``False``.
@@ -76,8 +220,172 @@ def ocr_if_needed(
     if not needs_ocr:
         return False
 
-    run_ocrmypdf(input_path, output_path, extra_args=extra_args)
+    run_ocrmypdf(input_path, output_path, extra_args=extra_args, fast=fast)
     return True
 
 
-__all__ = ["is_mostly_image_pdf", "run_ocrmypdf", "ocr_if_needed"]
+def ocr_pages(
+    path: Optional[PDFPath],
+    page_numbers: Sequence[int],
+    *,
+    workers: int = DEFAULT_OCR_WORKERS,
+    fast: bool = True,
+    doc: Optional["fitz.Document"] = None,
+    store: Optional[OcrStore] = None,
+) -> Dict[int, List[Block]]:
+    """OCR only the given pages, in parallel, and return their layout blocks.
+
+    Each page is copied into its own in-memory single-page PDF and piped
+    through ``ocrmypdf`` (``--force-ocr`` so pages with a little native text
+    are still processed, ``--jobs 1`` so parallel runs do not oversubscribe the
+    CPU). The OCR output is parsed in memory with
+    ``parser_pdf.extract_pdf_layout``; no temporary files are written.
+
+    PyMuPDF is not thread-safe, so only the ``ocrmypdf`` subprocesses run in
+    worker threads: hashing, page splitting and parsing of the OCR output
+    all happen on the calling thread.
+
+    Args:
+        path: Source PDF path; may be ``None`` when ``doc`` is given.
+        page_numbers: 1-based page numbers to OCR (e.g. from ``scanned_page_numbers``).
+        workers: Maximum concurrent ``ocrmypdf`` processes.
+        fast: Use the text-only ``ocrmypdf`` settings. Defaults to True.
+        doc: Optional already-open PyMuPDF document to copy pages from.
+        store: Optional ``OcrStore``; pages whose rendered content is already
+            known reuse the stored blocks and new results are added to it.
+
+    Returns:
+        Mapping of page number to the blocks extracted from the OCR'd page.
+    """
+    if workers <= 0:
+        raise ValueError("workers must be positive")
+    if not page_numbers:
+        return {}
+
+    owned = doc is None
+    if doc is None:
+        pdf_path = Path(path)
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF file not found at {pdf_path}")
+        doc = fitz.open(pdf_path.as_posix())
+
+    def run(page_pdf: bytes) -> Tuple[bytes, float]:
+        started = time.perf_counter()
+        ocr_data = ocrmypdf_to_bytes(page_pdf, extra_args=["--force-ocr", "--jobs", "1"], fast=fast)
+        return ocr_data, time.perf_counter() - started
+
+    def collect(page_number: int, key: Optional[str], future: "Future[Tuple[bytes, float]]") -> None:
+        ocr_data, seconds = future.result()
+        blocks = _ocr_page_blocks(ocr_data)
+        if store is not None and key is not None:
+            store.put(key, blocks, seconds)
+        results[page_number] = blocks
+
+    results: Dict[int, List[Block]] = {}
+    # Bounded so only a few single-page PDFs are held in memory at once.
+    max_in_flight = workers * 2
+    in_flight: Deque[Tuple[int, Optional[str], "Future[Tuple[bytes, float]]"]] = deque()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for page_number in page_numbers:
+                key = None
+                if store is not None:
+                    variant = "fast" if fast else "full"
+                    key = f"{page_image_hash(doc.load_page(page_number - 1))}-{variant}"
+                    cached = store.get(key)
+                    if cached is not None:
+                        results[page_number] = cached
+                        continue
+                in_flight.append((page_number, key, pool.submit(run, _single_page_bytes(doc, page_number))))
+                if len(in_flight) >= max_in_flight:
+                    collect(*in_flight.popleft())
+            while in_flight:
+                collect(*in_flight.popleft())
+    finally:
+        if owned:
+            doc.close()
+
+    return results
+
+
+def merge_ocr_pages(pages: List[Page], ocr_blocks: Dict[int, List[Block]]) -> List[Page]:
+    """Replace the blocks of OCR'd pages in an ``extract_pdf_layout`` result."""
+    if not ocr_blocks:
+        return pages
+    merged: List[Page] = []
+    for page in pages:
+        page_number = page.page_number
+        if page_number in ocr_blocks:
+            merged.append(Page(page_number=page_number, blocks=ocr_blocks[page_number]))
+        else:
+            merged.append(page)
+    return merged
+
+
+def _ocrmypdf_command(
+    input_arg: str,
+    output_arg: str,
+    extra_args: Optional[Sequence[str]],
+    fast: bool,
+) -> List[str]:
+    quality_args = ["--optimize", "0"] if fast else ["--deskew", "--optimize", "3"]
+    return ["ocrmypdf", *(extra_args or []), *quality_args, "--output-type", "pdf", input_arg, output_arg]
+
+
+def _run_ocrmypdf_command(cmd: List[str], data: Optional[bytes] = None) -> bytes:
+    try:
+        completed = subprocess.run(
+            cmd,
+            input=data,
+            stdout=subprocess.PIPE if cmd[-1] == "-" else None,
+            check=True,
+        )
+    except FileNotFoundError as exc:
+        raise RuntimeError("ocrmypdf executable not found. Please install ocrmypdf.") from exc
+    except subprocess.CalledProcessError as exc:  # pragma: no cover - passthrough
+        raise RuntimeError(f"ocrmypdf failed with exit code {exc.returncode}") from exc
+    return completed.stdout or b""
+
+
+def _image_coverage(page: "fitz.Page") -> float:
+    """Fraction of the page area covered by placed images (capped at 1.0)."""
+    page_area = abs(page.rect)
+    if page_area <= 0:
+        return 0.0
+    covered = 0.0
+    for info in page.get_image_info():
+        bbox = fitz.Rect(info.get("bbox", (0, 0, 0, 0))) & page.rect
+        covered += abs(bbox)
+    return min(covered / page_area, 1.0)
+
+
+def _ocr_page_blocks(ocr_data: bytes) -> List[Block]:
+    """Layout blocks of a single-page PDF returned by ``ocrmypdf``."""
+    ocr_doc = parser_pdf.open_pdf(None, data=ocr_data)
+    try:
+        layout = parser_pdf.extract_pdf_layout(None, doc=ocr_doc)
+    finally:
+        ocr_doc.close()
+    return layout[0].blocks if layout else []
+
+
+def _single_page_bytes(doc: "fitz.Document", page_number: int) -> bytes:
+    single = fitz.open()
+    try:
+        single.insert_pdf(doc, from_page=page_number - 1, to_page=page_number - 1)
+        return single.tobytes()
+    finally:
+        single.close()
+
+
+__all__ = [
+    "OcrStore",
+    "page_image_hash",
+    "is_mostly_image_pdf",
+    "scanned_page_numbers",
+    "run_ocrmypdf",
+    "ocrmypdf_to_bytes",
+    "ocr_if_needed",
+    "ocr_pages",
+    "merge_ocr_pages",
+]
@@ -0,0 +1,150 @@
+"""Content-addressed on-disk cache for parsed documents."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Mapping, Optional, Union
+
+from .file_utils import FileBuffer, atomic_write_bytes
+
+FilePath = Union[str, Path]
+
+# Bump when the parse output format changes so stale entries stop matching.
+CACHE_FORMAT_VERSION = 1
+DEFAULT_CACHE_MAX_BYTES = int(os.getenv("INGESTION_CACHE_MAX_BYTES", str(2 * 1024**3)))
+_ENTRY_SUFFIX = ".json"
+
+
+def hash_file(path: FilePath, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as handle:
+        for block in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_bytes(data: FileBuffer) -> str:
+    """Return the SHA-256 hex digest of in-memory content (bytes or a mmap)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def cache_key(content_hash: str, config: Mapping[str, Any]) -> str:
+    """Build a cache key from the file content hash and the parse configuration."""
+    payload = json.dumps(
+        {"version": CACHE_FORMAT_VERSION, "content": content_hash, "config": dict(config)},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ParseCache:
+    """Persistent cache of parse results with size-bounded LRU eviction.
+
+    Each entry is a JSON file named after its key. Writes are atomic (temp file
+    + rename) so several worker processes can share the same directory; reads
+    refresh the entry mtime, which is the recency signal used for eviction.
+
+    Args:
+        directory: Cache directory, created if missing.
+        max_bytes: Upper bound for the total size of cached entries.
+    """
+
+    def __init__(self, directory: FilePath, *, max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for ``key`` or ``None`` on a miss."""
+        path = self._entry_path(key)
+        try:
+            raw = path.read_bytes()
+            value = json.loads(raw)
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except ValueError:
+            # Corrupted entry (e.g. truncated by a crash on a non-atomic FS): drop it.
+            self._unlink(path)
+            self._count("misses")
+            return None
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # evicted concurrently; the value we read is still valid
+        self._count("hits")
+        return value
+
+    def put(self, key: str, value: Mapping[str, Any]) -> None:
+        """Store ``value`` under ``key`` and evict old entries above the size bound."""
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        atomic_write_bytes(data, self._entry_path(key))
+        self._count("writes")
+        self._evict()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/write/eviction counters for this process."""
+        with self._lock:
+            return dict(self._stats)
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for path in self.directory.glob(f"*{_ENTRY_SUFFIX}"):
+            self._unlink(path)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}{_ENTRY_SUFFIX}"
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for path in self.directory.glob(f"*{_ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort(key=lambda entry: entry[0])
+        evicted = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if self._unlink(path):
+                evicted += 1
+            total -= size
+        if evicted:
+            self._count("evictions", evicted)
+
+    @staticmethod
+    def _unlink(path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            # Another worker evicted it first.
+            return False
+
+
+__all__ = ["ParseCache", "cache_key", "hash_file", "hash_bytes", "CACHE_FORMAT_VERSION", "DEFAULT_CACHE_MAX_BYTES"]
@@ -2,15 +2,16 @@
 
 from __future__ import annotations
 
+import io
 from pathlib import Path
-from typing import Any, Dict, List, Union
+from typing import Dict, List, Optional, Union
 
 from docx import Document  # type: ignore
 
+from .file_utils import FileBuffer
+from .models import Block
 from .normalizer import normalize_text
 
-BlockDict = Dict[str, Any]
-
 
 def _validate_docx_path(path: Union[str, Path]) -> Path:
     """Validate that the DOCX path exists and is a file."""
@@ -22,11 +23,12 @@ def _validate_docx_path(path: Union[str, Path]) -> Path:
     return docx_path
 
 
-def parse_docx(path: Union[str, Path]) -> Dict[str, List[BlockDict]]:
+def parse_docx(path: Optional[Union[str, Path]], *, data: Optional[FileBuffer] = None) -> Dict[str, List[Block]]:
     """Parse paragraphs and tables from a DOCX file.
 
     Args:
-        path: Path to the DOCX file.
+        path: Path to the DOCX file; may be ``None`` when ``data`` is given.
+        data: Optional file content already in memory, read instead of ``path``.
 
     Returns:
         Dictionary containing ``blocks`` (paragraphs/headings) and ``tables``.
@@ -36,14 +38,16 @@ def parse_docx(path: Union[str, Path]) -> Dict[str, List[BlockDict]]:
         ValueError: If the path is not a file.
         RuntimeError: If python-docx cannot open the document.
     """
-    docx_path = _validate_docx_path(path)
+    if path is None and data is None:
+        raise ValueError("Either path or data must be provided")
+    docx_path = _validate_docx_path(path) if data is None else None
 
     try:
-        doc = Document(docx_path.as_posix())
+        doc = Document(io.BytesIO(data) if data is not None else docx_path.as_posix())
     except Exception as exc:  # pragma: no cover - passthrough
-        raise RuntimeError(f"Failed to open DOCX: {docx_path}") from exc
+        raise RuntimeError(f"Failed to open DOCX: {path or '<in-memory>'}") from exc
 
-    blocks: List[BlockDict] = []
+    blocks: List[Block] = []
     for para in doc.paragraphs:
         text = normalize_text(para.text).strip()
         if not text:
@@ -61,16 +65,16 @@ def parse_docx(path: Union[str, Path]) -> Dict[str, List[BlockDict]]:
                 level = 1
 
         blocks.append(
-            {
-                "type": block_type,
-                "level": level,
-                "text": text,
-                "style": style_name,
-                "page_number": 1,
-            }
+            Block(
+                text=text,
+                type=block_type,
+                level=level,
+                style=style_name,
+                page_number=1,
+            )
         )
 
-    tables: List[BlockDict] = []
+    tables: List[Block] = []
     for table in doc.tables:
         rows = []
         for row in table.rows:
@@ -78,12 +82,12 @@ def parse_docx(path: Union[str, Path]) -> Dict[str, List[BlockDict]]:
             rows.append(cells)
         text_rows = [" | ".join(r) for r in rows if any(r)]
         tables.append(
-            {
-                "type": "table_block",
-                "raw_cells": rows,
-                "text": "\n".join(text_rows).strip(),
-                "page_number": 1,
-            }
+            Block(
+                text="\n".join(text_rows).strip(),
+                type="table_block",
+                raw_cells=rows,
+                page_number=1,
+            )
         )
 
     return {"blocks": blocks, "tables": tables}
@@ -2,17 +2,28 @@
 
 from __future__ import annotations
 
+import math
+import mmap
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 import fitz  # type: ignore
 
 from . import heading_detection, table_detection
-from .normalizer import normalize_text
+from .file_utils import FileBuffer
+from .metrics import NULL_RECORDER, StageRecorder
+from .models import BBox, Block, Page
+from .normalizer import normalize_many
 
-PageDict = Dict[str, Any]
-BlockDict = Dict[str, Any]
+
+# Below this size the process pool start-up costs more than it saves.
+PARALLEL_MIN_PAGES = 32
+
+_MARGIN_RATIO = 0.1
+_HEADER_FOOTER_MIN_OCCURRENCES = 2
+_GLOBAL_REPEAT_MIN_OCCURRENCES = 3
 
 
 def _validate_pdf_path(path: Union[str, Path]) -> Path:
@@ -25,147 +36,407 @@ def _validate_pdf_path(path: Union[str, Path]) -> Path:
     return pdf_path
 
 
-def extract_pdf_layout(path: Union[str, Path]) -> List[PageDict]:
+def open_pdf(path: Optional[Union[str, Path]], data: Optional[FileBuffer] = None) -> "fitz.Document":
+    """Open a PDF once so the handle can be shared across ingestion stages.
+
+    Args:
+        path: Path to the PDF file. May be ``None`` for in-memory documents
+            (``data`` is then required); validated whenever given.
+        data: Optional file content already in memory; when provided the
+            document is opened from the buffer instead of re-reading the file.
+            A memory-mapped buffer (see ``file_utils.read_file_buffer``) is
+            opened from ``path`` instead, since PyMuPDF would copy the map.
+
+    Returns:
+        An open PyMuPDF document. The caller is responsible for closing it.
+    """
+    if path is None and data is None:
+        raise ValueError("Either path or data must be provided")
+    pdf_path = _validate_pdf_path(path) if path is not None else None
+    if data is None or (pdf_path is not None and isinstance(data, mmap.mmap)):
+        return _open_document(pdf_path.as_posix())
+    try:
+        return fitz.open(stream=data, filetype="pdf")
+    except Exception as exc:  # pragma: no cover - passthrough
+        raise RuntimeError(f"Failed to open PDF: {pdf_path or '<in-memory>'}") from exc
+
+
+def extract_pdf_layout(
+    path: Optional[Union[str, Path]],
+    *,
+    workers: int = 1,
+    doc: Optional["fitz.Document"] = None,
+) -> List[Page]:
     """Extract text layout information from a PDF file using PyMuPDF.
 
     Args:
-        path: Path to the PDF file.
+        path: Path to the PDF file, or ``None`` for an in-memory ``doc``.
+        workers: Number of worker processes. With more than one worker, page
+            ranges are sharded across a process pool (each worker opening its
+            own PyMuPDF handle) and merged back in page order. Defaults to 1.
+            In-memory documents are always extracted serially.
+        doc: Optional already-open document (see ``open_pdf``) reused by the
+            serial path instead of opening the file again. It is not closed.
 
     Returns:
         List of pages with extracted blocks (text, bbox, font info).
 
     Raises:
         FileNotFoundError: If the file does not exist.
-        ValueError: If the path is not a file.
+        ValueError: If the path is not a file or ``workers`` is not positive.
         RuntimeError: If PyMuPDF fails to read the document.
     """
+    if workers <= 0:
+        raise ValueError("workers must be positive")
+    if path is None:
+        if doc is None:
+            raise ValueError("doc is required when path is None")
+        return _extract_pages(doc, 0, None)
     pdf_path = _validate_pdf_path(path)
 
-    try:
-        doc = fitz.open(pdf_path.as_posix())
-    except Exception as exc:  # pragma: no cover - passthrough
-        raise RuntimeError(f"Failed to open PDF: {pdf_path}") from exc
+    if workers > 1:
+        page_count = doc.page_count if doc is not None else _page_count(pdf_path)
+        if page_count >= PARALLEL_MIN_PAGES:
+            return _extract_layout_parallel(pdf_path, page_count, workers)
 
-    pages: List[PageDict] = []
-    try:
-        for page_index, page in enumerate(doc, start=1):
-            text_dict = page.get_text("dict")
-            raw_blocks = _extract_blocks_from_dict(text_dict)
-            merged_blocks = _merge_label_value_blocks(raw_blocks)
-            ordered_blocks = _sort_blocks_reading_order(merged_blocks)
-            pages.append({"page_number": page_index, "blocks": ordered_blocks})
-    finally:
-        doc.close()
+    if doc is not None:
+        return _extract_pages(doc, 0, None)
+    return _extract_page_range(pdf_path.as_posix(), 0, None)
 
-    return pages
+
+def layout_text_length(pages: List[Page]) -> int:
+    """Return the amount of extracted text, used as the OCR text-density signal.
+
+    Computed from blocks produced by ``extract_pdf_layout`` so the layout pass
+    doubles as the scanned-document check without another ``get_text`` sweep.
+    """
+    return sum(len(block.text) for page in pages for block in page.blocks)
+
+
+def has_layout_text(doc: "fitz.Document", threshold: int) -> bool:
+    """Return whether ``layout_text_length`` of ``doc`` would reach ``threshold``.
+
+    Streaming form of the OCR text-density check: pages are laid out one at
+    a time and the scan stops as soon as ``threshold`` characters are seen.
+    """
+    total = 0
+    for page_index in range(doc.page_count):
+        total += sum(len(block.text) for block in _layout_page(doc.load_page(page_index), page_index + 1).blocks)
+        if total >= threshold:
+            return True
+    return total >= threshold
 
 
 def parse_pdf(
-    path: Union[str, Path],
+    path: Optional[Union[str, Path]],
     detect_headings: bool = True,
     detect_tables: bool = True,
-) -> List[PageDict]:
+    *,
+    workers: int = 1,
+    doc: Optional["fitz.Document"] = None,
+    layout: Optional[List[Page]] = None,
+    data: Optional[FileBuffer] = None,
+    table_prescreen: Optional[table_detection.TablePrescreenConfig] = None,
+    table_stats: Optional[Dict[str, int]] = None,
+    recorder: Optional[StageRecorder] = None,
+) -> List[Page]:
     """Parse a PDF file and optionally tag headings and tables.
 
     Args:
-        path: Path to the PDF file.
+        path: Path to the PDF file. May be ``None`` for in-memory documents
+            when ``data`` and either ``doc`` or ``layout`` are given.
         detect_headings: Whether to classify heading-like blocks. Defaults to True.
         detect_tables: Whether to detect tables via pdfplumber and heuristics. Defaults to True.
+        workers: Worker processes used for layout extraction (see ``extract_pdf_layout``).
+        doc: Optional already-open PyMuPDF document shared with other stages
+            (layout extraction and the table pre-screen); it is not closed.
+        layout: Optional output of ``extract_pdf_layout`` when the caller has
+            already run the layout pass; extraction is then skipped.
+        data: Optional in-memory file content (bytes or a mmap) handed to
+            table detection so pdfplumber does not read the file from disk again.
+        table_prescreen: Optional pre-screen restricting pdfplumber to
+            candidate pages (see ``table_detection.TablePrescreenConfig``).
+        table_stats: Optional dict receiving table page counters
+            (``pages_total``, ``pages_screened``, ``pages_skipped``).
+        recorder: Optional ``StageRecorder`` timing the ``layout``,
+            ``headings``, ``tables`` and ``boilerplate`` stages; the table
+            page counters are attached to the ``tables`` stage.
 
     Returns:
         A list of page dictionaries, each containing enriched blocks.
     """
-    pages = extract_pdf_layout(path)
+    stages = recorder if recorder is not None else NULL_RECORDER
+    if layout is not None:
+        pages = layout
+    else:
+        with stages.stage("layout") as stage:
+            pages = extract_pdf_layout(path, workers=workers, doc=doc)
+            stage.record(pages)
 
     if detect_headings:
-        for page in pages:
-            page["blocks"] = heading_detection.tag_headings(page.get("blocks", []))
+        with stages.stage("headings") as stage:
+            for page in pages:
+                page.blocks = heading_detection.tag_headings(page.blocks)
+            stage.record(pages)
 
     if detect_tables:
-        pages = table_detection.integrate_tables(path, pages)
-
-    pages = _remove_repeated_headers_footers(pages)
-    pages = _drop_globally_repeated_blocks(pages)
+        with stages.stage("tables") as stage:
+            counts: Dict[str, int] = {}
+            pages = table_detection.integrate_tables(
+                path,
+                pages,
+                data=data,
+                prescreen=table_prescreen,
+                stats=counts,
+                doc=doc,
+            )
+            stage.record(pages)
+            stage.count(counts)
+        if table_stats is not None:
+            for name, value in counts.items():
+                table_stats[name] = table_stats.get(name, 0) + value
+
+    with stages.stage("boilerplate") as stage:
+        pages = _remove_repeated_headers_footers(pages)
+        pages = _drop_globally_repeated_blocks(pages)
+        stage.record(pages)
 
     return pages
 
 
-__all__ = ["extract_pdf_layout", "parse_pdf"]
+def iter_pdf_pages(
+    path: Optional[Union[str, Path]],
+    detect_headings: bool = True,
+    detect_tables: bool = True,
+    *,
+    data: Optional[FileBuffer] = None,
+    table_prescreen: Optional[table_detection.TablePrescreenConfig] = None,
+    doc: Optional["fitz.Document"] = None,
+    page_blocks: Optional[Dict[int, List[Block]]] = None,
+) -> Iterator[Page]:
+    """Yield cleaned pages one at a time with memory bounded by a single page.
+
+    Produces the same pages as ``parse_pdf`` without materialising the whole
+    document. A first pass keeps only hashed header/footer keys and block
+    signatures to build the repetition statistics; a second pass re-extracts
+    each page, tags it and filters it before yielding. Layout extraction runs
+    twice in exchange for not holding every block dict at once; pdfplumber
+    tables are extracted once, after the table pre-screen has seen each page
+    in the first pass, and kept per page between the passes.
+
+    Args:
+        path: Path to the PDF file, or ``None`` when ``data`` holds the document.
+        detect_headings: Whether to classify heading-like blocks. Defaults to True.
+        detect_tables: Whether to detect tables via pdfplumber and heuristics. Defaults to True.
+        data: Optional in-memory content of ``path`` shared with pdfplumber/PyMuPDF.
+        table_prescreen: Optional pre-screen restricting pdfplumber to candidate pages.
+        doc: Optional already-open PyMuPDF document of ``path``/``data``; it
+            is not closed.
+        page_blocks: Optional layout blocks replacing the extracted ones for
+            some 1-based pages, e.g. ``ocr.ocr_pages`` output for scanned pages.
+
+    Yields:
+        Page dictionaries with ``page_number`` and ``blocks``.
+    """
+    owned = doc is None
+    if doc is None:
+        doc = open_pdf(path, data=data)
+
+    def layout_blocks(page: "fitz.Page", page_number: int) -> List[Block]:
+        if page_blocks is not None and page_number in page_blocks:
+            return list(page_blocks[page_number])
+        return _layout_page(page, page_number).blocks
+
+    try:
+        header_counter: Counter = Counter()
+        footer_counter: Counter = Counter()
+        # (signature, header/footer key, in top margin, in bottom margin) -> occurrences
+        placements: Counter = Counter()
+        candidates: Optional[Set[int]] = set() if table_prescreen is not None else None
+        for page_index in range(doc.page_count):
+            fitz_page = doc.load_page(page_index)
+            blocks = layout_blocks(fitz_page, page_index + 1)
+            if candidates is not None and detect_tables:
+                if table_detection.is_table_candidate_page(fitz_page, table_prescreen):
+                    candidates.add(page_index + 1)
+            for placement in _block_placements(blocks, margin_ratio=_MARGIN_RATIO):
+                _, hf_key, is_top, is_bottom = placement
+                if is_top:
+                    header_counter[hf_key] += 1
+                if is_bottom:
+                    footer_counter[hf_key] += 1
+                placements[placement] += 1
+
+        tables: Dict[int, List[Block]] = {}
+        if detect_tables:
+            tables = table_detection.tables_by_page(path, data=data, page_numbers=candidates)
+            for table_blocks in tables.values():
+                # Table blocks carry no bbox, so they only count towards global repetition.
+                for block in table_blocks:
+                    signature = _block_signature(block)
+                    placements[(hash(signature) if signature is not None else None, None, False, False)] += 1
+
+        global_counter: Counter = Counter()
+        for (signature, hf_key, is_top, is_bottom), occurrences in placements.items():
+            removed = (is_top and header_counter[hf_key] >= _HEADER_FOOTER_MIN_OCCURRENCES) or (
+                is_bottom and footer_counter[hf_key] >= _HEADER_FOOTER_MIN_OCCURRENCES
+            )
+            if signature is not None and not removed:
+                global_counter[signature] += occurrences
+        del placements
+
+        for page_index in range(doc.page_count):
+            page_number = page_index + 1
+            blocks = layout_blocks(doc.load_page(page_index), page_number)
+            if detect_headings:
+                blocks = heading_detection.tag_headings(blocks)
+            if detect_tables:
+                blocks = table_detection.flag_table_like_blocks(blocks)
+                blocks.extend(tables.pop(page_number, []))
+
+            kept: List[Block] = []
+            for block, (signature, hf_key, is_top, is_bottom) in zip(
+                blocks, _block_placements(blocks, margin_ratio=_MARGIN_RATIO)
+            ):
+                if is_top and header_counter[hf_key] >= _HEADER_FOOTER_MIN_OCCURRENCES:
+                    continue
+                if is_bottom and footer_counter[hf_key] >= _HEADER_FOOTER_MIN_OCCURRENCES:
+                    continue
+                if signature is not None and global_counter[signature] >= _GLOBAL_REPEAT_MIN_OCCURRENCES:
+                    continue
+                kept.append(block)
+            yield Page(page_number=page_number, blocks=kept)
+    finally:
+        if owned:
+            doc.close()
+
+
+__all__ = ["open_pdf", "extract_pdf_layout", "layout_text_length", "has_layout_text", "parse_pdf", "iter_pdf_pages"]
 
 
 # ---- Internal helpers -----------------------------------------------------
 
 
-def _aggregate_bbox(bboxes: List[Tuple[float, float, float, float]]) -> List[float]:
+def _open_document(pdf_path: str) -> "fitz.Document":
+    try:
+        return fitz.open(pdf_path)
+    except Exception as exc:  # pragma: no cover - passthrough
+        raise RuntimeError(f"Failed to open PDF: {pdf_path}") from exc
+
+
+def _page_count(pdf_path: Path) -> int:
+    doc = _open_document(pdf_path.as_posix())
+    try:
+        return doc.page_count
+    finally:
+        doc.close()
+
+
+def _layout_page(page: "fitz.Page", page_number: int) -> Page:
+    """Build the ordered block layout for a single PyMuPDF page."""
+    text_dict = page.get_text("dict")
+    raw_blocks = _extract_blocks_from_dict(text_dict)
+    merged_blocks = _merge_label_value_blocks(raw_blocks)
+    ordered_blocks = _sort_blocks_reading_order(merged_blocks)
+    return Page(page_number=page_number, blocks=ordered_blocks)
+
+
+def _extract_pages(doc: "fitz.Document", start: int, stop: Optional[int]) -> List[Page]:
+    """Extract pages ``[start, stop)`` (0-based) from an open document."""
+    end = doc.page_count if stop is None else min(stop, doc.page_count)
+    return [_layout_page(doc.load_page(page_index), page_index + 1) for page_index in range(start, end)]
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: Optional[int]) -> List[Page]:
+    """Extract a page range with a dedicated document handle.
+
+    Kept at module level so it can be pickled into process pool workers.
+    """
+    doc = _open_document(pdf_path)
+    try:
+        return _extract_pages(doc, start, stop)
+    finally:
+        doc.close()
+
+
+def _extract_layout_parallel(pdf_path: Path, page_count: int, workers: int) -> List[Page]:
+    """Shard page ranges across a process pool and merge them in page order."""
+    # Several shards per worker keep the pool busy when page costs are uneven.
+    shard_size = max(1, math.ceil(page_count / (workers * 4)))
+    starts = list(range(0, page_count, shard_size))
+    stops = [min(start + shard_size, page_count) for start in starts]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        shards = pool.map(_extract_page_range, [pdf_path.as_posix()] * len(starts), starts, stops)
+        return [page for shard in shards for page in shard]
+
+
+def _aggregate_bbox(bboxes: List[BBox]) -> BBox:
     x0 = min(b[0] for b in bboxes)
     y0 = min(b[1] for b in bboxes)
     x1 = max(b[2] for b in bboxes)
     y1 = max(b[3] for b in bboxes)
-    return [x0, y0, x1, y1]
+    return (x0, y0, x1, y1)
 
 
-def _merge_spans_into_lines(lines: List[Dict[str, Any]]) -> List[BlockDict]:
-    merged_lines: List[BlockDict] = []
+def _merge_spans_into_lines(lines: List[Dict[str, Any]]) -> List[Block]:
+    merged_lines: List[Block] = []
     for line in lines:
         spans = line.get("spans", [])
         texts: List[str] = []
-        bboxes: List[Tuple[float, float, float, float]] = []
+        bboxes: List[BBox] = []
         font_sizes: List[float] = []
         fonts: List[str] = []
-        for span in spans:
-            text = normalize_text(span.get("text", "")).strip()
+        normalized = normalize_many([span.get("text", "") for span in spans])
+        for span, raw_text in zip(spans, normalized):
+            text = raw_text.strip()
             if not text:
                 continue
             texts.append(text)
             bbox = span.get("bbox")
-            if isinstance(bbox, (list, tuple)) and len(bbox) == 4:
+            if bbox is not None and len(bbox) == 4:
                 bboxes.append(tuple(bbox))  # type: ignore[arg-type]
             size = span.get("size")
-            if isinstance(size, (int, float)):
+            if size is not None:
                 font_sizes.append(float(size))
             font = span.get("font")
-            if isinstance(font, str):
+            if font is not None:
                 fonts.append(font)
         if not texts:
             continue
-        font_name = None
-        if fonts:
-            font_name = Counter(fonts).most_common(1)[0][0]
-        font_size = None
-        if font_sizes:
-            font_size = sum(font_sizes) / len(font_sizes)
         merged_lines.append(
-            {
-                "text": " ".join(texts),
-                "bbox": _aggregate_bbox(bboxes) if bboxes else None,
-                "font_size": font_size,
-                "font_name": font_name,
-                "type": "paragraph",
-            }
+            Block(
+                text=" ".join(texts),
+                bbox=_aggregate_bbox(bboxes) if bboxes else None,
+                font_size=sum(font_sizes) / len(font_sizes) if font_sizes else None,
+                font_name=Counter(fonts).most_common(1)[0][0] if fonts else None,
+            )
         )
     return merged_lines
 
 
-def _merge_lines_into_paragraphs(lines: List[BlockDict], line_gap_multiplier: float = 0.8) -> List[BlockDict]:
-    paragraphs: List[BlockDict] = []
-    current: List[BlockDict] = []
+def _merge_lines_into_paragraphs(lines: List[Block], line_gap_multiplier: float = 0.8) -> List[Block]:
+    paragraphs: List[Block] = []
+    current: List[Block] = []
 
     def flush_current() -> None:
         nonlocal current
         if not current:
             return
-        texts = [b["text"] for b in current]
-        bboxes = [tuple(b["bbox"]) for b in current if b.get("bbox")]  # type: ignore[arg-type]
-        font_sizes = [b["font_size"] for b in current if isinstance(b.get("font_size"), (int, float))]
-        font_names = [b["font_name"] for b in current if b.get("font_name")]
+        if len(current) == 1:
+            paragraphs.append(current[0])
+            current = []
+            return
+        bboxes = [b.bbox for b in current if b.bbox is not None]
+        font_sizes = [b.font_size for b in current if b.font_size is not None]
+        font_names = [b.font_name for b in current if b.font_name]
         paragraphs.append(
-            {
-                "text": " ".join(texts),
-                "bbox": _aggregate_bbox(bboxes) if bboxes else None,
-                "font_size": sum(font_sizes) / len(font_sizes) if font_sizes else None,
-                "font_name": Counter(font_names).most_common(1)[0][0] if font_names else None,
-                "type": current[0].get("type", "paragraph"),
-            }
+            Block(
+                text=" ".join(b.text for b in current),
+                bbox=_aggregate_bbox(bboxes) if bboxes else None,
+                font_size=sum(font_sizes) / len(font_sizes) if font_sizes else None,
+                font_name=Counter(font_names).most_common(1)[0][0] if font_names else None,
+                type=current[0].type,
+            )
         )
         current = []
 
@@ -174,12 +445,10 @@ def _merge_lines_into_paragraphs(lines: List[BlockDict], line_gap_multiplier: fl
             current.append(line)
             continue
         prev = current[-1]
-        prev_bbox = prev.get("bbox")
-        line_bbox = line.get("bbox")
-        if isinstance(prev_bbox, list) and isinstance(line_bbox, list):
-            vertical_gap = line_bbox[1] - prev_bbox[3]
-            font_size = prev.get("font_size") or line.get("font_size") or 10
-            if 0 <= vertical_gap <= (font_size * line_gap_multiplier) and prev.get("font_name") == line.get("font_name"):
+        if prev.bbox is not None and line.bbox is not None:
+            vertical_gap = line.bbox[1] - prev.bbox[3]
+            font_size = prev.font_size or line.font_size or 10
+            if 0 <= vertical_gap <= (font_size * line_gap_multiplier) and prev.font_name == line.font_name:
                 current.append(line)
                 continue
         flush_current()
@@ -194,59 +463,48 @@ def _detect_list_item(text: str) -> bool:
     return stripped.startswith(("-", "•", "–")) or stripped[:2].isdigit() and stripped[2:3] in {".", ")"}
 
 
-def _extract_blocks_from_dict(text_dict: Dict[str, Any]) -> List[BlockDict]:
-    blocks: List[BlockDict] = []
+def _extract_blocks_from_dict(text_dict: Dict[str, Any]) -> List[Block]:
+    blocks: List[Block] = []
     for block in text_dict.get("blocks", []):
         if "lines" not in block:
             continue
         line_blocks = _merge_spans_into_lines(block.get("lines", []))
         # mark list items early
         for lb in line_blocks:
-            if _detect_list_item(lb["text"]):
-                lb["type"] = "list_item"
+            if _detect_list_item(lb.text):
+                lb.type = "list_item"
         paragraphs = _merge_lines_into_paragraphs(line_blocks)
         blocks.extend(paragraphs)
     return blocks
 
 
-def _merge_label_value_blocks(blocks: List[BlockDict]) -> List[BlockDict]:
+def _merge_label_value_blocks(blocks: List[Block]) -> List[Block]:
     """Merge label/value pairs split across lines (e.g., 'E-mail:' + next line)."""
-    merged: List[BlockDict] = []
+    merged: List[Block] = []
     skip_next = False
     for i, block in enumerate(blocks):
         if skip_next:
             skip_next = False
             continue
-        text = block.get("text", "")
-        if isinstance(text, str) and text.rstrip().endswith(":") and i + 1 < len(blocks):
+        if block.text.rstrip().endswith(":") and i + 1 < len(blocks):
             next_block = blocks[i + 1]
-            next_text = next_block.get("text", "")
-            if isinstance(next_text, str):
-                combined = f"{text} {next_text}".strip()
-                merged_bbox: List[float] | None = None
-                bboxes: List[Tuple[float, float, float, float]] = []
-                for b in (block, next_block):
-                    bbox = b.get("bbox")
-                    if isinstance(bbox, list) and len(bbox) == 4:
-                        bboxes.append(tuple(bbox))  # type: ignore[arg-type]
-                if bboxes:
-                    merged_bbox = _aggregate_bbox(bboxes)
-                merged.append(
-                    {
-                        "text": combined,
-                        "bbox": merged_bbox,
-                        "font_size": block.get("font_size") or next_block.get("font_size"),
-                        "font_name": block.get("font_name") or next_block.get("font_name"),
-                        "type": block.get("type", "paragraph"),
-                    }
+            bboxes = [b.bbox for b in (block, next_block) if b.bbox is not None]
+            merged.append(
+                Block(
+                    text=f"{block.text} {next_block.text}".strip(),
+                    bbox=_aggregate_bbox(bboxes) if bboxes else None,
+                    font_size=block.font_size or next_block.font_size,
+                    font_name=block.font_name or next_block.font_name,
+                    type=block.type,
                 )
-                skip_next = True
-                continue
+            )
+            skip_next = True
+            continue
         merged.append(block)
     return merged
 
 
-def _sort_blocks_reading_order(blocks: List[BlockDict]) -> List[BlockDict]:
+def _sort_blocks_reading_order(blocks: List[Block]) -> List[Block]:
     """Sort blocks primarily by vertical position, then horizontal, with stability.
 
     Two-column detection can reorder content unnaturally; instead, we sort by y
@@ -254,147 +512,161 @@ def _sort_blocks_reading_order(blocks: List[BlockDict]) -> List[BlockDict]:
     subheadings close to their following paragraphs.
     """
 
-    def sort_key(b: BlockDict) -> Tuple[float, float, int]:
-        bbox = b.get("bbox", [0, 0, 0, 0])
-        x0, y0 = 0.0, 0.0
-        if isinstance(bbox, list) and len(bbox) == 4:
-            x0, y0 = bbox[0], bbox[1]
-        idx = b.get("_orig_idx", 0)
-        return (y0, x0, idx)
-
-    # Preserve original index for stability
-    for i, b in enumerate(blocks):
-        b["_orig_idx"] = i
+    def sort_key(b: Block) -> Tuple[float, float]:
+        if b.bbox is None:
+            return (0.0, 0.0)
+        return (b.bbox[1], b.bbox[0])
 
+    # sorted() is stable, so equal positions keep their original order.
     ordered = sorted(blocks, key=sort_key)
-    merged = _merge_adjacent_blocks(ordered)
+    return _merge_adjacent_blocks(ordered)
 
-    for b in merged:
-        b.pop("_orig_idx", None)
-    return merged
 
-
-def _merge_adjacent_blocks(blocks: List[BlockDict], gap_multiplier: float = 0.5) -> List[BlockDict]:
+def _merge_adjacent_blocks(blocks: List[Block], gap_multiplier: float = 0.5) -> List[Block]:
     """Merge adjacent blocks with same font/size that are vertically close."""
-    merged: List[BlockDict] = []
+    merged: List[Block] = []
     for block in blocks:
         if not merged:
             merged.append(block)
             continue
         prev = merged[-1]
-        prev_bbox = prev.get("bbox")
-        curr_bbox = block.get("bbox")
         if (
-            isinstance(prev_bbox, list)
-            and isinstance(curr_bbox, list)
-            and prev.get("font_name") == block.get("font_name")
-            and prev.get("font_size") == block.get("font_size")
+            prev.bbox is not None
+            and block.bbox is not None
+            and prev.font_name == block.font_name
+            and prev.font_size == block.font_size
         ):
-            vertical_gap = curr_bbox[1] - prev_bbox[3]
-            font_size = block.get("font_size") or prev.get("font_size") or 10
+            vertical_gap = block.bbox[1] - prev.bbox[3]
+            font_size = block.font_size or prev.font_size or 10
             if 0 <= vertical_gap <= (font_size * gap_multiplier):
-                prev["text"] = f"{prev.get('text', '')} {block.get('text', '')}".strip()
-                prev["bbox"] = _aggregate_bbox([tuple(prev_bbox), tuple(curr_bbox)])  # type: ignore[arg-type]
+                prev.text = f"{prev.text} {block.text}".strip()
+                prev.bbox = _aggregate_bbox([prev.bbox, block.bbox])
                 continue
         merged.append(block)
     return merged
 
 
 def _remove_repeated_headers_footers(
-    pages: List[PageDict],
+    pages: List[Page],
     *,
-    margin_ratio: float = 0.1,
-    min_occurrences: int = 2,
-) -> List[PageDict]:
+    margin_ratio: float = _MARGIN_RATIO,
+    min_occurrences: int = _HEADER_FOOTER_MIN_OCCURRENCES,
+) -> List[Page]:
     """Remove header/footer blocks repeated across pages using relative margins."""
     header_counter: Dict[str, int] = {}
     footer_counter: Dict[str, int] = {}
 
     # Count occurrences
-    page_heights: List[float] = []
-    for page in pages:
-        max_y = 0.0
-        for block in page.get("blocks", []):
-            bbox = block.get("bbox")
-            if isinstance(bbox, list) and len(bbox) == 4:
-                max_y = max(max_y, bbox[3])
-        page_heights.append(max_y)
+    page_heights = [_page_height(page.blocks) for page in pages]
 
     for page, page_height in zip(pages, page_heights):
         if page_height <= 0:
             continue
         top_margin = margin_ratio * page_height
         bottom_margin = (1 - margin_ratio) * page_height
-        for block in page.get("blocks", []):
-            bbox = block.get("bbox")
-            text = block.get("text")
-            if not (isinstance(bbox, list) and isinstance(text, str)):
+        for block in page.blocks:
+            bbox = block.bbox
+            if bbox is None:
                 continue
-            key = f"{text}|{block.get('font_name')}|{round(block.get('font_size') or 0, 1)}"
+            key = _header_footer_key(block)
             if bbox[1] <= top_margin:
                 header_counter[key] = header_counter.get(key, 0) + 1
             if bbox[3] >= bottom_margin:
                 footer_counter[key] = footer_counter.get(key, 0) + 1
 
-    def is_repeated(block: BlockDict, counter: Dict[str, int], predicate) -> bool:
-        bbox = block.get("bbox")
-        text = block.get("text")
-        if not (isinstance(bbox, list) and isinstance(text, str)):
+    def is_repeated(block: Block, counter: Dict[str, int], predicate) -> bool:
+        if block.bbox is None:
             return False
-        key = f"{text}|{block.get('font_name')}|{round(block.get('font_size') or 0, 1)}"
-        return predicate(bbox) and counter.get(key, 0) >= min_occurrences
+        key = _header_footer_key(block)
+        return predicate(block.bbox) and counter.get(key, 0) >= min_occurrences
 
-    cleaned_pages: List[PageDict] = []
+    cleaned_pages: List[Page] = []
     for page, page_height in zip(pages, page_heights):
         if page_height <= 0:
             cleaned_pages.append(page)
             continue
         top_margin = margin_ratio * page_height
         bottom_margin = (1 - margin_ratio) * page_height
-        filtered_blocks: List[BlockDict] = []
-        for block in page.get("blocks", []):
+        filtered_blocks: List[Block] = []
+        for block in page.blocks:
             if is_repeated(block, header_counter, lambda b: b[1] <= top_margin):
                 continue
             if is_repeated(block, footer_counter, lambda b: b[3] >= bottom_margin):
                 continue
             filtered_blocks.append(block)
-        cleaned_pages.append({"page_number": page.get("page_number"), "blocks": filtered_blocks})
+        cleaned_pages.append(Page(page_number=page.page_number, blocks=filtered_blocks))
     return cleaned_pages
 
 
 def _drop_globally_repeated_blocks(
-    pages: List[PageDict],
+    pages: List[Page],
     *,
-    min_occurrences: int = 3,
-) -> List[PageDict]:
+    min_occurrences: int = _GLOBAL_REPEAT_MIN_OCCURRENCES,
+) -> List[Page]:
     """Drop blocks whose text+bbox+font repeat many times across the document."""
     counter: Dict[str, int] = {}
     for page in pages:
-        for block in page.get("blocks", []):
+        for block in page.blocks:
             key = _block_signature(block)
             if key:
                 counter[key] = counter.get(key, 0) + 1
 
-    cleaned_pages: List[PageDict] = []
+    cleaned_pages: List[Page] = []
     for page in pages:
-        filtered: List[BlockDict] = []
-        for block in page.get("blocks", []):
+        filtered: List[Block] = []
+        for block in page.blocks:
             key = _block_signature(block)
             if key and counter.get(key, 0) >= min_occurrences:
                 continue
             filtered.append(block)
-        cleaned_pages.append({"page_number": page.get("page_number"), "blocks": filtered})
+        cleaned_pages.append(Page(page_number=page.page_number, blocks=filtered))
     return cleaned_pages
 
 
-def _block_signature(block: BlockDict) -> str | None:
+def _block_signature(block: Block) -> str | None:
     """Create a stable signature for a block using text and font attributes."""
-    text = block.get("text")
-    font = block.get("font_name")
-    size = block.get("font_size")
-    if not isinstance(text, str):
+    if block.text is None:
         return None
-    font_key = (font or "").lower()
-    size_key = f"{size:.1f}" if isinstance(size, (int, float)) else ""
-    normalized_text = " ".join(text.split()).strip()
+    font_key = (block.font_name or "").lower()
+    size_key = f"{block.font_size:.1f}" if block.font_size is not None else ""
+    normalized_text = " ".join(block.text.split()).strip()
     return f"{normalized_text}|{font_key}|{size_key}"
+
+
+def _header_footer_key(block: Block) -> str:
+    return f"{block.text}|{block.font_name}|{round(block.font_size or 0, 1)}"
+
+
+def _page_height(blocks: List[Block]) -> float:
+    max_y = 0.0
+    for block in blocks:
+        if block.bbox is not None:
+            max_y = max(max_y, block.bbox[3])
+    return max_y
+
+
+def _block_placements(
+    blocks: List[Block],
+    *,
+    margin_ratio: float,
+) -> List[Tuple[Optional[int], Optional[int], bool, bool]]:
+    """Hashed repetition keys of each block, mirroring the batch cleanup rules.
+
+    Returns one ``(signature, header_footer_key, in_top_margin, in_bottom_margin)``
+    tuple per block. Keys are hashed so the streaming first pass stays small.
+    """
+    page_height = _page_height(blocks)
+    top_margin = margin_ratio * page_height
+    bottom_margin = (1 - margin_ratio) * page_height
+    placements: List[Tuple[Optional[int], Optional[int], bool, bool]] = []
+    for block in blocks:
+        signature = _block_signature(block)
+        signature_hash = hash(signature) if signature is not None else None
+        bbox = block.bbox
+        if page_height <= 0 or bbox is None:
+            placements.append((signature_hash, None, False, False))
+            continue
+        placements.append(
+            (signature_hash, hash(_header_footer_key(block)), bbox[1] <= top_margin, bbox[3] >= bottom_margin)
+        )
+    return placements
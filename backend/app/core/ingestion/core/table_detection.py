@@ -2,31 +2,72 @@
 
 from __future__ import annotations
 
+import io
+import logging
+import mmap
 import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Sequence, Union
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Union
+
+import fitz  # type: ignore
 
 try:
     import pdfplumber
 except ImportError:  # pragma: no cover - optional dependency
     pdfplumber = None  # type: ignore
 
-BlockDict = Dict[str, Any]
-PageDict = Dict[str, Any]
+from .file_utils import FileBuffer
+from .models import Block, Page
+
+logger = logging.getLogger(__name__)
+
+# Lines/rect edges thinner than this (in points) count as ruling lines.
+_RULING_TOLERANCE = 1.5
+
 
+@dataclass(frozen=True)
+class TablePrescreenConfig:
+    """Thresholds for the cheap pre-screen selecting pages sent to pdfplumber.
+
+    A page is a table candidate if any enabled signal fires. There is no
+    text signal: PyMuPDF layout blocks join their lines with spaces, so
+    ``_is_table_like_text`` (which needs several lines) never fires on them;
+    borderless tables need ``use_fitz_table_finder``.
+
+    Attributes:
+        min_ruling_lines: Minimum horizontal/vertical ruling lines (line
+            segments or thin rectangles) in the PyMuPDF drawing list; ``0``
+            disables the signal.
+        use_fitz_table_finder: Whether to ask PyMuPDF's own table finder
+            (``page.find_tables``, when available). Slower than the ruling signal.
+    """
 
-def table_to_block(table_cells: Sequence[Sequence[str | None]]) -> BlockDict:
-    """Convert table cells to a normalized block dictionary."""
+    min_ruling_lines: int = 6
+    use_fitz_table_finder: bool = False
+
+
+def table_to_block(table_cells: Sequence[Sequence[str | None]]) -> Block:
+    """Convert table cells to a normalized table block."""
     text_rows = [" | ".join(cell or "" for cell in row) for row in table_cells]
     text = "\n".join(text_rows).strip()
-    return {"type": "table_block", "text": text, "raw_cells": [list(row) for row in table_cells]}
+    return Block(text=text, type="table_block", raw_cells=[list(row) for row in table_cells])
 
 
-def extract_pdf_tables(path: Union[str, Path]) -> List[Dict[str, Any]]:
+def extract_pdf_tables(
+    path: Optional[Union[str, Path]],
+    *,
+    data: Optional[FileBuffer] = None,
+    page_numbers: Optional[Iterable[int]] = None,
+) -> List[Dict[str, Any]]:
     """Extract tables from a PDF via pdfplumber.
 
     Args:
-        path: Path to the PDF file.
+        path: Path to the PDF file; may be ``None`` when ``data`` is given.
+        data: Optional file content already loaded in memory (bytes or a
+            mmap); when given, pdfplumber reads from the buffer instead of the
+            filesystem.
+        page_numbers: Optional 1-based pages to inspect; all pages when omitted.
 
     Returns:
         List of dictionaries with ``page_number`` and ``block`` keys.
@@ -34,14 +75,22 @@ def extract_pdf_tables(path: Union[str, Path]) -> List[Dict[str, Any]]:
     if pdfplumber is None:
         return []
 
-    pdf_path = Path(path)
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDF file not found at {pdf_path}")
-
+    if data is None:
+        pdf_path = Path(path)
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF file not found at {pdf_path}")
+        source: Any = pdf_path.as_posix()
+    else:
+        # A mmap is already a seekable file object; bytes need a BytesIO view.
+        source = data if isinstance(data, mmap.mmap) else io.BytesIO(data)
     table_blocks: List[Dict[str, Any]] = []
-    with pdfplumber.open(pdf_path.as_posix()) as pdf:
-        for page_index, page in enumerate(pdf.pages, start=1):
-            tables = page.extract_tables()
+    with pdfplumber.open(source) as pdf:
+        if page_numbers is None:
+            selected = list(range(1, len(pdf.pages) + 1))
+        else:
+            selected = sorted(n for n in set(page_numbers) if 1 <= n <= len(pdf.pages))
+        for page_index in selected:
+            tables = pdf.pages[page_index - 1].extract_tables()
             for table in tables:
                 table_blocks.append({"page_number": page_index, "block": table_to_block(table)})
     return table_blocks
@@ -69,41 +118,157 @@ def _is_table_like_text(text: str) -> bool:
     )
 
 
-def flag_table_like_blocks(blocks: List[BlockDict]) -> List[BlockDict]:
+def flag_table_like_blocks(blocks: List[Block]) -> List[Block]:
     """Mark blocks that appear to be table-like based on heuristics."""
     for block in blocks:
-        text = str(block.get("text", "")).strip()
-        if block.get("type") == "table_block":
+        if block.type == "table_block":
             continue
-        if _is_table_like_text(text):
-            block["type"] = "table_block"
+        if _is_table_like_text(block.text.strip()):
+            block.type = "table_block"
     return blocks
 
 
-def integrate_tables(path: Union[str, Path], pages: List[PageDict]) -> List[PageDict]:
+def is_table_candidate_page(page: "fitz.Page", config: TablePrescreenConfig) -> bool:
+    """Return whether a page is worth sending to pdfplumber."""
+    if config.min_ruling_lines > 0 and _count_ruling_lines(page, stop_at=config.min_ruling_lines) >= config.min_ruling_lines:
+        return True
+    if config.use_fitz_table_finder and hasattr(page, "find_tables"):
+        try:
+            if page.find_tables().tables:
+                return True
+        except Exception:  # pragma: no cover - PyMuPDF finder is best effort
+            logger.debug("PyMuPDF table finder failed on page %s", page.number + 1, exc_info=True)
+    return False
+
+
+def table_candidate_pages(
+    path: Optional[Union[str, Path]],
+    pages: Sequence[Page],
+    config: TablePrescreenConfig,
+    *,
+    data: Optional[FileBuffer] = None,
+    doc: Optional["fitz.Document"] = None,
+) -> Set[int]:
+    """Pre-screen parsed pages and return the 1-based numbers of table candidates.
+
+    Args:
+        path: Path to the source PDF (used for the PyMuPDF drawing list);
+            may be ``None`` when ``data`` or ``doc`` is given.
+        pages: Parsed pages from PyMuPDF.
+        config: Pre-screen thresholds.
+        data: Optional in-memory content of ``path``.
+        doc: Optional already-open PyMuPDF document (see
+            ``parser_pdf.open_pdf``); it is not closed.
+    """
+    owned = doc is None
+    if owned:
+        if data is None or (path is not None and isinstance(data, mmap.mmap)):
+            doc = fitz.open(Path(path).as_posix())
+        else:
+            doc = fitz.open(stream=data, filetype="pdf")
+    try:
+        candidates: Set[int] = set()
+        for page in pages:
+            page_number = page.page_number
+            if not 1 <= page_number <= doc.page_count:
+                continue
+            if is_table_candidate_page(doc.load_page(page_number - 1), config):
+                candidates.add(page_number)
+        return candidates
+    finally:
+        if owned:
+            doc.close()
+
+
+def tables_by_page(
+    path: Optional[Union[str, Path]],
+    *,
+    data: Optional[FileBuffer] = None,
+    page_numbers: Optional[Iterable[int]] = None,
+) -> Dict[int, List[Block]]:
+    """Group pdfplumber table blocks by 1-based page number."""
+    grouped: Dict[int, List[Block]] = {}
+    for table in extract_pdf_tables(path, data=data, page_numbers=page_numbers):
+        grouped.setdefault(table["page_number"], []).append(table["block"])
+    return grouped
+
+
+def integrate_tables(
+    path: Optional[Union[str, Path]],
+    pages: List[Page],
+    *,
+    data: Optional[FileBuffer] = None,
+    prescreen: Optional[TablePrescreenConfig] = None,
+    stats: Optional[Dict[str, int]] = None,
+    doc: Optional["fitz.Document"] = None,
+) -> List[Page]:
     """Append detected tables and flag table-like blocks on provided pages.
 
     Args:
-        path: Path to the source PDF (used for pdfplumber extraction).
+        path: Path to the source PDF (used for pdfplumber extraction); may be
+            ``None`` when ``data`` is given.
         pages: Parsed pages from PyMuPDF.
+        data: Optional in-memory content of ``path`` shared with other stages.
+        prescreen: Optional pre-screen; only candidate pages go to pdfplumber.
+        stats: Optional dict updated with ``pages_total``, ``pages_screened``
+            (sent to pdfplumber) and ``pages_skipped``.
+        doc: Optional already-open PyMuPDF document reused by the pre-screen.
 
     Returns:
         Pages enriched with table blocks.
     """
-    plumber_tables = extract_pdf_tables(path)
-    tables_by_page: Dict[int, List[BlockDict]] = {}
-    for table in plumber_tables:
-        tables_by_page.setdefault(table["page_number"], []).append(table["block"])
+    candidates: Optional[Set[int]] = None
+    if prescreen is not None and pdfplumber is not None:
+        candidates = table_candidate_pages(path, pages, prescreen, data=data, doc=doc)
+    tables = tables_by_page(path, data=data, page_numbers=candidates)
+
+    screened = len(pages) if candidates is None else len(candidates)
+    logger.debug("Table detection: %d/%d pages sent to pdfplumber", screened, len(pages))
+    if stats is not None:
+        stats["pages_total"] = stats.get("pages_total", 0) + len(pages)
+        stats["pages_screened"] = stats.get("pages_screened", 0) + screened
+        stats["pages_skipped"] = stats.get("pages_skipped", 0) + len(pages) - screened
 
-    enriched_pages: List[PageDict] = []
+    enriched_pages: List[Page] = []
     for page in pages:
-        page_number = page.get("page_number")
-        blocks = flag_table_like_blocks(list(page.get("blocks", [])))
-        for table_block in tables_by_page.get(page_number, []):
+        blocks = flag_table_like_blocks(list(page.blocks))
+        for table_block in tables.get(page.page_number, []):
             blocks.append(table_block)
-        enriched_pages.append({"page_number": page_number, "blocks": blocks})
+        enriched_pages.append(Page(page_number=page.page_number, blocks=blocks))
 
     return enriched_pages
 
 
-__all__ = ["extract_pdf_tables", "table_to_block", "flag_table_like_blocks", "integrate_tables"]
+def _count_ruling_lines(page: "fitz.Page", stop_at: Optional[int] = None) -> int:
+    """Count horizontal/vertical rules in the page drawings.
+
+    Only line segments and thin rectangles count: a filled or framed box
+    (shaded header, callout) is not a table rule.
+    """
+    count = 0
+    for drawing in page.get_drawings():
+        for item in drawing.get("items", []):
+            kind = item[0]
+            if kind == "l":
+                p1, p2 = item[1], item[2]
+                if abs(p1.y - p2.y) <= _RULING_TOLERANCE or abs(p1.x - p2.x) <= _RULING_TOLERANCE:
+                    count += 1
+            elif kind == "re":
+                rect = item[1]
+                if rect.height <= _RULING_TOLERANCE or rect.width <= _RULING_TOLERANCE:
+                    count += 1
+            if stop_at is not None and count >= stop_at:
+                return count
+    return count
+
+
+__all__ = [
+    "TablePrescreenConfig",
+    "extract_pdf_tables",
+    "table_to_block",
+    "flag_table_like_blocks",
+    "is_table_candidate_page",
+    "table_candidate_pages",
+    "tables_by_page",
+    "integrate_tables",
+]
@@ -3,14 +3,19 @@
 from __future__ import annotations
 
 import uuid
+from dataclasses import asdict
 from pathlib import Path
 from threading import Lock
-from typing import Any, Dict, List, Optional, Sequence, Union
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 from src.core.ingestion.core import heading_detection, lang_detect, ocr, parser_docx, parser_pdf
-from src.core.ingestion.core.file_utils import temporary_directory
+from src.core.ingestion.core.file_utils import FileBuffer, read_file_buffer
+from src.core.ingestion.core.metrics import NULL_RECORDER, MetricsSink, NullMetricsSink, StageRecorder
+from src.core.ingestion.core.models import Block, Page, pages_from_dicts, pages_to_dicts
+from src.core.ingestion.core.table_detection import TablePrescreenConfig
+from src.core.ingestion.core.parse_cache import DEFAULT_CACHE_MAX_BYTES, ParseCache, cache_key, hash_bytes
 
-PageDict = Dict[str, Any]
+OCR_MODES = ("document", "pages")
 
 
 class IngestionService:
@@ -28,6 +33,31 @@ class IngestionService:
         ocr_text_threshold: Minimum pre-existing text length before skipping OCR.
         detect_headings: Whether to classify heading-like blocks on PDFs.
         detect_tables: Whether to detect tables via pdfplumber/heuristics.
+        pdf_workers: Worker processes for PDF layout extraction; values above 1
+            enable the page-parallel mode (output is identical to the serial one).
+        cache_dir: Optional directory for the content-addressed parse cache;
+            when set, re-parsing identical bytes with the same configuration
+            returns the stored pages/language without opening the file.
+        cache_max_bytes: Size bound of the parse cache (LRU eviction).
+        ocr_mode: ``"document"`` runs ocrmypdf on the whole file when it has
+            little text overall; ``"pages"`` OCRs only the pages detected as
+            scanned, in parallel, and merges their text into the layout.
+        ocr_workers: Maximum concurrent ocrmypdf processes in ``"pages"`` mode.
+        ocr_fast: Skip deskew and ``--optimize 3`` when running ocrmypdf.
+        ocr_store_dir: Optional directory of the ``OcrStore``; OCR then runs per
+            page and pages with already-seen rendered content reuse their text
+            layer (in ``"document"`` mode every page of a scanned file goes
+            through the store instead of a single whole-file ocrmypdf run).
+        table_prescreen: Pre-screen thresholds selecting the pages sent to
+            pdfplumber; ``None`` runs pdfplumber on every page.
+        collect_metrics: Record wall/CPU time, pages and blocks per stage
+            (``hash``, ``cache``, ``layout``, ``ocr``, ``headings``, ``tables``,
+            ``boilerplate``, ``language``); the report is attached to the
+            ``parse_document`` result as ``"metrics"`` and sent to
+            ``metrics_sink``. When disabled no clock is read.
+        trace_memory: Also record the tracemalloc peak of each stage (slow).
+        metrics_sink: Destination of the per-document reports; defaults to
+            ``NullMetricsSink``.
     """
 
     def __init__(
@@ -38,12 +68,39 @@ class IngestionService:
         ocr_text_threshold: int = 200,
         detect_headings: bool = True,
         detect_tables: bool = True,
+        pdf_workers: int = 1,
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        ocr_mode: str = "document",
+        ocr_workers: int = ocr.DEFAULT_OCR_WORKERS,
+        ocr_fast: bool = False,
+        ocr_store_dir: Optional[str] = None,
+        table_prescreen: Optional[TablePrescreenConfig] = TablePrescreenConfig(),
+        collect_metrics: bool = False,
+        trace_memory: bool = False,
+        metrics_sink: Optional[MetricsSink] = None,
     ) -> None:
+        if pdf_workers <= 0:
+            raise ValueError("pdf_workers must be positive")
+        if ocr_mode not in OCR_MODES:
+            raise ValueError(f"ocr_mode must be one of {OCR_MODES}, got {ocr_mode!r}")
         self.lang_model_path = lang_model_path
         self.enable_ocr = enable_ocr
         self.ocr_text_threshold = ocr_text_threshold
         self.detect_headings = detect_headings
         self.detect_tables = detect_tables
+        self.pdf_workers = pdf_workers
+        self.ocr_mode = ocr_mode
+        self.ocr_workers = ocr_workers
+        self.ocr_fast = ocr_fast
+        self.table_prescreen = table_prescreen
+        self.collect_metrics = collect_metrics
+        self.trace_memory = trace_memory
+        self.metrics_sink: MetricsSink = metrics_sink or NullMetricsSink()
+        self.ocr_store: Optional[ocr.OcrStore] = ocr.OcrStore(ocr_store_dir) if ocr_store_dir else None
+        self.parse_cache: Optional[ParseCache] = (
+            ParseCache(cache_dir, max_bytes=cache_max_bytes) if cache_dir else None
+        )
 
     # --- Singleton support ---
     _singleton: Optional["IngestionService"] = None
@@ -59,6 +116,17 @@ class IngestionService:
         ocr_text_threshold: int = 200,
         detect_headings: bool = True,
         detect_tables: bool = True,
+        pdf_workers: int = 1,
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        ocr_mode: str = "document",
+        ocr_workers: int = ocr.DEFAULT_OCR_WORKERS,
+        ocr_fast: bool = False,
+        ocr_store_dir: Optional[str] = None,
+        table_prescreen: Optional[TablePrescreenConfig] = TablePrescreenConfig(),
+        collect_metrics: bool = False,
+        trace_memory: bool = False,
+        metrics_sink: Optional[MetricsSink] = None,
     ) -> "IngestionService":
         """Return a process-wide singleton instance with the given configuration.
 
@@ -72,6 +140,17 @@ class IngestionService:
                 "ocr_text_threshold": ocr_text_threshold,
                 "detect_headings": detect_headings,
                 "detect_tables": detect_tables,
+                "pdf_workers": pdf_workers,
+                "cache_dir": cache_dir,
+                "cache_max_bytes": cache_max_bytes,
+                "ocr_mode": ocr_mode,
+                "ocr_workers": ocr_workers,
+                "ocr_fast": ocr_fast,
+                "ocr_store_dir": ocr_store_dir,
+                "table_prescreen": table_prescreen,
+                "collect_metrics": collect_metrics,
+                "trace_memory": trace_memory,
+                "metrics_sink": metrics_sink,
             }
             if cls._singleton is not None:
                 if config != cls._singleton_config:
@@ -92,69 +171,274 @@ class IngestionService:
             cls._singleton_config = None
 
     def parse_document(self, path: Union[str, Path], doc_id: Optional[str] = None) -> Dict[str, Any]:
-        """Parse a PDF or DOCX and return a structured representation."""
+        """Parse a PDF or DOCX and return a structured representation.
+
+        The file is read once (memory-mapped when large, see
+        ``file_utils.read_file_buffer``) and every stage works on that buffer.
+        The result carries the SHA-256 of the bytes as ``content_hash``, the
+        document hash expected by ``DynamicChunker`` for stable chunk ids, and
+        for freshly parsed PDFs with table detection the table page counters
+        as ``table_stats`` (``pages_total``, ``pages_screened``, ``pages_skipped``).
+        """
         source_path = Path(path)
         if not source_path.exists():
             raise FileNotFoundError(f"File not found at {source_path}")
 
-        ext = source_path.suffix.lower()
-        if ext == ".pdf":
-            pages = self._parse_pdf_with_optional_ocr(source_path)
-        elif ext == ".docx":
-            pages = self._parse_docx(source_path)
-        else:
-            raise ValueError(f"Unsupported file type: {ext}")
+        ext = _supported_extension(source_path.name)
+        with read_file_buffer(source_path) as data:
+            return self._parse_buffer(data, ext, source_path.name, doc_id, source_path=source_path)
+
+    def parse_bytes(
+        self,
+        data: Union[bytes, bytearray, memoryview, BinaryIO],
+        filename: str,
+        doc_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Parse an in-memory PDF or DOCX, e.g. an API upload, without writing it to disk.
 
-        language = self.detect_language_from_pages(pages)
+        Args:
+            data: File content, or a binary file-like object read to the end.
+            filename: Original file name; its extension selects the parser.
+            doc_id: Optional document id; a random UUID is used when omitted.
 
-        return {
+        Returns:
+            The same structure as ``parse_document``.
+        """
+        ext = _supported_extension(filename)
+        content = data.read() if hasattr(data, "read") else data
+        if not isinstance(content, bytes):
+            content = bytes(content)
+        return self._parse_buffer(content, ext, Path(filename).name, doc_id)
+
+    def _parse_buffer(
+        self,
+        data: FileBuffer,
+        ext: str,
+        filename: str,
+        doc_id: Optional[str],
+        *,
+        source_path: Optional[Path] = None,
+    ) -> Dict[str, Any]:
+        recorder = StageRecorder(trace_memory=self.trace_memory) if self.collect_metrics else NULL_RECORDER
+        table_stats: Dict[str, int] = {}
+        try:
+            key: Optional[str] = None
+            cached: Optional[Dict[str, Any]] = None
+            with recorder.stage("hash"):
+                content_hash = hash_bytes(data)
+            if self.parse_cache is not None:
+                with recorder.stage("cache"):
+                    key = cache_key(content_hash, self._cache_config(ext))
+                    cached = self.parse_cache.get(key)
+
+            if cached is not None:
+                pages = pages_from_dicts(cached["pages"])
+                language = cached["language"]
+            else:
+                if ext == ".pdf":
+                    pages = self._parse_pdf_with_optional_ocr(
+                        data, source_path, recorder=recorder, table_stats=table_stats
+                    )
+                else:
+                    with recorder.stage("layout") as stage:
+                        pages = self._parse_docx(data)
+                        stage.record(pages)
+                with recorder.stage("language"):
+                    language = self.detect_language_from_pages(pages)
+                if self.parse_cache is not None and key is not None:
+                    with recorder.stage("cache"):
+                        self.parse_cache.put(key, {"pages": pages_to_dicts(pages), "language": language})
+        finally:
+            recorder.close()
+
+        result: Dict[str, Any] = {
             "doc_id": doc_id or str(uuid.uuid4()),
-            "filename": source_path.name,
+            "filename": filename,
+            "content_hash": content_hash,
             "language": language,
             "pages": pages,
         }
-
-    def _parse_pdf_with_optional_ocr(self, pdf_path: Path) -> List[PageDict]:
-        """Parse a PDF, running OCR first if the document is mostly images."""
-        if not self.enable_ocr:
-            return parser_pdf.parse_pdf(
-                pdf_path,
-                detect_headings=self.detect_headings,
-                detect_tables=self.detect_tables,
+        if table_stats:
+            result["table_stats"] = table_stats
+        if recorder.enabled:
+            metrics = recorder.report()
+            result["metrics"] = metrics
+            self.metrics_sink.emit(
+                {"doc_id": result["doc_id"], "filename": filename, "cache_hit": cached is not None, **metrics}
             )
+        return result
 
-        with temporary_directory() as tmp_dir:
-            ocr_output = tmp_dir / f"ocr_{pdf_path.name}"
-            needs_ocr = ocr.ocr_if_needed(
-                pdf_path,
-                ocr_output,
-                text_threshold=self.ocr_text_threshold,
-                force=False,
+    def iter_pages(self, path: Union[str, Path]) -> Iterator[Page]:
+        """Yield parsed pages incrementally instead of materialising the document.
+
+        Streaming counterpart of ``parse_document`` for very large PDFs: pages
+        come from ``parser_pdf.iter_pdf_pages`` and can be fed directly to
+        ``DynamicChunker.build_chunks``. OCR follows the same decision as
+        ``parse_document`` (``_plan_ocr``: ``ocr_mode``, ``OcrStore``, text
+        threshold) on a single open handle, so both return the same pages;
+        only the OCR'd pages' blocks are held in memory. Language detection
+        and the parse cache need the full document and are therefore not
+        applied here.
+        """
+        source_path = Path(path)
+        if not source_path.exists():
+            raise FileNotFoundError(f"File not found at {source_path}")
+
+        ext = _supported_extension(source_path.name)
+        if ext == ".docx":
+            with read_file_buffer(source_path) as data:
+                yield from self._parse_docx(data)
+            return
+
+        doc = parser_pdf.open_pdf(source_path)
+        try:
+            ocr_targets, whole_file = self._plan_ocr(
+                doc, source_path, lambda: parser_pdf.has_layout_text(doc, self.ocr_text_threshold)
             )
-            target_path = ocr_output if needs_ocr else pdf_path
+            if not whole_file:
+                yield from parser_pdf.iter_pdf_pages(
+                    source_path,
+                    detect_headings=self.detect_headings,
+                    detect_tables=self.detect_tables,
+                    table_prescreen=self.table_prescreen,
+                    doc=doc,
+                    page_blocks=self._ocr_pages(doc, source_path, ocr_targets) if ocr_targets else None,
+                )
+                return
+        finally:
+            doc.close()
+
+        yield from parser_pdf.iter_pdf_pages(
+            None,
+            detect_headings=self.detect_headings,
+            detect_tables=self.detect_tables,
+            data=ocr.ocrmypdf_to_bytes(source_path, fast=self.ocr_fast),
+            table_prescreen=self.table_prescreen,
+        )
+
+    def _cache_config(self, ext: str) -> Dict[str, Any]:
+        """Parse settings that influence the output, used in the cache key."""
+        return {
+            "ext": ext,
+            "enable_ocr": self.enable_ocr,
+            "ocr_text_threshold": self.ocr_text_threshold,
+            "ocr_mode": self.ocr_mode,
+            "ocr_fast": self.ocr_fast,
+            # With a store, "document" mode OCRs page by page instead of the whole file.
+            "ocr_store": self.ocr_store is not None,
+            "detect_headings": self.detect_headings,
+            "detect_tables": self.detect_tables,
+            "table_prescreen": asdict(self.table_prescreen) if self.table_prescreen else None,
+            "lang_model_path": self.lang_model_path,
+        }
+
+    def _parse_pdf_with_optional_ocr(
+        self,
+        data: FileBuffer,
+        pdf_path: Optional[Path] = None,
+        *,
+        recorder: Optional[StageRecorder] = None,
+        table_stats: Optional[Dict[str, int]] = None,
+    ) -> List[Page]:
+        """Parse a PDF, running OCR on scanned content when enabled.
+
+        The document is opened once from ``data``: the same handle serves the
+        layout pass, the OCR checks and the table pre-screen, the same buffer
+        feeds pdfplumber, and the layout pass doubles as the text-density
+        check, so OCR is decided without another full ``get_text`` sweep. In
+        ``"pages"`` mode only the scanned pages are OCR'd and merged back into
+        the layout. ``pdf_path`` is only needed for parallel layout extraction
+        and lets whole-file ocrmypdf read the original file instead of stdin;
+        the OCR output itself is parsed in memory.
+        """
+        stages = recorder if recorder is not None else NULL_RECORDER
+        doc = parser_pdf.open_pdf(pdf_path, data=data)
+        ocr_doc = None
+        try:
+            with stages.stage("layout") as stage:
+                layout = parser_pdf.extract_pdf_layout(pdf_path, workers=self.pdf_workers, doc=doc)
+                stage.record(layout)
+            with stages.stage("ocr") as stage:
+                ocr_targets, whole_file = self._plan_ocr(
+                    doc, pdf_path, lambda: parser_pdf.layout_text_length(layout) >= self.ocr_text_threshold
+                )
+                if ocr_targets:
+                    layout = ocr.merge_ocr_pages(layout, self._ocr_pages(doc, pdf_path, ocr_targets))
+                    stage.record(layout)
+                if whole_file:
+                    data = ocr.ocrmypdf_to_bytes(pdf_path if pdf_path is not None else data, fast=self.ocr_fast)
+                    pdf_path = None
+                    ocr_doc = parser_pdf.open_pdf(None, data=data)
+                    layout = parser_pdf.extract_pdf_layout(None, doc=ocr_doc)
+                    stage.record(layout)
 
             return parser_pdf.parse_pdf(
-                target_path,
+                pdf_path,
                 detect_headings=self.detect_headings,
                 detect_tables=self.detect_tables,
+                doc=ocr_doc if ocr_doc is not None else doc,
+                layout=layout,
+                data=data,
+                table_prescreen=self.table_prescreen,
+                table_stats=table_stats,
+                recorder=recorder,
             )
+        finally:
+            if ocr_doc is not None:
+                ocr_doc.close()
+            doc.close()
 
-    def _parse_docx(self, docx_path: Path) -> List[PageDict]:
-        """Parse DOCX into a single-page layout with blocks and tables."""
-        parsed = parser_docx.parse_docx(docx_path)
+    def _plan_ocr(
+        self,
+        doc: Any,
+        pdf_path: Optional[Path],
+        has_text: Callable[[], bool],
+    ) -> Tuple[List[int], bool]:
+        """Decide how to OCR an open PDF: pages to OCR one by one, or the whole file.
+
+        ``"pages"`` mode OCRs the pages detected as scanned. ``"document"``
+        mode OCRs only when the layout text is below ``ocr_text_threshold``
+        (``has_text`` is evaluated lazily): every page through the
+        ``OcrStore`` when one is configured, otherwise the whole file with a
+        single ocrmypdf run.
+        """
+        if not self.enable_ocr:
+            return [], False
+        if self.ocr_mode == "pages":
+            return ocr.scanned_page_numbers(pdf_path, doc=doc), False
+        if has_text():
+            return [], False
+        if self.ocr_store is not None:
+            return list(range(1, doc.page_count + 1)), False
+        return [], True
+
+    def _ocr_pages(self, doc: Any, pdf_path: Optional[Path], page_numbers: List[int]) -> Dict[int, List[Block]]:
+        return ocr.ocr_pages(
+            pdf_path,
+            page_numbers,
+            workers=self.ocr_workers,
+            fast=self.ocr_fast,
+            doc=doc,
+            store=self.ocr_store,
+        )
+
+    def _parse_docx(self, data: FileBuffer) -> List[Page]:
+        """Parse DOCX content into a single-page layout with blocks and tables."""
+        parsed = parser_docx.parse_docx(None, data=data)
         blocks = list(parsed.get("blocks", [])) + list(parsed.get("tables", []))
-        return [{"page_number": 1, "blocks": blocks}]
+        return [Page(page_number=1, blocks=blocks)]
 
-    def detect_language_from_pages(self, pages: Sequence[PageDict]) -> str:
+    def detect_language_from_pages(self, pages: Sequence[Page]) -> str:
         """Run language detection over aggregated page text."""
-        texts: List[str] = []
-        for page in pages:
-            for block in page.get("blocks", []):
-                text = block.get("text")
-                if isinstance(text, str):
-                    texts.append(text)
-        combined = "\n".join(texts)
+        combined = "\n".join(block.text for page in pages for block in page.blocks)
         return lang_detect.detect_language(combined, model_path=self.lang_model_path)
 
 
+def _supported_extension(filename: str) -> str:
+    ext = Path(filename).suffix.lower()
+    if ext not in (".pdf", ".docx"):
+        raise ValueError(f"Unsupported file type: {ext}")
+    return ext
+
+
 __all__ = ["IngestionService"]
@@ -0,0 +1,17 @@
+"""Background ingestion jobs with persistent state."""
+
+from .manager import STAGES, IngestionJobManager, StageConcurrency
+from .store import JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JOB_STATUSES, JOB_SUCCEEDED, JobRecord, JobStore
+
+__all__ = [
+    "IngestionJobManager",
+    "StageConcurrency",
+    "STAGES",
+    "JobRecord",
+    "JobStore",
+    "JOB_QUEUED",
+    "JOB_RUNNING",
+    "JOB_SUCCEEDED",
+    "JOB_FAILED",
+    "JOB_STATUSES",
+]
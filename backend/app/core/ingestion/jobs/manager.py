@@ -0,0 +1,389 @@
+"""Background ingestion jobs: parse → chunk → index on bounded worker pools."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Condition, Lock
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from src.core.chunking.chunking import TokenChunker
+from src.core.chunking.dynamic_chunker import DynamicChunker
+from src.core.index.tender_indexer import TenderMilvusIndexer
+from src.core.ingestion.core.file_utils import atomic_write_bytes, atomic_write_stream
+from src.core.ingestion.ingestion_service import IngestionService
+from src.core.ingestion.jobs.store import (
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    JobRecord,
+    JobStore,
+)
+from src.schemas.chunking import TokenChunk
+
+logger = logging.getLogger(__name__)
+
+FilePath = Union[str, Path]
+
+STAGES = ("parse", "chunk", "index")
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+DEFAULT_PARSE_WORKERS = int(os.getenv("INGESTION_JOBS_PARSE_WORKERS", "2"))
+DEFAULT_CHUNK_WORKERS = int(os.getenv("INGESTION_JOBS_CHUNK_WORKERS", "2"))
+DEFAULT_INDEX_WORKERS = int(os.getenv("INGESTION_JOBS_INDEX_WORKERS", "1"))
+
+
+@dataclass(frozen=True)
+class StageConcurrency:
+    """Worker threads per pipeline stage.
+
+    Parsing is CPU/IO bound (PyMuPDF, pdfplumber and ocrmypdf release the GIL
+    for most of their work), indexing is bound by the embedding backend and
+    Milvus, so the pools are sized independently.
+    """
+
+    parse: int = DEFAULT_PARSE_WORKERS
+    chunk: int = DEFAULT_CHUNK_WORKERS
+    index: int = DEFAULT_INDEX_WORKERS
+
+    def __post_init__(self) -> None:
+        if min(self.parse, self.chunk, self.index) <= 0:
+            raise ValueError("Stage concurrency values must be positive")
+
+
+class IngestionJobManager:
+    """Run uploaded documents through the ingestion pipeline in the background.
+
+    Each job goes through three stages, each on its own bounded thread pool:
+    ``parse`` (``IngestionService.parse_document``), ``chunk``
+    (``DynamicChunker`` with content-derived ids, then ``TokenChunker``) and
+    ``index`` (``TenderMilvusIndexer.upsert_token_chunks`` skipping ids already
+    stored, so re-submitting a file embeds nothing; rows are stamped with the
+    upload's content hash as ``document_key``, reported in the job result).
+    A job submitted with a
+    ``document_key`` instead runs ``TenderMilvusIndexer.reindex_document``: the
+    previous version of that document is replaced, re-embedding only the
+    chunks whose content changed. Job state is persisted in a
+    ``JobStore`` after every transition, so ``resume`` can re-queue the jobs
+    that were queued or running when the process stopped.
+
+    Args:
+        store: Persistent job store.
+        ingestion: Service used by the parse stage.
+        upload_dir: Directory keeping submitted files until their job succeeds
+            (and across restarts).
+        chunker: Structural chunker; defaults to ``DynamicChunker(allow_preamble=True)``.
+        token_chunker: Token chunker; defaults to ``TokenChunker()``.
+        indexer_factory: Zero-argument callable returning the indexer, called
+            lazily by the first index stage. Without it the index stage is
+            skipped and jobs succeed after chunking.
+        concurrency: Worker threads per stage.
+        keep_uploads: Keep the stored file after a job succeeds.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        *,
+        ingestion: IngestionService,
+        upload_dir: FilePath,
+        chunker: Optional[DynamicChunker] = None,
+        token_chunker: Optional[TokenChunker] = None,
+        indexer_factory: Optional[Callable[[], TenderMilvusIndexer]] = None,
+        concurrency: StageConcurrency = StageConcurrency(),
+        keep_uploads: bool = False,
+    ) -> None:
+        self.store = store
+        self.ingestion = ingestion
+        self.upload_dir = Path(upload_dir)
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self.chunker = chunker or DynamicChunker(allow_preamble=True)
+        self.token_chunker = token_chunker or TokenChunker()
+        self.indexer_factory = indexer_factory
+        self.concurrency = concurrency
+        self.keep_uploads = keep_uploads
+        self._indexer: Optional[TenderMilvusIndexer] = None
+        self._indexer_lock = Lock()
+        self._updated = Condition()
+        # Async waiters per job: woken from worker threads without parking a thread each.
+        self._async_waiters: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+        self._closed = False
+        self._pools: Dict[str, ThreadPoolExecutor] = {
+            stage: ThreadPoolExecutor(max_workers=getattr(concurrency, stage), thread_name_prefix=f"ingest-{stage}")
+            for stage in STAGES
+        }
+
+    # --- Public API ---
+
+    def submit(self, data: Union[bytes, BinaryIO], filename: str, *, document_key: Optional[str] = None) -> JobRecord:
+        """Store an upload, create its job and queue the parse stage.
+
+        ``data`` is the file content or a binary file object, copied to
+        ``upload_dir`` in chunks (blocking: call it from a worker thread).
+        With ``document_key`` the upload is a new version of that document
+        and replaces the rows previously indexed under the same key.
+
+        Raises:
+            ValueError: If the file type is not supported.
+            RuntimeError: If the manager has been shut down.
+        """
+        name = Path(filename).name
+        ext = Path(name).suffix.lower()
+        if ext not in SUPPORTED_EXTENSIONS:
+            raise ValueError(f"Unsupported file type: {ext}")
+        if self._closed:
+            raise RuntimeError("IngestionJobManager is shut down")
+        job_id = str(uuid.uuid4())
+        destination = self.upload_dir / f"{job_id}{ext}"
+        if isinstance(data, (bytes, bytearray)):
+            source_path = atomic_write_bytes(data, destination)
+        else:
+            source_path = atomic_write_stream(data, destination)
+        record = self.store.create(name, source_path, job_id=job_id, document_key=document_key or None)
+        self._schedule("parse", record.id)
+        return record
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        return self.store.get(job_id)
+
+    def list(self, *, statuses: Optional[List[str]] = None, limit: int = 100) -> List[JobRecord]:
+        return self.store.list(statuses=statuses, limit=limit)
+
+    def wait_for_update(self, job_id: str, after_version: int, timeout: float = 15.0) -> Optional[JobRecord]:
+        """Block until the job's ``version`` exceeds ``after_version`` or ``timeout`` expires.
+
+        Returns the current record in both cases (``None`` for unknown jobs),
+        so callers compare versions to tell a change from a timeout.
+        """
+        deadline = time.monotonic() + timeout
+        with self._updated:
+            while True:
+                record = self.store.get(job_id)
+                remaining = deadline - time.monotonic()
+                if record is None or record.version > after_version or record.finished or remaining <= 0:
+                    return record
+                self._updated.wait(remaining)
+
+    async def await_update(self, job_id: str, after_version: int, timeout: float = 15.0) -> Optional[JobRecord]:
+        """Async ``wait_for_update``: waits on an ``asyncio.Event`` instead of a thread."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            event = asyncio.Event()
+            waiter = (loop, event)
+            with self._updated:
+                self._async_waiters.setdefault(job_id, set()).add(waiter)
+            try:
+                # Read after registering, so an update in between still sets the event.
+                record = self.store.get(job_id)
+                remaining = deadline - loop.time()
+                if record is None or record.version > after_version or record.finished or remaining <= 0 or self._closed:
+                    return record
+                try:
+                    await asyncio.wait_for(event.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+            finally:
+                with self._updated:
+                    waiters = self._async_waiters.get(job_id)
+                    if waiters is not None:
+                        waiters.discard(waiter)
+                        if not waiters:
+                            del self._async_waiters[job_id]
+
+    def resume(self) -> int:
+        """Re-queue jobs left queued or running by a previous process; returns their count.
+
+        Intermediate results are not persisted, so resumed jobs restart from
+        the parse stage (indexing is an upsert, hence idempotent).
+        """
+        pending = self.store.list(statuses=(JOB_QUEUED, JOB_RUNNING), limit=1_000_000)
+        for record in reversed(pending):
+            if not Path(record.source_path).exists():
+                self._fail(record.id, record.stage or "parse", f"Uploaded file missing: {record.source_path}")
+                continue
+            self._update(record.id, status=JOB_QUEUED, stage="parse", stage_state={"status": JOB_QUEUED})
+            self._schedule("parse", record.id)
+        if pending:
+            logger.info("Resumed %d ingestion jobs", len(pending))
+        return len(pending)
+
+    def shutdown(self, *, wait: bool = True, cancel_pending: bool = False) -> None:
+        """Stop accepting jobs and stop the worker pools.
+
+        With ``wait=True`` and ``cancel_pending=False`` every queued job is
+        drained through all stages. With ``cancel_pending=True`` (or
+        ``wait=False``) queued stages are cancelled; their jobs stay
+        ``queued``/``running`` in the store and are picked up by ``resume``.
+        Only after ``wait=True`` returns is it safe to close the store.
+        """
+        self._closed = True
+        if wait and not cancel_pending:
+            # Stage order: parse workers may still schedule into chunk, and so on.
+            for pool in self._pools.values():
+                pool.shutdown(wait=True)
+        else:
+            for pool in self._pools.values():
+                pool.shutdown(wait=False, cancel_futures=True)
+            if wait:
+                for pool in self._pools.values():
+                    pool.shutdown(wait=True)
+        with self._updated:
+            self._updated.notify_all()
+            waiters = [waiter for job_waiters in self._async_waiters.values() for waiter in job_waiters]
+        self._wake(waiters)
+
+    # --- Stages ---
+
+    def _run_parse(self, job_id: str) -> None:
+        record = self.store.get(job_id)
+        if record is None:
+            return
+        with self._stage(job_id, "parse") as state:
+            parsed = self.ingestion.parse_document(record.source_path, doc_id=job_id)
+            pages = parsed["pages"]
+            state.update(pages=len(pages), blocks=sum(len(page.blocks) for page in pages), language=parsed["language"])
+        if state.ok:
+            self._schedule("chunk", job_id, parsed)
+
+    def _run_chunk(self, job_id: str, parsed: Dict[str, Any]) -> None:
+        with self._stage(job_id, "chunk") as state:
+            chunks = self.chunker.build_chunks(parsed["pages"], document_hash=parsed["content_hash"])
+            token_chunks = self.token_chunker.chunk(chunks)
+            state.update(chunks=len(chunks), token_chunks=len(token_chunks))
+        if not state.ok:
+            return
+        summary = {
+            "doc_id": parsed["doc_id"],
+            "filename": parsed["filename"],
+            "content_hash": parsed["content_hash"],
+            "language": parsed["language"],
+            "pages": len(parsed["pages"]),
+            "chunks": len(chunks),
+            "token_chunks": len(token_chunks),
+        }
+        if self.indexer_factory is None:
+            self._succeed(job_id, summary)
+        else:
+            self._schedule("index", job_id, token_chunks, summary)
+
+    def _run_index(self, job_id: str, token_chunks: List[TokenChunk], summary: Dict[str, Any]) -> None:
+        record = self.store.get(job_id)
+        if record is None:
+            return
+        with self._stage(job_id, "index") as state:
+            indexer = self._get_indexer()
+            if record.document_key:
+                report = indexer.reindex_document(record.document_key, token_chunks)
+                counts = {
+                    "embedded": report.embedded,
+                    "reused": report.reused,
+                    "deduplicated": report.deduplicated,
+                    "deleted": report.deleted,
+                }
+            else:
+                # Unique to this content: filenames collide across unrelated documents, and
+                # a shared key would let reindex_document delete another document's rows.
+                document_key = summary["content_hash"]
+                report = indexer.upsert_token_chunks(token_chunks, skip_existing=True, document_key=document_key)
+                counts = {
+                    "document_key": document_key,
+                    "embedded": report.embedded,
+                    "skipped": report.skipped,
+                    "deduplicated": report.deduplicated,
+                }
+            state.update(collection=indexer.collection_name, **report.to_dict())
+        if state.ok:
+            self._succeed(job_id, {**summary, **counts})
+
+    # --- Internal helpers ---
+
+    def _schedule(self, stage: str, job_id: str, *args: Any) -> None:
+        if stage != "parse":
+            self._update(job_id, stage=stage, stage_state={"status": JOB_QUEUED})
+        runner = getattr(self, f"_run_{stage}")
+        try:
+            self._pools[stage].submit(runner, job_id, *args)
+        except RuntimeError:
+            # Pool shut down: the job stays pending in the store for ``resume``.
+            logger.info("Ingestion job %s not scheduled (%s): manager is shut down", job_id, stage)
+
+    def _stage(self, job_id: str, stage: str) -> "_StageRun":
+        return _StageRun(self, job_id, stage)
+
+    def _get_indexer(self) -> TenderMilvusIndexer:
+        with self._indexer_lock:
+            if self._indexer is None:
+                assert self.indexer_factory is not None
+                self._indexer = self.indexer_factory()
+            return self._indexer
+
+    def _succeed(self, job_id: str, result: Dict[str, Any]) -> None:
+        record = self._update(job_id, status=JOB_SUCCEEDED, result=result)
+        if not self.keep_uploads:
+            Path(record.source_path).unlink(missing_ok=True)
+
+    def _fail(self, job_id: str, stage: str, error: str, **stage_state: Any) -> None:
+        stage_state["status"] = JOB_FAILED
+        self._update(job_id, status=JOB_FAILED, stage=stage, stage_state=stage_state, error=error)
+
+    def _update(self, job_id: str, **changes: Any) -> JobRecord:
+        record = self.store.update(job_id, **changes)
+        with self._updated:
+            self._updated.notify_all()
+            waiters = list(self._async_waiters.get(job_id, ()))
+        self._wake(waiters)
+        return record
+
+    @staticmethod
+    def _wake(waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]) -> None:
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # Loop already closed: its waiter is gone with it.
+                pass
+
+
+class _StageRun:
+    """Context manager marking a job stage running, then done or failed.
+
+    Exceptions raised by the stage are recorded on the job and swallowed, so
+    worker threads never die; ``ok`` tells the caller whether to continue.
+    """
+
+    def __init__(self, manager: IngestionJobManager, job_id: str, stage: str) -> None:
+        self.manager = manager
+        self.job_id = job_id
+        self.stage = stage
+        self.ok = False
+        self._state: Dict[str, Any] = {}
+
+    def update(self, **values: Any) -> None:
+        self._state.update(values)
+
+    def __enter__(self) -> "_StageRun":
+        self._started = time.perf_counter()
+        self.manager._update(self.job_id, status=JOB_RUNNING, stage=self.stage, stage_state={"status": JOB_RUNNING})
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Optional[BaseException], tb: Any) -> bool:
+        seconds = round(time.perf_counter() - self._started, 3)
+        if exc is None:
+            self.ok = True
+            state = {"status": JOB_SUCCEEDED, "seconds": seconds, **self._state}
+            self.manager._update(self.job_id, stage=self.stage, stage_state=state)
+            return False
+        logger.exception("Ingestion job %s failed during %s", self.job_id, self.stage)
+        self.manager._fail(self.job_id, self.stage, f"{type(exc).__name__}: {exc}", seconds=seconds)
+        return True
+
+
+__all__ = ["IngestionJobManager", "StageConcurrency", "STAGES"]
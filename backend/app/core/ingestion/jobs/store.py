@@ -0,0 +1,237 @@
+"""SQLite persistence for background ingestion jobs."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+FilePath = Union[str, Path]
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_STATUSES = (JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, JOB_FAILED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingestion_jobs (
+    id TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    source_path TEXT NOT NULL,
+    document_key TEXT,
+    status TEXT NOT NULL,
+    stage TEXT,
+    stages TEXT NOT NULL DEFAULT '{}',
+    result TEXT,
+    error TEXT,
+    version INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ingestion_jobs_status ON ingestion_jobs (status);
+"""
+
+# Columns added after the first release, created on databases that predate them.
+_MIGRATIONS = {"document_key": "ALTER TABLE ingestion_jobs ADD COLUMN document_key TEXT"}
+
+
+@dataclass
+class JobRecord:
+    """Persisted state of one ingestion job.
+
+    ``stages`` maps each pipeline stage to its state (``status``, ``seconds``
+    and stage-specific counters); ``version`` increases on every update so
+    pollers can wait for changes. ``document_key``, when set, identifies the
+    document across versions: the index stage replaces its previous version.
+    """
+
+    id: str
+    filename: str
+    source_path: str
+    document_key: Optional[str] = None
+    status: str = JOB_QUEUED
+    stage: Optional[str] = None
+    stages: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    version: int = 0
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_SUCCEEDED, JOB_FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Public representation (the stored upload path is omitted)."""
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "document_key": self.document_key,
+            "status": self.status,
+            "stage": self.stage,
+            "stages": self.stages,
+            "result": self.result,
+            "error": self.error,
+            "version": self.version,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+class JobStore:
+    """Thread-safe SQLite store of ``JobRecord`` rows.
+
+    Args:
+        path: SQLite database file, created with its parent directory if
+            missing. ``":memory:"`` keeps jobs in memory (tests only).
+    """
+
+    def __init__(self, path: FilePath) -> None:
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(ingestion_jobs)")}
+            for column, statement in _MIGRATIONS.items():
+                if column not in columns:
+                    self._conn.execute(statement)
+
+    def create(
+        self,
+        filename: str,
+        source_path: FilePath,
+        *,
+        job_id: Optional[str] = None,
+        document_key: Optional[str] = None,
+    ) -> JobRecord:
+        """Insert a new queued job and return it."""
+        now = time.time()
+        record = JobRecord(
+            id=job_id or str(uuid.uuid4()),
+            filename=filename,
+            source_path=str(source_path),
+            document_key=document_key,
+            created_at=now,
+            updated_at=now,
+        )
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO ingestion_jobs"
+                " (id, filename, source_path, document_key, status, stages, version, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, '{}', 0, ?, ?)",
+                (record.id, record.filename, record.source_path, record.document_key, record.status, now, now),
+            )
+        return record
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM ingestion_jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_record(row) if row is not None else None
+
+    def list(self, *, statuses: Optional[Sequence[str]] = None, limit: int = 100) -> List[JobRecord]:
+        """Return jobs, newest first, optionally filtered by status."""
+        query = "SELECT * FROM ingestion_jobs"
+        params: List[Any] = []
+        if statuses:
+            query += f" WHERE status IN ({', '.join('?' for _ in statuses)})"
+            params.extend(statuses)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [_row_to_record(row) for row in rows]
+
+    def update(
+        self,
+        job_id: str,
+        *,
+        status: Optional[str] = None,
+        stage: Optional[str] = None,
+        stage_state: Optional[Dict[str, Any]] = None,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> JobRecord:
+        """Apply a partial update, bump ``version`` and return the new record.
+
+        ``stage_state`` is merged into ``stages[stage]``.
+
+        Raises:
+            KeyError: If the job does not exist.
+        """
+        if status is not None and status not in JOB_STATUSES:
+            raise ValueError(f"Unknown job status: {status}")
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM ingestion_jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                raise KeyError(job_id)
+            record = _row_to_record(row)
+            if status is not None:
+                record.status = status
+            if stage is not None:
+                record.stage = stage
+                if stage_state:
+                    record.stages.setdefault(stage, {}).update(stage_state)
+            if result is not None:
+                record.result = result
+            if error is not None:
+                record.error = error
+            record.version += 1
+            record.updated_at = time.time()
+            self._conn.execute(
+                "UPDATE ingestion_jobs SET status = ?, stage = ?, stages = ?, result = ?, error = ?,"
+                " version = ?, updated_at = ? WHERE id = ?",
+                (
+                    record.status,
+                    record.stage,
+                    json.dumps(record.stages),
+                    json.dumps(record.result) if record.result is not None else None,
+                    record.error,
+                    record.version,
+                    record.updated_at,
+                    record.id,
+                ),
+            )
+        return record
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _row_to_record(row: sqlite3.Row) -> JobRecord:
+    return JobRecord(
+        id=row["id"],
+        filename=row["filename"],
+        source_path=row["source_path"],
+        document_key=row["document_key"],
+        status=row["status"],
+        stage=row["stage"],
+        stages=json.loads(row["stages"] or "{}"),
+        result=json.loads(row["result"]) if row["result"] else None,
+        error=row["error"],
+        version=row["version"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+    )
+
+
+__all__ = [
+    "JobRecord",
+    "JobStore",
+    "JOB_QUEUED",
+    "JOB_RUNNING",
+    "JOB_SUCCEEDED",
+    "JOB_FAILED",
+    "JOB_STATUSES",
+]
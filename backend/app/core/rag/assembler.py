@@ -2,28 +2,72 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
+from src.core.chunking.tokenizers import TokenCountCache, Tokenizer, get_tokenizer
 from src.core.rag.models import RetrievedChunk
 
 
 class ContextAssembler:
-    """Assemble context respecting token budget (approx via word count)."""
+    """Assemble context respecting a token budget measured with ``tokenizer``.
 
-    def __init__(self, max_tokens: int = 2000) -> None:
+    Token counts come, in order of preference, from the chunk's
+    ``metadata["token_count"]`` when it was computed with the same tokenizer
+    at indexing time, from the per-chunk-id ``cache``, or from one batched
+    ``count_batch`` call over the remaining chunks (then cached).
+
+    Args:
+        max_tokens: Context budget.
+        tokenizer: Tokenizer of the generation model; defaults to
+            ``get_tokenizer()`` (``CHUNK_TOKENIZER``, whitespace if unset).
+        cache: Token count cache, shareable between assemblers.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 2000,
+        *,
+        tokenizer: Optional[Tokenizer] = None,
+        cache: Optional[TokenCountCache] = None,
+    ) -> None:
         self.max_tokens = max_tokens
+        self.tokenizer = tokenizer or get_tokenizer()
+        self.cache = cache or TokenCountCache()
 
     def assemble(self, chunks: List[RetrievedChunk]) -> List[RetrievedChunk]:
         """Return a subset of chunks fitting the token budget."""
+        counts = self.token_counts(chunks)
         selected: List[RetrievedChunk] = []
         remaining = self.max_tokens
-        for chunk in chunks:
-            tokens = len(chunk.text.split())
+        for chunk, tokens in zip(chunks, counts):
             if tokens > remaining and selected:
                 break
             selected.append(chunk)
             remaining -= tokens
         return selected
 
+    def token_counts(self, chunks: List[RetrievedChunk]) -> List[int]:
+        """Token count of each chunk, encoding only those not known yet."""
+        name = self.tokenizer.name
+        counts: List[Optional[int]] = []
+        for chunk in chunks:
+            stored = chunk.metadata.get("token_count") if chunk.metadata.get("tokenizer") == name else None
+            counts.append(int(stored) if stored is not None else None)
+
+        cached = self.cache.get_many(name, [c.id for c, n in zip(chunks, counts) if n is None and c.id])
+        missing: List[int] = []
+        for index, chunk in enumerate(chunks):
+            if counts[index] is None:
+                counts[index] = cached.get(chunk.id)
+                if counts[index] is None:
+                    missing.append(index)
+
+        if missing:
+            computed = self.tokenizer.count_batch([chunks[i].text for i in missing])
+            for index, count in zip(missing, computed):
+                counts[index] = count
+            self.cache.put_many(name, {chunks[i].id: counts[i] for i in missing if chunks[i].id})
+        return counts  # type: ignore[return-value]
+
 
 __all__ = ["ContextAssembler"]
@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 
 @dataclass
 class RetrievedChunk:
-    """Chunk retrieved from the vector/keyword store."""
+    """Chunk retrieved from the vector/keyword store.
+
+    ``duplicates`` lists the near-duplicates deduplicated into this chunk
+    (other sections/pages with the same text), as returned by
+    ``TenderMilvusIndexer.search``.
+    """
 
     id: str
     text: str
@@ -17,6 +22,7 @@ class RetrievedChunk:
     page_numbers: List[int]
     source_chunk_id: Optional[str]
     score: float | None = None
+    duplicates: List[Dict[str, Any]] = field(default_factory=list)
 
 
 @dataclass
@@ -52,10 +52,11 @@ class RagPipeline:
             page_numbers=hit.get("page_numbers") or [],
             source_chunk_id=hit.get("source_chunk_id"),
             score=hit.get("score") if isinstance(hit.get("score"), (int, float)) else None,
+            duplicates=list(hit.get("duplicates") or []),
         )
 
     def _generate_answer(self, question: str, chunks: List[RetrievedChunk]) -> str:
-        context_parts = [f"{c.section_path or ''}\n{c.text}" for c in chunks]
+        context_parts = [f"{_section_paths(c)}\n{c.text}" for c in chunks]
         context = "\n\n".join(context_parts)
         prompt = (
             "Sei un assistente per gare e appalti. Rispondi in modo conciso usando solo il contesto fornito.\n"
@@ -67,4 +68,13 @@ class RagPipeline:
         return self.generator_llm.generate(prompt)
 
 
+def _section_paths(chunk: RetrievedChunk) -> str:
+    """Section path of a chunk followed by those of its deduplicated copies."""
+    others = [d.get("section_path") for d in chunk.duplicates if d.get("section_path")]
+    others = [path for path in dict.fromkeys(others) if path != chunk.section_path]
+    if not others:
+        return chunk.section_path or ""
+    return f"{chunk.section_path or ''} (anche in: {'; '.join(others)})"
+
+
 __all__ = ["RagPipeline"]
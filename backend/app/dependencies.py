@@ -1,7 +1,9 @@
 from app.services.relational_db_manager.supabase_service import SupabaseService
 from fastapi import Depends, HTTPException, status, Request
 from jose import jwt, JWTError
+from threading import Lock
 import os
+import sys
 
 SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
 
@@ -13,6 +15,72 @@ def get_supabase_service():
     return _supabase_service
 
 
+# Background ingestion jobs (built on first use: Milvus/embeddings are optional)
+INGESTION_JOBS_DB = os.getenv("INGESTION_JOBS_DB", "data/ingestion_jobs.sqlite3")
+INGESTION_JOBS_DIR = os.getenv("INGESTION_JOBS_DIR", "data/ingestion_uploads")
+INGESTION_EMBEDDING_DIM = int(os.getenv("INGESTION_EMBEDDING_DIM", "768"))
+MILVUS_DEDUP_DB = os.getenv("MILVUS_DEDUP_DB")
+EMBEDDING_CACHE_DB = os.getenv("EMBEDDING_CACHE_DB")
+# Build the manager (and resume pending jobs) at startup instead of on the first request
+INGESTION_JOBS_RESUME_ON_STARTUP = os.getenv("INGESTION_JOBS_RESUME_ON_STARTUP", "0").lower() in ("1", "true", "yes")
+
+_ingestion_job_manager = None
+_ingestion_job_manager_lock = Lock()
+
+def _build_indexer():
+    from src.core.embedding.ollama import OllamaEmbeddingClient
+    from src.core.index.tender_indexer import TenderMilvusIndexer
+    from src.core.index.vector.config import MilvusConfig
+    from src.core.index.vector.service import MilvusService
+
+    embedder = OllamaEmbeddingClient()
+    if EMBEDDING_CACHE_DB:
+        from src.core.embedding.cache import CachedEmbeddingClient, EmbeddingStore
+
+        embedder = CachedEmbeddingClient(embedder, EmbeddingStore(EMBEDDING_CACHE_DB))
+    service = MilvusService(MilvusConfig(uri=os.environ["MILVUS_URI"]))
+    deduplicator = None
+    if MILVUS_DEDUP_DB:
+        from src.core.index.dedup import NearDuplicateDetector, SignatureIndex
+
+        deduplicator = NearDuplicateDetector(SignatureIndex(MILVUS_DEDUP_DB))
+    return TenderMilvusIndexer(service, INGESTION_EMBEDDING_DIM, embedder.embed_batch, deduplicator=deduplicator)
+
+def get_ingestion_job_manager():
+    """Dependency to get the IngestionJobManager instance (indexing enabled when MILVUS_URI is set).
+    Built on first use, which also resumes the jobs left pending by a previous process."""
+    global _ingestion_job_manager
+    with _ingestion_job_manager_lock:
+        if _ingestion_job_manager is None:
+            from src.core.ingestion.ingestion_service import IngestionService
+            from src.core.ingestion.jobs import IngestionJobManager, JobStore
+
+            _ingestion_job_manager = IngestionJobManager(
+                JobStore(INGESTION_JOBS_DB),
+                ingestion=IngestionService.singleton(),
+                upload_dir=INGESTION_JOBS_DIR,
+                indexer_factory=_build_indexer if os.getenv("MILVUS_URI") else None,
+            )
+            _ingestion_job_manager.resume()
+        return _ingestion_job_manager
+
+def shutdown_ingestion_job_manager():
+    global _ingestion_job_manager
+    with _ingestion_job_manager_lock:
+        if _ingestion_job_manager is not None:
+            # Running stages finish (and write their state) before the store closes;
+            # queued ones are cancelled and resumed on the next start.
+            _ingestion_job_manager.shutdown(wait=True, cancel_pending=True)
+            _ingestion_job_manager.store.close()
+            _ingestion_job_manager = None
+
+async def shutdown_embedding_http_pool():
+    """Close the HTTP pool shared by the async embedding clients (no-op if never used)"""
+    http_pool = sys.modules.get("src.core.embedding.http_pool")
+    if http_pool is not None:
+        await http_pool.aclose_shared_async_pool()
+
+
 def get_current_user(request: Request):
     auth_header = request.headers.get("authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 import os
 from dotenv import load_dotenv
@@ -17,14 +18,33 @@ from app.routes.documents import router as documents_router
 from app.routes.ai_outputs import router as ai_outputs_router
 from app.routes.activity_logs import router as activity_logs_router
 from app.routes.courses import router as courses_router
+from app.routes.ingestion_jobs import router as ingestion_jobs_router
+from app.dependencies import (
+    INGESTION_JOBS_RESUME_ON_STARTUP,
+    get_ingestion_job_manager,
+    shutdown_embedding_http_pool,
+    shutdown_ingestion_job_manager,
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Opt-in: riprende subito i job di ingestion rimasti in coda/in esecuzione
+    # (altrimenti il manager viene creato, e i job ripresi, alla prima richiesta)
+    if INGESTION_JOBS_RESUME_ON_STARTUP:
+        get_ingestion_job_manager()
+    yield
+    shutdown_ingestion_job_manager()
+    # Chiude il pool HTTP condiviso dei client di embedding asincroni
+    await shutdown_embedding_http_pool()
 
-app = FastAPI(title="StudIA API", version="0.1.0")
+app = FastAPI(title="StudIA API", version="0.1.0", lifespan=lifespan)
 
 # Include Routers
 app.include_router(documents_router)
 app.include_router(ai_outputs_router)
 app.include_router(activity_logs_router)
 app.include_router(courses_router)
+app.include_router(ingestion_jobs_router)
 
 @app.get("/")
 def read_root():
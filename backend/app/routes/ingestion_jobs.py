@@ -0,0 +1,89 @@
+import json
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.dependencies import get_ingestion_job_manager
+
+router = APIRouter(prefix="/ingestion/jobs", tags=["ingestion"])
+
+class IngestionJob(BaseModel):
+    id: str
+    filename: str
+    document_key: Optional[str] = None
+    status: str
+    stage: Optional[str] = None
+    stages: Dict[str, Dict[str, Any]] = {}
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    version: int
+    created_at: float
+    updated_at: float
+
+@router.post("/", response_model=IngestionJob, status_code=status.HTTP_202_ACCEPTED)
+def submit_ingestion_job(
+    file: UploadFile = File(...),
+    document_key: Optional[str] = Form(None),
+    manager=Depends(get_ingestion_job_manager),
+):
+    """
+    Queue a PDF/DOCX for parsing, chunking and indexing; returns the job to poll.
+    With ``document_key`` the file is a new version of that document and replaces
+    the previous one, re-embedding only the changed chunks.
+    Sync route (runs in the threadpool): the spooled upload is streamed to disk.
+    """
+    try:
+        record = manager.submit(file.file, file.filename or "", document_key=document_key)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(exc))
+    except RuntimeError as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc))
+    return record.to_dict()
+
+@router.get("/", response_model=List[IngestionJob])
+def list_ingestion_jobs(
+    job_status: Optional[List[str]] = Query(None, alias="status"),
+    limit: int = Query(100, ge=1, le=1000),
+    manager=Depends(get_ingestion_job_manager),
+):
+    return [record.to_dict() for record in manager.list(statuses=job_status, limit=limit)]
+
+@router.get("/{job_id}", response_model=IngestionJob)
+def get_ingestion_job(job_id: str, manager=Depends(get_ingestion_job_manager)):
+    record = manager.get(job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return record.to_dict()
+
+@router.get("/{job_id}/events")
+def stream_ingestion_job(job_id: str, manager=Depends(get_ingestion_job_manager)):
+    """
+    Server-sent events: one ``progress`` event per job update, a ``done`` event at the end.
+    """
+    record = manager.get(job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+
+    async def events():
+        # Async generator: waiting for updates parks no threadpool thread.
+        current = record
+        version = -1
+        while current is not None:
+            if current.version > version:
+                version = current.version
+                event = "done" if current.finished else "progress"
+                yield f"event: {event}\ndata: {json.dumps(current.to_dict())}\n\n"
+                if current.finished:
+                    return
+            else:
+                # Keep-alive comment so proxies do not drop idle connections.
+                yield ": ping\n\n"
+            current = await manager.await_update(job_id, version)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
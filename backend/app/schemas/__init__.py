@@ -0,0 +1,5 @@
+"""Shared data schemas for the core modules."""
+
+from .chunking import Chunk, TokenChunk
+
+__all__ = ["Chunk", "TokenChunk"]
@@ -0,0 +1,33 @@
+"""Chunk schemas produced by the chunkers and consumed by indexing/RAG."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class Chunk:
+    """Structural chunk: one heading section built by ``DynamicChunker``."""
+
+    id: str
+    title: str
+    heading_level: int
+    text: str
+    blocks: List[Dict[str, Any]] = field(default_factory=list)
+    page_numbers: List[int] = field(default_factory=list)
+
+
+@dataclass
+class TokenChunk:
+    """Token-bounded piece of a ``Chunk``, the unit embedded and indexed."""
+
+    id: str
+    text: str
+    section_path: str
+    metadata: Dict[str, str] = field(default_factory=dict)
+    page_numbers: List[int] = field(default_factory=list)
+    source_chunk_id: Optional[str] = None
+
+
+__all__ = ["Chunk", "TokenChunk"]
@@ -0,0 +1,4 @@
+"""Offline benchmarks for the ingestion and chunking pipeline.
+
+Run from ``backend/``, e.g. ``python -m benchmarks.run --pages 10 100``.
+"""
@@ -0,0 +1,113 @@
+"""Micro-benchmark: memory and time of slotted ``Block``/``Page`` vs. dict pages.
+
+Runs the PyMuPDF layout pass on the given PDFs, then measures with
+``tracemalloc`` the memory retained by a copy of the pages as ``Page``/``Block``
+objects and as the dict representation the parser used before (every key
+present, ``bbox`` as a list). Both copies share the text strings, so the
+figures compare container overhead only. Layout time is reported as well.
+Results are printed as JSON.
+
+Usage:
+    python -m benchmarks.bench_blocks bando.pdf disciplinare.pdf [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.core.ingestion.core import parser_pdf
+from src.core.ingestion.core.models import Block, Page
+
+_LEGACY_KEYS = ("text", "bbox", "font_size", "font_name", "type")
+
+
+def as_legacy_dicts(pages: List[Page]) -> List[Dict[str, Any]]:
+    """Rebuild the dict pages the parser produced before ``Block`` existed."""
+    return [
+        {
+            "page_number": page.page_number,
+            "blocks": [
+                {key: list(block.bbox) if key == "bbox" and block.bbox else block[key] for key in _LEGACY_KEYS}
+                for block in page.blocks
+            ],
+        }
+        for page in pages
+    ]
+
+
+def as_blocks(pages: List[Page]) -> List[Page]:
+    """Copy pages as ``Page``/``Block`` objects (fresh bbox tuples, shared text)."""
+    return [
+        Page(
+            page_number=page.page_number,
+            blocks=[
+                Block(
+                    text=block.text,
+                    bbox=(*block.bbox,) if block.bbox else None,
+                    font_size=block.font_size,
+                    font_name=block.font_name,
+                    type=block.type,
+                )
+                for block in page.blocks
+            ],
+        )
+        for page in pages
+    ]
+
+
+def retained_bytes(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """Return the built object and the bytes still allocated for it."""
+    tracemalloc.start()
+    try:
+        result = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current
+
+
+def run(paths: List[Path], repeat: int) -> Dict[str, object]:
+    layout_seconds = 0.0
+    pages_total = blocks_total = 0
+    slotted_bytes = dict_bytes = 0
+    for path in paths:
+        layout_seconds += min(_timed(lambda: parser_pdf.extract_pdf_layout(path)) for _ in range(repeat))
+        pages = parser_pdf.extract_pdf_layout(path)
+        _, slotted = retained_bytes(lambda: as_blocks(pages))
+        _, legacy = retained_bytes(lambda: as_legacy_dicts(pages))
+        pages_total += len(pages)
+        blocks_total += sum(len(page.blocks) for page in pages)
+        slotted_bytes += slotted
+        dict_bytes += legacy
+    return {
+        "files": [p.name for p in paths],
+        "pages": pages_total,
+        "blocks": blocks_total,
+        "layout_seconds": round(layout_seconds, 4),
+        "block_bytes_per_page": round(slotted_bytes / pages_total) if pages_total else 0,
+        "dict_bytes_per_page": round(dict_bytes / pages_total) if pages_total else 0,
+        "memory_ratio": round(slotted_bytes / dict_bytes, 3) if dict_bytes else None,
+    }
+
+
+def _timed(fn: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdfs", nargs="+", type=Path, help="PDF files to benchmark (real tender documents)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions; the best time is reported")
+    args = parser.parse_args()
+    print(json.dumps(run(args.pdfs, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark and self-check of the MinHash/LSH near-duplicate detector.
+
+Builds pairs of synthetic tender-style passages with a controlled word-level
+edit rate, then measures:
+
+- Jaccard estimate: absolute error of ``estimate_similarity`` on the MinHash
+  signatures against the exact Jaccard similarity of the shingle sets.
+- Bucket match: share of pairs at or above ``--threshold`` that share at
+  least one LSH bucket (recall of the candidate step) and share of pairs far
+  below it that do (false candidates).
+- Signature throughput in chunks/sec.
+
+With ``--check`` the run exits non-zero if the mean estimate error exceeds
+``--max-error`` or the bucket recall is below ``--min-recall``. Results are
+printed as JSON.
+
+Usage:
+    python -m benchmarks.bench_dedup [--pairs 500] [--words 120] [--check]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from typing import Any, Dict, List, Set, Tuple
+
+import numpy as np
+
+from src.core.index.dedup import DEFAULT_DEDUP_THRESHOLD, SignatureIndex, estimate_similarity
+
+_WORDS = (
+    "il concorrente deve presentare la documentazione amministrativa entro il termine indicato "
+    "dalla stazione appaltante ai sensi dell'art. 83 del codice dei contratti pubblici importo "
+    "a base di gara al netto degli oneri per la sicurezza non soggetti a ribasso lotto offerta "
+    "tecnica economica garanzia provvisoria cauzione definitiva subappalto avvalimento requisiti"
+).split()
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def make_pair(words: int, edit_rate: float, rng: random.Random) -> Tuple[str, str]:
+    """A passage and a copy with ``edit_rate`` of its words replaced."""
+    base = [rng.choice(_WORDS) for _ in range(words)]
+    edited = [rng.choice(_WORDS) if rng.random() < edit_rate else word for word in base]
+    return " ".join(base), " ".join(edited)
+
+
+def exact_jaccard(left: str, right: str, shingle_size: int) -> float:
+    a, b = _shingles(left, shingle_size), _shingles(right, shingle_size)
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _shingles(text: str, size: int) -> Set[str]:
+    words = _WORD_PATTERN.findall(text.lower())
+    size = min(size, len(words))
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)} if words else set()
+
+
+def run(pairs: int, words: int, threshold: float, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    index = SignatureIndex(":memory:")
+    shingle_size = index.hasher.shingle_size
+    errors: List[float] = []
+    near_total = near_matched = far_total = far_matched = 0
+    signatures = 0
+    elapsed = 0.0
+    for _ in range(pairs):
+        left, right = make_pair(words, rng.choice((0.0, 0.01, 0.02, 0.05, 0.2, 0.5)), rng)
+        start = time.perf_counter()
+        sig_left, sig_right = index.signature(left), index.signature(right)
+        elapsed += time.perf_counter() - start
+        signatures += 2
+        exact = exact_jaccard(left, right, shingle_size)
+        estimate = float(estimate_similarity(sig_left, sig_right[None, :])[0])
+        errors.append(abs(estimate - exact))
+        shared = bool(set(index.band_keys(sig_left)) & set(index.band_keys(sig_right)))
+        if exact >= threshold:
+            near_total += 1
+            near_matched += shared
+        elif exact < threshold / 2:
+            far_total += 1
+            far_matched += shared
+    index.close()
+    return {
+        "pairs": pairs,
+        "words": words,
+        "threshold": threshold,
+        "num_perm": index.hasher.num_perm,
+        "bands": index.bands,
+        "jaccard_error_mean": round(float(np.mean(errors)), 4),
+        "jaccard_error_p95": round(float(np.percentile(errors, 95)), 4),
+        "bucket_recall": round(near_matched / near_total, 4) if near_total else None,
+        "bucket_false_candidates": round(far_matched / far_total, 4) if far_total else None,
+        "near_pairs": near_total,
+        "far_pairs": far_total,
+        "signatures_per_sec": round(signatures / elapsed, 1) if elapsed else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, default=500)
+    parser.add_argument("--words", type=int, default=120)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_DEDUP_THRESHOLD)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true", help="Exit non-zero if the checks below fail")
+    parser.add_argument("--max-error", type=float, default=0.05, help="Maximum mean Jaccard estimate error")
+    parser.add_argument("--min-recall", type=float, default=0.95, help="Minimum bucket recall at the threshold")
+    args = parser.parse_args()
+
+    result = run(args.pairs, args.words, args.threshold, args.seed)
+    print(json.dumps(result, indent=2))
+    if args.check:
+        failures = []
+        if result["jaccard_error_mean"] > args.max_error:
+            failures.append(f"mean Jaccard estimate error {result['jaccard_error_mean']} > {args.max_error}")
+        if result["bucket_recall"] is not None and result["bucket_recall"] < args.min_recall:
+            failures.append(f"bucket recall {result['bucket_recall']} < {args.min_recall}")
+        if failures:
+            print("\n".join(failures), file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
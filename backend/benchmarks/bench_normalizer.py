@@ -0,0 +1,97 @@
+"""Micro-benchmark: ftfy per span vs. the normalizer fast path.
+
+Extracts every span from the given PDFs (as ``parser_pdf`` sees them), then
+times the previous behaviour (``ftfy.fix_text`` once per span) against
+``normalizer.normalize_many`` once per line, checking both produce the same
+text. Results are printed as JSON.
+
+Usage:
+    python -m benchmarks.bench_normalizer bando.pdf disciplinare.pdf [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import fitz  # type: ignore
+import ftfy
+
+from src.core.ingestion.core import normalizer
+
+
+def load_lines(paths: List[Path]) -> List[List[str]]:
+    """Return span texts grouped by line for all pages of the given PDFs."""
+    lines: List[List[str]] = []
+    for path in paths:
+        doc = fitz.open(path.as_posix())
+        try:
+            for page in doc:
+                for block in page.get_text("dict").get("blocks", []):
+                    for line in block.get("lines", []):
+                        lines.append([span.get("text", "") for span in line.get("spans", [])])
+        finally:
+            doc.close()
+    return lines
+
+
+def time_baseline(lines: List[List[str]]) -> float:
+    started = time.perf_counter()
+    for spans in lines:
+        for text in spans:
+            ftfy.fix_text(text)
+    return time.perf_counter() - started
+
+
+def time_fast_path(lines: List[List[str]]) -> float:
+    normalizer._fix_text_cached.cache_clear()
+    started = time.perf_counter()
+    for spans in lines:
+        normalizer.normalize_many(spans)
+    return time.perf_counter() - started
+
+
+def check_equivalence(lines: List[List[str]]) -> int:
+    """Return the number of spans whose output differs from plain ftfy."""
+    mismatches = 0
+    for spans in lines:
+        for expected, actual in zip((ftfy.fix_text(t) for t in spans), normalizer.normalize_many(spans)):
+            if expected != actual:
+                mismatches += 1
+    return mismatches
+
+
+def run(paths: List[Path], repeat: int) -> Dict[str, object]:
+    lines = load_lines(paths)
+    spans = sum(len(line) for line in lines)
+    clean = sum(1 for line in lines for text in line if normalizer.is_clean_text(text))
+    baseline = min(time_baseline(lines) for _ in range(repeat))
+    fast = min(time_fast_path(lines) for _ in range(repeat))
+    cache = normalizer._fix_text_cached.cache_info()
+    return {
+        "files": [p.name for p in paths],
+        "lines": len(lines),
+        "spans": spans,
+        "clean_span_ratio": round(clean / spans, 4) if spans else 0.0,
+        "baseline_seconds": round(baseline, 4),
+        "fast_path_seconds": round(fast, 4),
+        "speedup": round(baseline / fast, 2) if fast else None,
+        "cache_hits": cache.hits,
+        "cache_misses": cache.misses,
+        "mismatched_spans": check_equivalence(lines),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdfs", nargs="+", type=Path, help="PDF files to benchmark (real tender documents)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions; the best time is reported")
+    args = parser.parse_args()
+    print(json.dumps(run(args.pdfs, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
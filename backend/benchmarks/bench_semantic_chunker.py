@@ -0,0 +1,212 @@
+"""Benchmark: ``SemanticChunker`` vs. ``TokenChunker`` on documents without headings.
+
+Builds synthetic unstructured documents (what ``DynamicChunker`` turns into a
+single preamble section when a PDF has no detectable headings): a sequence of
+topic passages of random length about one lot each, drawn from a topic
+vocabulary plus shared filler, with one fact sentence per passage carrying a
+unique code. Both strategies chunk the same section and, for each, the benchmark
+reports the chunk count, the token size distribution, the index size (vectors
+of ``--dim`` float32 plus chunk text) and the retrieval hit-rate@k: for every
+fact a query is built from its lot and topic vocabulary and is a hit when one of
+the top-k chunks by cosine similarity contains the code. It also reports how
+many chunks mix more than one topic. Results are printed as JSON.
+
+The default embedder is a deterministic hashed bag-of-words (offline, no
+model); ``--ollama`` uses ``OllamaEmbeddingClient`` (``OLLAMA_URL``,
+``OLLAMA_EMBED_MODEL``) for both chunking and retrieval.
+
+Usage:
+    python -m benchmarks.bench_semantic_chunker [--passages 40 200] [--top-k 1 3] [--ollama]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from src.core.chunking.chunking import TokenChunker
+from src.core.chunking.semantic_chunker import SemanticChunker
+from src.core.embedding.base import EmbeddingClient
+from src.schemas.chunking import Chunk, TokenChunk
+
+_TOPICS: Dict[str, Tuple[str, ...]] = {
+    "garanzia": tuple("garanzia provvisoria fideiussione polizza cauzione svincolo escussione garante importo percentuale".split()),
+    "subappalto": tuple("subappalto subappaltatore affidamento quota lavorazioni autorizzazione contratto categoria prevalente".split()),
+    "offerta_tecnica": tuple("offerta tecnica relazione proposta migliorativa punteggio criteri qualitativi commissione valutazione".split()),
+    "offerta_economica": tuple("offerta economica ribasso prezzo percentuale costi manodopera oneri aziendali sicurezza".split()),
+    "requisiti": tuple("requisiti fatturato capacità professionale iscrizione camera commercio attestazione soa esperienza".split()),
+    "sopralluogo": tuple("sopralluogo visita luoghi presa visione appuntamento delegato attestato cantiere accesso".split()),
+    "penali": tuple("penali ritardo inadempimento giornaliera risoluzione contestazione esecuzione termine applicazione".split()),
+    "soccorso": tuple("soccorso istruttorio irregolarità essenziali integrazione documentazione termine perentorio esclusione carenze".split()),
+}
+_FILLER = tuple("il la di del della ai sensi dell'operatore economico entro stazione appaltante procedura gara".split())
+
+
+@dataclass(frozen=True)
+class Fact:
+    """Unique code planted in one passage and the query that should retrieve it."""
+
+    code: str
+    topic: str
+    query: str
+
+
+class HashingEmbeddingClient(EmbeddingClient):
+    """Deterministic hashed bag-of-words embeddings (CRC32 buckets, unit length)."""
+
+    def __init__(self, dim: int = 256) -> None:
+        self._dim = dim
+
+    @property
+    def model_name(self) -> str:
+        return f"hashing-{self._dim}"
+
+    @property
+    def dimension(self) -> int:
+        return self._dim
+
+    def embed(self, text: str) -> List[float]:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        matrix = np.zeros((len(texts), self._dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in re.findall(r"\w+", text.lower()):
+                matrix[row, zlib.crc32(word.encode("utf-8")) % self._dim] += 1.0
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return (matrix / np.maximum(norms, 1e-12)).tolist()
+
+
+def make_document(passages: int, *, seed: int = 0) -> Tuple[Chunk, List[Fact], List[Tuple[int, int, str]]]:
+    """Unstructured section of ``passages`` topic passages, its facts and the topic of each character range."""
+    rng = random.Random(f"semantic-{passages}-{seed}")
+    topics = list(_TOPICS)
+    parts: List[str] = []
+    facts: List[Fact] = []
+    ranges: List[Tuple[int, int, str]] = []
+    position = 0
+    previous = None
+    for index in range(passages):
+        topic = rng.choice([t for t in topics if t != previous])
+        previous = topic
+        vocabulary = _TOPICS[topic]
+        lot = f"lotto {index + 1}"
+        sentences = [_sentence(rng, vocabulary, lot) for _ in range(rng.randint(4, 14))]
+        code = f"CIG{index:04d}{rng.randrange(16**4):04X}"
+        sentences.insert(rng.randrange(len(sentences) + 1), f"Il codice di riferimento per {vocabulary[0]} del {lot} è {code}.")
+        passage = " ".join(sentences)
+        parts.append(passage)
+        ranges.append((position, position + len(passage), topic))
+        position += len(passage) + 1
+        query = f"codice di riferimento {lot} " + " ".join(rng.sample(vocabulary, 3))
+        facts.append(Fact(code=code, topic=topic, query=query))
+    section = Chunk(
+        id=f"unstructured-{passages}",
+        title="Preamble",
+        heading_level=0,
+        text=" ".join(parts),
+        blocks=[],
+        page_numbers=[1],
+    )
+    return section, facts, ranges
+
+
+def _sentence(rng: random.Random, vocabulary: Sequence[str], lot: str) -> str:
+    words = [rng.choice(vocabulary) if rng.random() < 0.55 else rng.choice(_FILLER) for _ in range(rng.randint(10, 28))]
+    if rng.random() < 0.4:
+        words.insert(rng.randrange(1, len(words)), f"per il {lot}")
+    return words[0].capitalize() + " " + " ".join(words[1:]) + "."
+
+
+def evaluate(
+    chunks: List[TokenChunk],
+    facts: List[Fact],
+    ranges: List[Tuple[int, int, str]],
+    section: Chunk,
+    embedder: EmbeddingClient,
+    top_k: Sequence[int],
+) -> Dict[str, Any]:
+    texts = [c.text for c in chunks]
+    matrix = _unit(np.asarray(embedder.embed_batch(texts), dtype=np.float32))
+    queries = _unit(np.asarray(embedder.embed_batch([f.query for f in facts]), dtype=np.float32))
+    ranking = np.argsort(-(queries @ matrix.T), axis=1)
+    hit_rate = {}
+    for k in top_k:
+        hits = sum(any(fact.code in texts[j] for j in ranking[i, :k]) for i, fact in enumerate(facts))
+        hit_rate[f"hit_rate@{k}"] = round(hits / len(facts), 4)
+    sizes = [int(c.metadata.get("token_count", len(c.text.split()))) for c in chunks]
+    text_bytes = sum(len(t.encode("utf-8")) for t in texts)
+    return {
+        "chunks": len(chunks),
+        "tokens_mean": round(float(np.mean(sizes)), 1),
+        "tokens_min": int(min(sizes)),
+        "tokens_max": int(max(sizes)),
+        "mixed_topic_chunks": sum(len(_topics_of(section.text, c.text, ranges)) > 1 for c in chunks),
+        "index_bytes": len(chunks) * matrix.shape[1] * 4 + text_bytes,
+        **hit_rate,
+    }
+
+
+def _topics_of(text: str, piece: str, ranges: List[Tuple[int, int, str]]) -> set:
+    start = text.find(piece)
+    end = start + len(piece)
+    return {topic for s, e, topic in ranges if s < end and e > start}
+
+
+def _unit(matrix: np.ndarray) -> np.ndarray:
+    return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+
+def run(passage_counts: List[int], top_k: List[int], embedder: EmbeddingClient, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    token = TokenChunker(max_tokens=args.max_tokens, min_tokens=args.min_tokens, overlap_tokens=args.overlap)
+    semantic = SemanticChunker(
+        embedder,
+        max_tokens=args.max_tokens,
+        min_tokens=args.min_tokens,
+        window=args.window,
+        breakpoint_percentile=args.percentile,
+    )
+    results: List[Dict[str, Any]] = []
+    for passages in passage_counts:
+        section, facts, ranges = make_document(passages)
+        report: Dict[str, Any] = {"passages": passages, "words": len(section.text.split())}
+        for name, chunker in (("token", token), ("semantic", semantic)):
+            started = time.perf_counter()
+            chunks = chunker.chunk([section])
+            seconds = time.perf_counter() - started
+            report[name] = {"chunk_seconds": round(seconds, 4), **evaluate(chunks, facts, ranges, section, embedder, top_k)}
+        results.append(report)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--passages", nargs="+", type=int, default=[40, 200], help="Topic passages per document")
+    parser.add_argument("--top-k", nargs="+", type=int, default=[1, 3], help="Cut-offs for the hit-rate")
+    parser.add_argument("--max-tokens", type=int, default=400, help="Chunk upper bound for both strategies")
+    parser.add_argument("--min-tokens", type=int, default=60, help="Chunk lower bound for both strategies")
+    parser.add_argument("--overlap", type=int, default=60, help="TokenChunker overlap")
+    parser.add_argument("--window", type=int, default=3, help="SemanticChunker sentence window")
+    parser.add_argument("--percentile", type=float, default=90, help="SemanticChunker breakpoint percentile")
+    parser.add_argument("--dim", type=int, default=256, help="Hashing embedder dimension")
+    parser.add_argument("--ollama", action="store_true", help="Use OllamaEmbeddingClient instead of the hashing embedder")
+    args = parser.parse_args()
+    if args.ollama:
+        from src.core.embedding.ollama import OllamaEmbeddingClient
+
+        embedder: EmbeddingClient = OllamaEmbeddingClient()
+    else:
+        embedder = HashingEmbeddingClient(args.dim)
+    print(json.dumps(run(args.passages, args.top_k, embedder, args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
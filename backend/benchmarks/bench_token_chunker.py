@@ -0,0 +1,108 @@
+"""Micro-benchmark: ``TokenChunker`` offset slicing vs. token re-joining on large sections.
+
+Builds synthetic sections of the given word counts (multi-line paragraphs in
+tender style) and chunks them twice: with the default offset-based path
+(``WhitespaceTokenizer``: one span per word, each chunk one slice of the
+section text) and with the legacy path (``str.split`` callable: a string per
+word, each overlapping window re-joined with spaces). Reports the best time,
+the ``tracemalloc`` peak while chunking and whether the chunks keep the
+original newlines. Results are printed as JSON.
+
+Usage:
+    python -m benchmarks.bench_token_chunker [--words 5000 50000 200000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.core.chunking.chunking import TokenChunker
+from src.schemas.chunking import Chunk
+
+_WORDS = (
+    "il concorrente deve presentare la documentazione amministrativa entro il termine indicato "
+    "dalla stazione appaltante ai sensi dell'art. 83 del codice dei contratti pubblici importo "
+    "a base di gara al netto degli oneri per la sicurezza non soggetti a ribasso"
+).split()
+
+
+def make_section(words: int, *, seed: int = 0) -> Chunk:
+    """Section of ``words`` words in paragraphs of 40-90 words, lines of ~12 words."""
+    rng = random.Random(f"section-{words}-{seed}")
+    paragraphs: List[str] = []
+    remaining = words
+    while remaining > 0:
+        size = min(remaining, rng.randint(40, 90))
+        tokens = [rng.choice(_WORDS) for _ in range(size)]
+        lines = [" ".join(tokens[i : i + 12]) for i in range(0, size, 12)]
+        paragraphs.append("\n".join(lines))
+        remaining -= size
+    return Chunk(
+        id=f"section-{words}",
+        title="Art. 1 - Oggetto dell'appalto",
+        heading_level=1,
+        text="\n\n".join(paragraphs),
+        blocks=[],
+        page_numbers=[1],
+    )
+
+
+def measure(chunker: TokenChunker, sections: List[Chunk], repeat: int) -> Tuple[float, int, List[Any]]:
+    best = min(_timed(lambda: chunker.chunk(sections)) for _ in range(repeat))
+    tracemalloc.start()
+    try:
+        chunks = chunker.chunk(sections)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak, chunks
+
+
+def run(word_counts: List[int], repeat: int) -> List[Dict[str, Any]]:
+    offsets = TokenChunker()
+    legacy = TokenChunker(tokenizer=str.split)
+    results: List[Dict[str, Any]] = []
+    for words in word_counts:
+        sections = [make_section(words)]
+        offset_seconds, offset_peak, offset_chunks = measure(offsets, sections, repeat)
+        legacy_seconds, legacy_peak, legacy_chunks = measure(legacy, sections, repeat)
+        results.append(
+            {
+                "words": words,
+                "chunks": len(offset_chunks),
+                "same_spans": [c.id for c in offset_chunks] == [c.id for c in legacy_chunks],
+                "offset_seconds": round(offset_seconds, 5),
+                "join_seconds": round(legacy_seconds, 5),
+                "speedup": round(legacy_seconds / offset_seconds, 2) if offset_seconds else None,
+                "offset_peak_bytes": offset_peak,
+                "join_peak_bytes": legacy_peak,
+                "offset_peak_bytes_per_chunk": round(offset_peak / len(offset_chunks)) if offset_chunks else 0,
+                "join_peak_bytes_per_chunk": round(legacy_peak / len(legacy_chunks)) if legacy_chunks else 0,
+                "offset_keeps_newlines": any("\n" in c.text for c in offset_chunks),
+                "join_keeps_newlines": any("\n" in c.text for c in legacy_chunks),
+            }
+        )
+    return results
+
+
+def _timed(fn: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", nargs="+", type=int, default=[5_000, 50_000, 200_000], help="Section sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions; the best time is reported")
+    args = parser.parse_args()
+    print(json.dumps(run(args.words, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
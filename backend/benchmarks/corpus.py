@@ -0,0 +1,271 @@
+"""Deterministic synthetic tender corpus for the ingestion benchmarks.
+
+Documents imitate Italian tender paperwork (disciplinari, capitolati) closely
+enough to exercise every ingestion stage: repeated headers/footers, ``CAPO``/
+``Art.`` headings, ruled tables, two-column layouts and image-only pages. The
+same ``(kind, profile, pages, seed)`` always yields the same content, so runs
+on different commits parse identical input. Nothing is downloaded.
+
+Usage:
+    python -m benchmarks.corpus ./corpus --pages 10 100 [--profiles text tables]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Sequence, Tuple
+
+import fitz  # type: ignore
+
+try:
+    import docx  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    docx = None  # type: ignore
+
+PDF_PROFILES = ("text", "tables", "multicolumn", "scanned")
+DOCX_PROFILES = ("text", "tables")
+DEFAULT_PAGE_COUNTS = (10, 100, 500, 2000)
+
+_PAGE_WIDTH, _PAGE_HEIGHT = fitz.paper_size("a4")
+_MARGIN = 56
+_SCAN_DPI = 100
+_HEADER = "Comune di Esempio - Disciplinare di gara - Procedura aperta"
+_TOPICS = (
+    "Oggetto dell'appalto",
+    "Requisiti di partecipazione",
+    "Garanzia provvisoria",
+    "Criterio di aggiudicazione",
+    "Offerta tecnica",
+    "Offerta economica",
+    "Soccorso istruttorio",
+    "Subappalto",
+    "Termini di esecuzione",
+    "Penali",
+)
+_WORDS = (
+    "il concorrente deve presentare la documentazione amministrativa entro il termine indicato "
+    "dalla stazione appaltante ai sensi del codice dei contratti pubblici con riferimento al lotto "
+    "oggetto della procedura importo a base di gara al netto degli oneri per la sicurezza non soggetti "
+    "a ribasso la commissione giudicatrice valuta l'offerta tecnica secondo i criteri indicati nel "
+    "presente disciplinare e attribuisce il punteggio in base alla qualità del servizio offerto"
+).split()
+_TABLE_HEADER = ("Lotto", "Descrizione", "CIG", "Importo (EUR)", "Punteggio")
+_ROMAN = ("I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X")
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """One synthetic document: file kind, content profile and size."""
+
+    kind: str
+    profile: str
+    pages: int
+    seed: int = 0
+
+    @property
+    def filename(self) -> str:
+        return f"{self.profile}_{self.pages}p.{self.kind}"
+
+
+def default_specs(
+    page_counts: Sequence[int] = DEFAULT_PAGE_COUNTS,
+    profiles: Sequence[str] = PDF_PROFILES,
+    *,
+    include_docx: bool = True,
+) -> List[CorpusSpec]:
+    """Return the PDF (and DOCX, where the profile exists) specs to generate."""
+    specs = [CorpusSpec("pdf", profile, pages) for profile in profiles for pages in page_counts]
+    if include_docx:
+        specs += [
+            CorpusSpec("docx", profile, pages)
+            for profile in profiles
+            if profile in DOCX_PROFILES
+            for pages in page_counts
+        ]
+    return specs
+
+
+def build_corpus(directory: Path, specs: Iterable[CorpusSpec]) -> List[Path]:
+    """Generate the missing documents of ``specs`` in ``directory``."""
+    directory.mkdir(parents=True, exist_ok=True)
+    paths: List[Path] = []
+    for spec in specs:
+        path = directory / spec.filename
+        if not path.exists():
+            if spec.kind == "pdf":
+                generate_pdf(spec.profile, spec.pages, path, seed=spec.seed)
+            elif spec.kind == "docx":
+                generate_docx(spec.profile, spec.pages, path, seed=spec.seed)
+            else:
+                raise ValueError(f"Unsupported corpus kind: {spec.kind}")
+        paths.append(path)
+    return paths
+
+
+def generate_pdf(profile: str, pages: int, destination: Path, *, seed: int = 0) -> Path:
+    """Write a synthetic PDF of ``pages`` pages using the given profile."""
+    if profile not in PDF_PROFILES:
+        raise ValueError(f"Unknown PDF profile {profile!r}; expected one of {PDF_PROFILES}")
+    rng = random.Random(f"pdf-{profile}-{pages}-{seed}")
+    doc = fitz.open()
+    try:
+        for page_number in range(1, pages + 1):
+            if profile == "scanned":
+                _add_scanned_page(doc, rng, page_number, pages)
+                continue
+            page = doc.new_page(width=_PAGE_WIDTH, height=_PAGE_HEIGHT)
+            _draw_page(page, profile, rng, page_number, pages)
+        # Fixed metadata keeps the output byte-identical across runs.
+        doc.set_metadata({"title": destination.stem, "creationDate": "D:20240101000000", "modDate": "D:20240101000000"})
+        doc.save(destination.as_posix(), garbage=3, deflate=True)
+    finally:
+        doc.close()
+    return destination
+
+
+def generate_docx(profile: str, pages: int, destination: Path, *, seed: int = 0) -> Path:
+    """Write a synthetic DOCX with roughly ``pages`` pages of content."""
+    if docx is None:
+        raise ImportError("python-docx is required to generate DOCX documents")
+    if profile not in DOCX_PROFILES:
+        raise ValueError(f"Unknown DOCX profile {profile!r}; expected one of {DOCX_PROFILES}")
+    rng = random.Random(f"docx-{profile}-{pages}-{seed}")
+    document = docx.Document()
+    for page_number in range(1, pages + 1):
+        if page_number % 3 == 1:
+            document.add_heading(f"CAPO {_roman(page_number // 3 + 1)} - {rng.choice(_TOPICS).upper()}", level=1)
+        document.add_heading(_article_title(rng, page_number), level=2)
+        for _ in range(3):
+            document.add_paragraph(_sentence(rng, 60, 90))
+        if profile == "tables":
+            rows = _table_rows(rng, 10)
+            table = document.add_table(rows=len(rows), cols=len(_TABLE_HEADER))
+            for row, values in zip(table.rows, rows):
+                for cell, value in zip(row.cells, values):
+                    cell.text = value
+        document.add_page_break()
+    document.core_properties.title = destination.stem
+    document.save(destination.as_posix())
+    return destination
+
+
+# ---- Internal helpers -----------------------------------------------------
+
+
+def _draw_page(page: "fitz.Page", profile: str, rng: random.Random, page_number: int, pages: int) -> None:
+    page.insert_text((_MARGIN, 32), _HEADER, fontsize=8, fontname="helv")
+    page.insert_text((_MARGIN, _PAGE_HEIGHT - 24), f"Pagina {page_number} di {pages}", fontsize=8, fontname="helv")
+
+    y = 70.0
+    if page_number % 3 == 1:
+        title = f"CAPO {_roman(page_number // 3 + 1)} - {rng.choice(_TOPICS).upper()}"
+        page.insert_text((_MARGIN, y), title, fontsize=14, fontname="hebo")
+        y += 28
+    page.insert_text((_MARGIN, y), _article_title(rng, page_number), fontsize=11, fontname="hebo")
+    y += 18
+
+    right = _PAGE_WIDTH - _MARGIN
+    bottom = _PAGE_HEIGHT - 60
+    if profile == "multicolumn":
+        middle = _PAGE_WIDTH / 2
+        _text_column(page, rng, fitz.Rect(_MARGIN, y, middle - 12, bottom), paragraphs=5)
+        _text_column(page, rng, fitz.Rect(middle + 12, y, right, bottom), paragraphs=5)
+        return
+    if profile == "tables":
+        y = _text_column(page, rng, fitz.Rect(_MARGIN, y, right, y + 140), paragraphs=2)
+        _ruled_table(page, rng, top=y + 12, rows=14)
+        return
+    _text_column(page, rng, fitz.Rect(_MARGIN, y, right, bottom), paragraphs=6)
+
+
+def _text_column(page: "fitz.Page", rng: random.Random, rect: "fitz.Rect", *, paragraphs: int) -> float:
+    """Fill ``rect`` with paragraphs and return the y coordinate below the text."""
+    y = rect.y0
+    for _ in range(paragraphs):
+        text = _sentence(rng, 40, 70)
+        box = fitz.Rect(rect.x0, y, rect.x1, rect.y1)
+        spare = page.insert_textbox(box, text, fontsize=10, fontname="helv")
+        if spare < 0:
+            break
+        y = rect.y1 - spare + 8
+    return y
+
+
+def _ruled_table(page: "fitz.Page", rng: random.Random, *, top: float, rows: int) -> None:
+    values = _table_rows(rng, rows)
+    widths = (50, 190, 90, 90, 63)
+    row_height = 18
+    left = _MARGIN
+    right = left + sum(widths)
+    for index, row in enumerate(values):
+        y = top + index * row_height
+        x = left
+        for width, value in zip(widths, row):
+            page.insert_text((x + 3, y + 13), value, fontsize=8, fontname="hebo" if index == 0 else "helv")
+            x += width
+        page.draw_line((left, y), (right, y), width=0.5)
+    bottom = top + len(values) * row_height
+    page.draw_line((left, bottom), (right, bottom), width=0.5)
+    x = left
+    for width in (0, *widths):
+        x += width
+        page.draw_line((x, top), (x, bottom), width=0.5)
+
+
+def _add_scanned_page(doc: "fitz.Document", rng: random.Random, page_number: int, pages: int) -> None:
+    """Render a text page to a grayscale image and add it without a text layer."""
+    source = fitz.open()
+    try:
+        text_page = source.new_page(width=_PAGE_WIDTH, height=_PAGE_HEIGHT)
+        _draw_page(text_page, "text", rng, page_number, pages)
+        pixmap = text_page.get_pixmap(dpi=_SCAN_DPI, colorspace=fitz.csGRAY, alpha=False)
+    finally:
+        source.close()
+    page = doc.new_page(width=_PAGE_WIDTH, height=_PAGE_HEIGHT)
+    page.insert_image(page.rect, pixmap=pixmap)
+
+
+def _table_rows(rng: random.Random, rows: int) -> List[Tuple[str, ...]]:
+    values: List[Tuple[str, ...]] = [_TABLE_HEADER]
+    for lot in range(1, rows):
+        values.append(
+            (
+                str(lot),
+                " ".join(rng.choice(_WORDS) for _ in range(4)),
+                f"{rng.randrange(16 ** 10):010X}",
+                f"{rng.randrange(10_000, 5_000_000):,}".replace(",", "."),
+                str(rng.randrange(10, 80)),
+            )
+        )
+    return values
+
+
+def _article_title(rng: random.Random, page_number: int) -> str:
+    return f"Art. {page_number} - {rng.choice(_TOPICS)}"
+
+
+def _sentence(rng: random.Random, min_words: int, max_words: int) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(min_words, max_words))]
+    return " ".join(words).capitalize() + "."
+
+
+def _roman(number: int) -> str:
+    return _ROMAN[(number - 1) % len(_ROMAN)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", type=Path, help="Output directory (existing files are kept)")
+    parser.add_argument("--pages", nargs="+", type=int, default=list(DEFAULT_PAGE_COUNTS), help="Page counts")
+    parser.add_argument("--profiles", nargs="+", default=list(PDF_PROFILES), choices=PDF_PROFILES)
+    parser.add_argument("--no-docx", action="store_true", help="Generate PDFs only")
+    args = parser.parse_args()
+    for path in build_corpus(args.directory, default_specs(args.pages, args.profiles, include_docx=not args.no_docx)):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
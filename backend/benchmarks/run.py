@@ -0,0 +1,151 @@
+"""Ingestion throughput benchmark over the synthetic tender corpus.
+
+Generates (or reuses) the deterministic documents from ``benchmarks.corpus``
+and, for each one, times ``IngestionService.parse_document`` (per-stage
+breakdown from its ``collect_metrics`` report) followed by ``DynamicChunker``
+and ``TokenChunker``. Every document runs in a
+fresh process so its peak RSS is measured in isolation. Results (pages/sec,
+peak RSS, per-stage seconds) are printed as JSON; pass ``--baseline`` with
+the JSON of an earlier commit to get the relative throughput change.
+
+Runs offline. OCR is off by default since it needs the ocrmypdf binary;
+scanned-like documents then measure only native parsing.
+
+Usage:
+    python -m benchmarks.run --corpus ./corpus --pages 10 100 [--profiles text tables]
+        [--ocr] [--output results.json] [--baseline previous.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from benchmarks.corpus import DEFAULT_PAGE_COUNTS, PDF_PROFILES, build_corpus, default_specs
+
+
+@contextmanager
+def _stage(stages: Dict[str, float], name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages[name] = round(stages.get(name, 0.0) + time.perf_counter() - started, 4)
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS.
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def bench_document(path: str, enable_ocr: bool) -> Dict[str, Any]:
+    """Parse and chunk one document, returning its timings (runs in a child process)."""
+    from src.core.chunking.chunking import TokenChunker
+    from src.core.chunking.dynamic_chunker import DynamicChunker
+    from src.core.ingestion.ingestion_service import IngestionService
+
+    service = IngestionService(enable_ocr=enable_ocr, collect_metrics=True)
+    started = time.perf_counter()
+    result = service.parse_document(path)
+    parse_seconds = time.perf_counter() - started
+
+    stages: Dict[str, float] = {}
+    for stage in result["metrics"]["stages"]:
+        stages[stage["name"]] = round(stages.get(stage["name"], 0.0) + stage["wall_seconds"], 4)
+    pages = result["pages"]
+    with _stage(stages, "dynamic_chunker"):
+        chunks = DynamicChunker(allow_preamble=True).build_chunks(pages)
+    with _stage(stages, "token_chunker"):
+        token_chunks = TokenChunker().chunk(chunks)
+    total_seconds = time.perf_counter() - started
+
+    page_count = len(pages)
+    return {
+        "file": Path(path).name,
+        "pages": page_count,
+        "blocks": sum(len(page.blocks) for page in pages),
+        "chunks": len(chunks),
+        "token_chunks": len(token_chunks),
+        "parse_seconds": round(parse_seconds, 4),
+        "parse_cpu_seconds": result["metrics"]["cpu_seconds"],
+        "total_seconds": round(total_seconds, 4),
+        "pages_per_sec": round(page_count / total_seconds, 2) if total_seconds else None,
+        "peak_rss_mb": _peak_rss_mb(),
+        "stages": stages,
+    }
+
+
+def run(paths: List[Path], *, enable_ocr: bool) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    for path in paths:
+        # A fresh interpreter per document keeps ru_maxrss specific to it.
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            results.append(pool.submit(bench_document, path.as_posix(), enable_ocr).result())
+    return results
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any]) -> None:
+    """Annotate results with the throughput change against a previous run."""
+    previous = {case["file"]: case for case in baseline.get("cases", [])}
+    for case in results:
+        before = previous.get(case["file"], {}).get("pages_per_sec")
+        if before and case["pages_per_sec"]:
+            case["baseline_pages_per_sec"] = before
+            case["pages_per_sec_change_pct"] = round((case["pages_per_sec"] / before - 1) * 100, 1)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--corpus",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "ingestion-bench-corpus",
+        help="Corpus directory; generated documents are reused across runs",
+    )
+    parser.add_argument("--pages", nargs="+", type=int, default=list(DEFAULT_PAGE_COUNTS), help="Page counts")
+    parser.add_argument("--profiles", nargs="+", default=list(PDF_PROFILES), choices=PDF_PROFILES)
+    parser.add_argument("--no-docx", action="store_true", help="Benchmark PDFs only")
+    parser.add_argument("--ocr", action="store_true", help="Run OCR on scanned-like documents (needs ocrmypdf)")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+    parser.add_argument("--baseline", type=Path, help="JSON report of a previous run to compare against")
+    args = parser.parse_args()
+
+    specs = default_specs(args.pages, args.profiles, include_docx=not args.no_docx)
+    results = run(build_corpus(args.corpus, specs), enable_ocr=args.ocr)
+    if args.baseline:
+        compare(results, json.loads(args.baseline.read_text(encoding="utf-8")))
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "ocr": args.ocr,
+        "cases": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output, encoding="utf-8")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""Import alias for ``app``.
+
+The core modules (``app/core``) and their schemas (``app/schemas``) import
+each other as ``src.core...`` / ``src.schemas...``; this package maps the
+``src`` name onto the ``app`` directory so those imports resolve.
+"""
+
+import os
+
+__path__ = [os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")]